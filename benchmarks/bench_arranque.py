@@ -0,0 +1,75 @@
+"""
+Benchmark de arranque
+---------------------
+Mide, en procesos nuevos de Python, el costo de:
+  • importar main.py
+  • construir el parser LALR en frío (sin tablas en disco) vs. tibio
+  • una corrida completa de main.py con y sin caché
+
+Uso:
+    python benchmarks/bench_arranque.py [-r 5]
+"""
+
+from pathlib import Path
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from representacion_intermedia import parser_cache_path
+
+PROGRAM = """
+Parce x = 5
+Pilas("x vale", x)
+"""
+
+
+def run_python(args) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=ROOT, check=True,
+                   stdout=subprocess.DEVNULL)
+    return time.perf_counter() - t0
+
+
+def measure(label: str, args, repeat: int, before=None) -> None:
+    times = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        times.append(run_python(args))
+    print(f"{label:<34} mediana: {statistics.median(times) * 1000:8.1f} ms")
+
+
+def drop_parser_cache() -> None:
+    parser_cache_path.unlink(missing_ok=True)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de arranque")
+    ap.add_argument("-r", "--repeat", type=int, default=5, help="Repeticiones por caso")
+    args = ap.parse_args()
+
+    build_parser = ["-c", "import representacion_intermedia as ri; ri.get_parser()"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "prog.parce"
+        src.write_text(PROGRAM, encoding="utf-8")
+        cli = ["main.py", "-i", str(src), "-o", str(Path(tmp) / "out"),
+               "--cache-dir", str(Path(tmp) / "cache")]
+
+        measure("python -c 'import main'", ["-c", "import main"], args.repeat)
+        measure("parser en frío (sin tablas)", build_parser, args.repeat, before=drop_parser_cache)
+        measure("parser tibio (tablas en disco)", build_parser, args.repeat)
+        measure("main.py --no-cache (frío)", cli + ["--no-cache"], args.repeat, before=drop_parser_cache)
+        measure("main.py --no-cache (tablas tibias)", cli + ["--no-cache"], args.repeat)
+        run_python(cli)     # llena la caché de compilación
+        measure("main.py con caché tibia", cli, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
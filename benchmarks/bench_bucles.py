@@ -0,0 +1,116 @@
+"""
+Benchmark de optimización de bucles
+-----------------------------------
+Compila cada programa con `IROptimizer(loops=False)` y `IROptimizer(loops=True)`
+(código invariante al preheader y reducción de fuerza) y compara
+instrucciones de pila despachadas y tiempo de pared. Muestra además el
+reporte de lo que salió de cada bucle. Las dos versiones deben imprimir lo
+mismo.
+
+Uso:
+    python benchmarks/bench_bucles.py [-n 20000] [-r 3]
+"""
+
+from pathlib import Path
+import argparse
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from representacion_intermedia import parse_and_generate_ir
+from ir_optimizer import IROptimizer
+from sim_maquina_pila import StackMachineCodeGenerator
+from peephole_pila import StackPeepholeOptimizer
+from bench_simulador import best_of, run_decoded
+from bench_superinstrucciones import dispatch_count
+from bench_salidas import output_of
+
+# a y b no son constantes para el optimizador: salen de un bucle
+_SETUP = """Parce a = 1
+Boliche j in 5 {
+    a = a * 2 + j
+}
+Parce b = a - 3
+Parce s = 0
+"""
+
+
+# ---------- Programas ----------
+def invariante(n: int) -> str:
+    """`a * b` y `a * a - b` no cambian entre vueltas."""
+    return _SETUP + f"""Boliche i in {n} {{
+    Parce x = a * b + i
+    Parce y = a * a - b
+    s = s + x - y
+}}
+Pilas("s", s)
+"""
+
+
+def anidado(n: int) -> str:
+    """Lo invariante del bucle interno sale también del externo."""
+    m = int(n ** 0.5)
+    return _SETUP + f"""Boliche i in {m} {{
+    Boliche j in {m} {{
+        Parce p = a * b
+        s = s + p + j
+    }}
+}}
+Pilas("s", s)
+"""
+
+
+def induccion(n: int) -> str:
+    """Multiplicaciones por el contador: pasan a una suma por vuelta."""
+    return f"""Parce s = 0
+Parce k = {n}
+Boliche i in {n} {{
+    Parce y = i * 4
+    s = s + y
+}}
+Rumba (k > 0) {{
+    Parce z = k * 3
+    s = s - z
+    k = k - 1
+}}
+Pilas("s", s)
+"""
+
+
+PROGRAMS = {"invariante": invariante, "anidado": anidado, "induccion": induccion}
+
+
+def compile_program(source: str, loops: bool):
+    opt = IROptimizer(parse_and_generate_ir(source), loops=loops)
+    opt.optimize()
+    peep = StackPeepholeOptimizer(StackMachineCodeGenerator(opt.get_code()).generate())
+    peep.optimize()
+    return opt, peep.get_code()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de LICM y reducción de fuerza")
+    ap.add_argument("-n", type=int, default=20000, help="Iteraciones de cada bucle")
+    ap.add_argument("-r", "--repeat", type=int, default=3, help="Repeticiones (se toma la mejor)")
+    args = ap.parse_args()
+
+    print(f"{'':<11} {'despachos (sin → con)':>24}  {'tiempo':>22}")
+    reports = []
+    for name, build in PROGRAMS.items():
+        source = build(args.n)
+        _, plain = compile_program(source, loops=False)
+        opt, looped = compile_program(source, loops=True)
+        assert output_of(plain) == output_of(looped), name
+        d_plain, d_loop = dispatch_count(plain), dispatch_count(looped)
+        t_plain = best_of(run_decoded, plain, args.repeat)
+        t_loop = best_of(run_decoded, looped, args.repeat)
+        print(f"{name:<11} {d_plain:>10} → {d_loop:<10} {t_plain:8.4f}s → {t_loop:8.4f}s  "
+              f"(-{100 * (1 - d_loop / d_plain):.0f}% despachos, {t_plain / t_loop:4.2f}x)")
+        reports.append((name, opt.loop_report()))
+
+    for name, report in reports:
+        print(f"\n{name}:\n{report}")
+
+
+if __name__ == "__main__":
+    main()
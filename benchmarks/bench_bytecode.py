@@ -0,0 +1,118 @@
+"""
+Benchmark del bytecode binario
+------------------------------
+Para cada programa de `cargas.py` compara el código de máquina en texto
+(codigo_maquina.txt) con el bytecode .pcb:
+  • tamaño en disco
+  • tiempo hasta tener el programa listo para simular: compilar desde el
+    fuente, leer y decodificar el texto, o abrir el .pcb y decodificarlo (con
+    mmap desde `MMAP_MIN_SIZE`; más chico se lee de una vez)
+Las lecturas duran décimas de ms: se repiten hasta sumar ~0.2 s (timeit) y
+se toma el mejor promedio, así una interrupción del sistema no se cuela.
+Además mide, en procesos nuevos de Python, `main.py` con el fuente (sin caché)
+vs. con el .pcb (no importa Lark ni el optimizador). Las salidas deben ser iguales.
+
+Uso:
+    python benchmarks/bench_bytecode.py [--scale 2] [-r 5]
+"""
+
+from pathlib import Path
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from main import compile_source
+from sim_instrucciones_pila import decode
+from bytecode_pila import MMAP_MIN_SIZE, load_bytecode, write_bytecode
+from cargas import workloads
+
+
+def best_time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def per_call(fn, repeat: int) -> float:
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def from_text(path: Path):
+    return decode(path.read_text(encoding="utf-8").splitlines())
+
+
+def from_bytecode(path: Path):
+    with load_bytecode(path) as bytecode:
+        return bytecode.decode()
+
+
+def run_main(args) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "main.py", *args], cwd=ROOT, check=True,
+                   stdout=subprocess.DEVNULL)
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark del bytecode binario (.pcb)")
+    ap.add_argument("--scale", type=float, default=2.0, help="Multiplicador de tamaño de las cargas")
+    ap.add_argument("-r", "--repeat", type=int, default=5, help="Repeticiones (se toma la mejor)")
+    args = ap.parse_args()
+
+    programs = workloads(args.scale)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        print(f"{'':<19} {'texto':>10} {'pcb':>10}      {'compilar':>9} {'texto':>9} {'pcb':>9}")
+        largest = None
+        for name, (source, inputs) in programs.items():
+            _, machine, _ = compile_source(source)
+            text, pcb = tmp / f"{name}.txt", tmp / f"{name}.pcb"
+            text.write_text("\n".join(machine), encoding="utf-8")
+            pcb_size = write_bytecode(pcb, machine)
+            assert from_bytecode(pcb) == from_text(text), name
+
+            t_compile = best_time(lambda: compile_source(source), max(1, args.repeat // 2))
+            t_text = per_call(lambda: from_text(text), args.repeat)
+            t_pcb = per_call(lambda: from_bytecode(pcb), args.repeat)
+            text_size = text.stat().st_size
+            mapped = "mmap" if pcb_size >= MMAP_MIN_SIZE else ""
+            print(f"{name:<19} {text_size:>8} B {pcb_size:>8} B ({100 * (1 - pcb_size / text_size):3.0f}%)"
+                  f" {t_compile * 1000:7.1f}ms {t_text * 1000:7.3f}ms {t_pcb * 1000:7.3f}ms "
+                  f"({t_text / t_pcb:4.1f}x) {mapped}")
+            if largest is None or len(machine) > largest[1]:
+                largest = (name, len(machine), source, inputs)
+
+        # ---- arranque de main.py en un proceso nuevo ----
+        name, _, source, inputs = largest
+        src = tmp / f"{name}.parce"
+        src.write_text(source, encoding="utf-8")
+        entrada = tmp / "entrada.txt"
+        entrada.write_text("\n".join(inputs) + "\n", encoding="utf-8")
+        common = ["--no-cache", "--input-file", str(entrada)]
+        run_main(["-i", str(src), "-o", str(tmp / "fuente"), "--bytecode", *common])
+        pcb = tmp / "fuente" / "codigo_maquina.pcb"
+
+        print(f"\nmain.py con {name} ({args.repeat} corridas, mediana):")
+        for label, cli in (("fuente (--no-cache)", ["-i", str(src), "-o", str(tmp / "a")]),
+                           ("bytecode .pcb", ["-i", str(pcb), "-o", str(tmp / "b")])):
+            times = [run_main(cli + common) for _ in range(args.repeat)]
+            print(f"  {label:<20} {statistics.median(times) * 1000:8.1f} ms")
+        same = ((tmp / "a" / "salida_simulacion.txt").read_text(encoding="utf-8")
+                == (tmp / "b" / "salida_simulacion.txt").read_text(encoding="utf-8"))
+        assert same, "el .pcb imprimió algo distinto"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark de subexpresiones comunes
+-----------------------------------
+Compila cada programa con `IROptimizer(cse=False)` y `IROptimizer(cse=True)`
+(numeración de valores + propagación de copias) y compara líneas de IR,
+instrucciones de pila despachadas y tiempo de pared. Las dos versiones deben
+imprimir lo mismo.
+
+Uso:
+    python benchmarks/bench_cse.py [-n 20000] [-r 3]
+"""
+
+from pathlib import Path
+import argparse
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from representacion_intermedia import parse_and_generate_ir
+from ir_optimizer import IROptimizer
+from sim_maquina_pila import StackMachineCodeGenerator
+from peephole_pila import StackPeepholeOptimizer
+from bench_simulador import best_of, run_decoded
+from bench_superinstrucciones import dispatch_count
+from bench_salidas import output_of
+
+
+# ---------- Programas ----------
+def repetidas(n: int) -> str:
+    """La misma subexpresión escrita varias veces en el cuerpo del bucle."""
+    return f"""Parce s = 0
+Parce a = 3
+Parce b = 7
+Boliche i in {n} {{
+    Parce x = (i + a) * (i + a) - b * a
+    Parce y = (i + a) * b + b * a
+    s = s + x - y
+}}
+Pilas("s", s)
+"""
+
+
+def orale(n: int) -> str:
+    """Cadena Orale pues que repite condiciones y cálculos de las ramas anteriores."""
+    return f"""Parce s = 0
+Boliche i in {n} {{
+    Parce r = i - i / 3 * 3
+    Pues (r * 2 > 2) {{
+        s = s + r * 2
+    }} Orale pues (r * 2 > 2) {{
+        s = s - 1
+    }} Orale pues (r * 2 == 2) {{
+        s = s + r * 2 + 1
+    }} Orale {{
+        s = s + 1
+    }}
+}}
+Pilas("s", s)
+"""
+
+
+def copias(n: int) -> str:
+    """Variables que sólo copian a otras: las lecturas van directo al original."""
+    return f"""Parce s = 0
+Parce k = 5
+Boliche i in {n} {{
+    Parce a = i
+    Parce b = a
+    Parce c = b * k
+    Parce d = a * k
+    s = s + c + d
+}}
+Pilas("s", s)
+"""
+
+
+PROGRAMS = {"repetidas": repetidas, "orale": orale, "copias": copias}
+
+
+def compile_program(source: str, cse: bool):
+    opt = IROptimizer(parse_and_generate_ir(source), cse=cse)
+    opt.optimize()
+    ir = opt.get_code()
+    peep = StackPeepholeOptimizer(StackMachineCodeGenerator(ir).generate())
+    peep.optimize()
+    return len(ir), peep.get_code()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de CSE y propagación de copias")
+    ap.add_argument("-n", type=int, default=20000, help="Iteraciones de cada bucle")
+    ap.add_argument("-r", "--repeat", type=int, default=3, help="Repeticiones (se toma la mejor)")
+    args = ap.parse_args()
+
+    print(f"{'':<10} {'IR':>10}  {'despachos (sin → con)':>24}  {'tiempo':>22}")
+    for name, build in PROGRAMS.items():
+        source = build(args.n)
+        ir_off, plain = compile_program(source, cse=False)
+        ir_on, cse = compile_program(source, cse=True)
+        assert output_of(plain) == output_of(cse), name
+        d_plain, d_cse = dispatch_count(plain), dispatch_count(cse)
+        t_plain = best_of(run_decoded, plain, args.repeat)
+        t_cse = best_of(run_decoded, cse, args.repeat)
+        print(f"{name:<10} {ir_off:>4} → {ir_on:<4} {d_plain:>10} → {d_cse:<10} "
+              f"{t_plain:8.4f}s → {t_cse:8.4f}s  "
+              f"(-{100 * (1 - d_cse / d_plain):.0f}% despachos, {t_plain / t_cse:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark de eliminación de código muerto
+-----------------------------------------
+Mide `IROptimizer.dead_code_elimination` sobre IR de 1k, 10k y 100k líneas
+y lo compara con el pase original (una sola pasada hacia atrás con
+`insert(0, …)`, cuadrática). Hasta ~10k líneas el original sigue siendo más
+rápido (no arma el CFG); la diferencia aparece en 100k.
+
+Uso:
+    python benchmarks/bench_dce.py [--sizes 1000 10000 100000] [--max-ref N]
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ir_instrucciones import IRInstr
+from ir_optimizer import IROptimizer
+
+
+# ---------- IR sintético ----------
+def synthetic_ir(n_lines: int):
+    """Bucles con asignaciones vivas y muertas, ~12 líneas por bloque."""
+    code = [IRInstr.assign("i", "0"), IRInstr.assign("s", "0")]
+    k = 0
+    while len(code) < n_lines:
+        start, body, end = f"L{k}a", f"L{k}b", f"L{k}c"
+        code += [
+            IRInstr.binop(f"a{k}", "i", "+", "1"),
+            IRInstr.binop(f"d{k}", f"a{k}", "*", "2"),          # muerta
+            IRInstr.label(start),
+            IRInstr.binop(f"c{k}", "i", "<", "3"),
+            IRInstr("if", None, (f"c{k}", body)),
+            IRInstr.goto(end),
+            IRInstr.label(body),
+            IRInstr.binop(f"u{k}", "s", "+", f"a{k}"),
+            IRInstr.assign("s", f"u{k}"),
+            IRInstr.binop("i", "i", "+", "1"),
+            IRInstr.goto(start),
+            IRInstr.label(end),
+        ]
+        k += 1
+    code.append(IRInstr("print", None, ("s", "s")))
+    return code
+
+
+# ---------- Pase original (referencia) ----------
+def legacy_dce(code):
+    useful, new = set(), []
+    for ins in reversed(code):
+        if ins.has_side_effects:
+            new.insert(0, ins)
+            useful.update(ins.uses())
+        elif ins.dest in useful:
+            new.insert(0, ins)
+            useful.update(ins.uses())
+    return new
+
+
+def timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de DCE")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--max-ref", type=int, default=None,
+                    help="Tamaño máximo para correr el pase original (por defecto, todos)")
+    args = ap.parse_args()
+    max_ref = args.max_ref if args.max_ref is not None else max(args.sizes)
+
+    print(f"{'líneas':>8}  {'liveness':>10}  {'original':>10}  {'salida':>8}")
+    for n in args.sizes:
+        code = synthetic_ir(n)
+        opt = IROptimizer(code)
+        t_new = timed(opt.dead_code_elimination)
+        t_ref = timed(lambda: legacy_dce(code)) if n <= max_ref else None
+        ref = f"{t_ref:9.4f}s" if t_ref is not None else f"{'-':>10}"
+        print(f"{len(code):>8}  {t_new:9.4f}s  {ref}  {len(opt.get_code()):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark de compilación incremental
+------------------------------------
+Edita una sola sentencia de programas grandes y compara cuánto tarda
+`IncrementalCompiler` (con los fragmentos de la versión anterior) contra
+`compile_source` desde cero. También mide una edición que no cambia el IR
+(espacios), donde se saltea todo el backend.
+
+Uso:
+    python benchmarks/bench_incremental.py [--scale 2]
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from main import IncrementalCompiler, compile_source
+from cargas import workloads
+
+
+def timed(fn, *args) -> float:
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+
+def edit_middle(source: str, new_text: str) -> str:
+    # Reemplaza la línea del medio del programa por otra sentencia
+    lines = source.splitlines()
+    lines[len(lines) // 2] = new_text
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de compilación incremental")
+    ap.add_argument("--scale", type=float, default=2.0, help="Multiplicador de tamaño de las cargas")
+    args = ap.parse_args()
+
+    compile_source("Parce x = 1")           # tablas del parser ya cargadas
+    print(f"{'carga':<20} {'completo':>10} {'incremental':>12} {'sólo espacios':>14}")
+    loads = workloads(args.scale)
+    programs = {
+        "declaraciones": loads["declaraciones"][0],
+        "mixto": loads["declaraciones"][0] + loads["bucles_anidados"][0],
+    }
+    for name, source in programs.items():
+        edited = edit_middle(source, 'Pilas("editado", 1)')
+        spaced = edited.replace('Pilas("editado", 1)', 'Pilas("editado",   1)')
+
+        inc = IncrementalCompiler()
+        inc.compile(source)
+        t_inc = timed(inc.compile, edited)
+        t_ws = timed(inc.compile, spaced)
+        t_full = timed(compile_source, edited)
+        print(f"{name:<20} {t_full * 1000:8.1f} ms {t_inc * 1000:9.1f} ms {t_ws * 1000:11.1f} ms"
+              f"   ({inc.report()})")
+
+
+if __name__ == "__main__":
+    main()
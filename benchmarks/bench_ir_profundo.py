@@ -0,0 +1,108 @@
+"""
+Benchmark de generación de IR en programas muy anidados
+-------------------------------------------------------
+Genera programas con 1k a 20k operadores (o bloques) anidados y mide
+`generate_ir` por separado del parser y el pipeline completo con
+`compile_source`. La columna µs/nodo queda constante si el escalado es lineal.
+
+La referencia repite la generación original, que concatenaba el código de los
+hijos en cada nodo (cuadrática). Corre con el recorrido iterativo: el
+`Transformer` recursivo de Lark ya no llegaba a 1000 niveles (RecursionError).
+
+Uso:
+    python benchmarks/bench_ir_profundo.py [--sizes 1000 5000 10000 20000] [--max-ref 10000]
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ir_instrucciones import IRInstr
+from main import compile_source
+from representacion_intermedia import IRGenerator, flatten, generate_ir, parse
+from cargas import expresion_profunda
+
+
+# ---------- Programas ----------
+def cadena(n: int) -> str:
+    """`x + 1 * 2 - 3 …` sin paréntesis: árbol profundo hacia la izquierda."""
+    ops = ("+", "*", "-")
+    terms = " ".join(f"{ops[i % 3]} {i % 7 + 1}" for i in range(n))
+    return f'Parce x = Guita("x:")\nParce y = x {terms}\nPilas("y", y)\n'
+
+
+def bloques(n: int) -> str:
+    """`n` bloques Pues anidados, cada uno con su Orale."""
+    return ('Parce x = Guita("x:")\n'
+            + "Pues (x > 0) {\n" * n
+            + 'Pilas("adentro", x)\n'
+            + '} Orale {\nPilas("no")\n}\n' * n)
+
+
+SHAPES = {
+    "cadena": cadena,
+    "paréntesis": lambda n: expresion_profunda(n)[0],
+    "bloques": bloques,
+}
+
+
+# ---------- Generación original (referencia) ----------
+class LegacyIRGenerator(IRGenerator):
+    """Concatena listas en cada nodo, como antes de las cuerdas."""
+
+    def bin_expr(self, items):
+        code_l, val_l = items[0]
+        code_r, val_r = items[2]
+        t = self.new_temp()
+        return code_l + code_r + [IRInstr.binop(t, val_l, items[1].value, val_r)], t
+
+    def if_chain(self, items):
+        return flatten(super().if_chain(items))
+
+    def block(self, stmts):
+        code = []
+        for s in stmts:
+            code += s[0] if isinstance(s, tuple) else s
+        return code
+
+
+def timed(fn, *args) -> float:
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de IR en programas anidados")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000, 20000])
+    ap.add_argument("--max-ref", type=int, default=10000,
+                    help="Tamaño máximo para correr la generación original")
+    args = ap.parse_args()
+
+    compile_source("Parce x = 1")           # tablas del parser ya cargadas
+    print(f"{'forma':<12} {'nodos':>6}  {'parse':>8}  {'IR':>8}  {'µs/nodo':>7}"
+          f"  {'original':>9}  {'compilar':>9}")
+    for name, build in SHAPES.items():
+        for n in args.sizes:
+            source = build(n)
+            t0 = time.perf_counter()
+            tree = parse(source)
+            t_parse = time.perf_counter() - t0
+            t_ir = timed(generate_ir, tree)
+            if n <= args.max_ref:
+                t_ref = timed(lambda: flatten(LegacyIRGenerator().transform(tree)))
+                ref = f"{t_ref:8.3f}s"
+            else:
+                ref = f"{'-':>9}"
+            t_all = timed(compile_source, source)
+            print(f"{name:<12} {n:>6}  {t_parse:7.3f}s  {t_ir:7.3f}s  {t_ir / n * 1e6:7.1f}"
+                  f"  {ref}  {t_all:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
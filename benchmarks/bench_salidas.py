@@ -0,0 +1,150 @@
+"""
+Benchmark de bucles con salidas tempranas
+-----------------------------------------
+`Paila` y `Andale` se traducen a saltos directos. Cada caso compara el bucle
+que los usa con el mismo cálculo escrito con una variable bandera (la única
+forma de cortar un bucle antes de tenerlos): instrucciones despachadas y
+tiempo de pared. Las dos versiones deben imprimir lo mismo.
+
+Uso:
+    python benchmarks/bench_salidas.py [-n 50000] [-r 3]
+"""
+
+from pathlib import Path
+import argparse
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from main import compile_source
+from salida_pila import MemoryOutput
+from sim_instrucciones_pila import StackMachineSimulator
+from bench_simulador import best_of, run_decoded
+from bench_superinstrucciones import dispatch_count
+
+
+# ---------- Programas: (con Paila/Andale, con bandera) ----------
+def saltear(n: int):
+    """Boliche que saltea las vueltas pares con Andale y corta en 3/4 con Paila."""
+    stop = n * 3 // 4
+    jumps = f"""Parce s = 0
+Parce p = 0
+Boliche i in {n} {{
+    Pues (i == {stop}) {{
+        Paila
+    }}
+    p = 1 - p
+    Pues (p == 1) {{
+        Andale
+    }}
+    s = s + i
+}}
+Pilas("s", s)
+"""
+    flags = f"""Parce s = 0
+Parce p = 0
+Parce seguir = 1
+Boliche i in {n} {{
+    Pues (i == {stop}) {{
+        seguir = 0
+    }}
+    Pues (seguir) {{
+        p = 1 - p
+        Pues (p == 0) {{
+            s = s + i
+        }}
+    }}
+}}
+Pilas("s", s)
+"""
+    return jumps, flags
+
+
+def rumba_sin_fin(n: int):
+    """Rumba Posta que termina con Paila."""
+    jumps = f"""Parce k = 0
+Rumba Posta {{
+    k = k + 1
+    Pues (k == {n}) {{
+        Paila
+    }}
+}}
+Pilas("k", k)
+"""
+    flags = f"""Parce k = 0
+Parce seguir = 1
+Rumba (seguir) {{
+    k = k + 1
+    Pues (k == {n}) {{
+        seguir = 0
+    }}
+}}
+Pilas("k", k)
+"""
+    return jumps, flags
+
+
+def busqueda(n: int):
+    """Boliche anidado cuyo bucle interno corta apenas b > a (triángulo)."""
+    m = int(n ** 0.5) * 2
+    jumps = f"""Parce hits = 0
+Boliche a in {m} {{
+    Boliche b in {m} {{
+        Pues (b > a) {{
+            Paila
+        }}
+        hits = hits + 1
+    }}
+}}
+Pilas("hits", hits)
+"""
+    flags = f"""Parce hits = 0
+Boliche a in {m} {{
+    Parce dentro = 1
+    Boliche b in {m} {{
+        Pues (b > a) {{
+            dentro = 0
+        }}
+        Pues (dentro) {{
+            hits = hits + 1
+        }}
+    }}
+}}
+Pilas("hits", hits)
+"""
+    return jumps, flags
+
+
+CASES = {"saltear": saltear, "rumba_sin_fin": rumba_sin_fin, "busqueda": busqueda}
+
+
+def machine_code(source: str):
+    return compile_source(source)[1]
+
+
+def output_of(code) -> str:
+    out = MemoryOutput()
+    StackMachineSimulator(code, output=out).run()
+    return out.getvalue()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de Paila/Andale")
+    ap.add_argument("-n", type=int, default=50000, help="Iteraciones de cada bucle")
+    ap.add_argument("-r", "--repeat", type=int, default=3, help="Repeticiones (se toma la mejor)")
+    args = ap.parse_args()
+
+    print(f"{'':<14} {'despachos (bandera → saltos)':>28}  {'tiempo':>22}")
+    for name, make in CASES.items():
+        flags, jumps = (machine_code(src) for src in reversed(make(args.n)))
+        assert output_of(flags) == output_of(jumps), name
+        d_flags, d_jumps = dispatch_count(flags), dispatch_count(jumps)
+        t_flags = best_of(run_decoded, flags, args.repeat)
+        t_jumps = best_of(run_decoded, jumps, args.repeat)
+        print(f"{name:<14} {d_flags:>12} → {d_jumps:<12} {t_flags:8.4f}s → {t_jumps:8.4f}s  "
+              f"(-{100 * (1 - d_jumps / d_flags):.0f}% despachos, "
+              f"{t_flags / t_jumps:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark del simulador de pila
+-------------------------------
+Compara el intérprete original (re-parsea el texto en cada paso) contra el
+motor con instrucciones pre-decodificadas, sobre programas con bucles, con y
+sin el peephole sobre el código de pila.
+
+Uso:
+    python benchmarks/bench_simulador.py [-n 20000] [-r 3]
+"""
+
+from pathlib import Path
+import argparse
+import contextlib
+import io
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from representacion_intermedia import parse_and_generate_ir
+from sim_maquina_pila import StackMachineCodeGenerator
+from sim_instrucciones_pila import StackMachineSimulator
+from peephole_pila import StackPeepholeOptimizer
+
+
+# ---------- Programas de prueba ----------
+def rumba_program(n: int) -> str:
+    return f"""
+Parce i = 0
+Parce s = 0
+Rumba (i < {n}) {{
+    s = s + (i * 2)
+    i = i + 1
+}}
+Pilas("s", s)
+"""
+
+
+def boliche_program(n: int) -> str:
+    return f"""
+Parce s = 0
+Boliche k in {n} {{
+    Pues (k > 10) {{
+        s = s + k
+    }} Orale {{
+        s = s - 1
+    }}
+}}
+Pilas("s", s)
+"""
+
+
+def compile_machine_code(source: str):
+    # Sin optimizador: se mide sólo la máquina de pila.
+    ir = parse_and_generate_ir(source)
+    return StackMachineCodeGenerator(ir).generate()
+
+
+# ---------- Intérprete de referencia (texto por paso) ----------
+def run_textual(code):
+    """Réplica del bucle original: strip/split/float y lambdas en cada paso."""
+    labels = {line.split()[1]: i for i, line in enumerate(code) if line.startswith("LABEL ")}
+    stack, variables, pc = [], {}, 0
+
+    def binop(fn):
+        b = stack.pop()
+        a = stack.pop()
+        stack.append(fn(a, b))
+
+    while pc < len(code):
+        line = code[pc].strip()
+        parts = line.split(maxsplit=1)
+        match parts[0]:
+            case "PUSH": stack.append(float(parts[1]))
+            case "LOAD" | "LOAD_SLOT": stack.append(variables.get(parts[1], 0.0))
+            case "STORE" | "STORE_SLOT": variables[parts[1]] = stack.pop()
+            case "ADD" | "ADD_I": binop(lambda a, b: a + b)
+            case "SUB" | "SUB_I": binop(lambda a, b: a - b)
+            case "MUL" | "MUL_I": binop(lambda a, b: a * b)
+            case "DIV": binop(lambda a, b: a / b if b != 0 else float("inf"))
+            case "GT": binop(lambda a, b: 1.0 if a > b else 0.0)
+            case "LT": binop(lambda a, b: 1.0 if a < b else 0.0)
+            case "GE": binop(lambda a, b: 1.0 if a >= b else 0.0)
+            case "LE": binop(lambda a, b: 1.0 if a <= b else 0.0)
+            case "EQ": binop(lambda a, b: 1.0 if a == b else 0.0)
+            case "NE": binop(lambda a, b: 1.0 if a != b else 0.0)
+            case "JNZ":
+                if stack.pop() != 0:
+                    pc = labels[parts[1]]
+                    continue
+            case "JMP":
+                pc = labels[parts[1]]
+                continue
+            case "LABEL": pass
+            case "PRINT":
+                print(parts[1].strip('"') if len(parts) == 2 else stack.pop(), end=" ")
+                print()
+        pc += 1
+
+
+def run_decoded(code):
+    StackMachineSimulator(code).run()
+
+
+def best_of(fn, code, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            fn(code)
+            best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark del simulador de pila")
+    ap.add_argument("-n", type=int, default=20000, help="Iteraciones de cada bucle")
+    ap.add_argument("-r", "--repeat", type=int, default=3, help="Repeticiones (se toma la mejor)")
+    args = ap.parse_args()
+
+    for name, make in (("Rumba", rumba_program), ("Boliche", boliche_program)):
+        code = compile_machine_code(make(args.n))
+        t_text = best_of(run_textual, code, args.repeat)
+        t_dec = best_of(run_decoded, code, args.repeat)
+        peep = StackPeepholeOptimizer(code)
+        peep.optimize()
+        t_peep = best_of(run_decoded, peep.get_code(), args.repeat)
+        print(f"{name:<8} texto: {t_text:8.4f}s  decodificado: {t_dec:8.4f}s  "
+              f"+peephole: {t_peep:8.4f}s  speedup: {t_text / t_peep:5.2f}x  "
+              f"({len(code)} → {len(peep.get_code())} instr.)")
+
+
+if __name__ == "__main__":
+    main()
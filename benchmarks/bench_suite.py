@@ -0,0 +1,117 @@
+"""
+Suite de benchmarks del compilador
+----------------------------------
+Genera las cargas de `cargas.py`, mide cada etapa del pipeline y el simulador
+por separado (mejor de N repeticiones) y guarda los resultados en JSON. Con
+--baseline compara contra una corrida anterior y termina con código 1 si
+alguna etapa empeoró más que la tolerancia.
+
+Uso:
+    python benchmarks/bench_suite.py -o resultados_bench.json
+    python benchmarks/bench_suite.py --baseline resultados_bench.json --tolerance 0.2
+"""
+
+from pathlib import Path
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from main import compile_source
+from metricas import PipelineMetrics
+from sim_instrucciones_pila import StackMachineSimulator
+from entrada_pila import ListInput
+from cargas import workloads
+
+# Diferencias menores a esto (ms) se consideran ruido
+MIN_DELTA_MS = 1.0
+
+
+def simulate(machine_code, inputs) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        StackMachineSimulator(machine_code, input_provider=ListInput(inputs)).run()
+
+
+def measure(source: str, inputs, repeat: int, memory: bool) -> dict:
+    best: dict = {}
+    sizes: dict = {}
+    for _ in range(repeat):
+        metrics = PipelineMetrics(memory=memory)
+        _, machine_code, _ = compile_source(source, metrics=metrics)
+        with metrics.stage("simulate"):
+            simulate(machine_code, inputs)
+        for st in metrics.stages:
+            name = st["stage"]
+            if name == "parser_load":
+                continue                 # costo de arranque, no de la carga
+            best[name] = min(best.get(name, float("inf")), st["time_ms"])
+            sizes[name] = {k: v for k, v in st.items() if k not in ("stage", "time_ms")}
+    return {"time_ms": best, "sizes": sizes}
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for name, res in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        for stage, ms in res["time_ms"].items():
+            old = base["time_ms"].get(stage)
+            if old is None:
+                continue
+            if ms > old * (1 + tolerance) and ms - old > MIN_DELTA_MS:
+                regressions.append((name, stage, old, ms))
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Suite de benchmarks del compilador")
+    ap.add_argument("-o", "--output", default="bench_resultados.json", help="Archivo JSON de resultados")
+    ap.add_argument("--scale", type=float, default=1.0, help="Multiplicador de tamaño de las cargas")
+    ap.add_argument("-r", "--repeat", type=int, default=3, help="Repeticiones (se toma la mejor)")
+    ap.add_argument("--memory", action="store_true", help="Medir también el pico de memoria (más lento)")
+    ap.add_argument("--baseline", help="JSON de una corrida anterior para comparar")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="Empeoramiento tolerado (0.2 = 20%%)")
+    ap.add_argument("--only", nargs="+", help="Correr sólo estas cargas")
+    args = ap.parse_args()
+
+    results = {}
+    for name, (source, inputs) in workloads(args.scale).items():
+        if args.only and name not in args.only:
+            continue
+        res = measure(source, inputs, args.repeat, args.memory)
+        results[name] = res
+        stages = "  ".join(f"{st}={ms:.2f}" for st, ms in res["time_ms"].items())
+        print(f"{name:<20} {stages}")
+
+    current = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": args.scale,
+            "repeat": args.repeat,
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(current, indent=1), encoding="utf-8")
+    print(f"\nResultados en {Path(args.output).resolve()}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(current, baseline, args.tolerance)
+        for name, stage, old, new in regressions:
+            print(f"❌ {name}/{stage}: {old:.2f} ms → {new:.2f} ms (+{100 * (new / old - 1):.0f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ Sin regresiones respecto de {args.baseline} (tolerancia {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark de superinstrucciones
+-------------------------------
+Compila los bucles de ejemplo con el pipeline completo y compara el código
+de pila con y sin superinstrucciones (INC_SLOT, COPY_SLOT, Jcc_SLOT_K):
+cantidad de instrucciones despachadas y tiempo de pared.
+
+Uso:
+    python benchmarks/bench_superinstrucciones.py [-n 20000] [-r 3]
+"""
+
+from pathlib import Path
+import argparse
+import contextlib
+import io
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from representacion_intermedia import parse_and_generate_ir
+from ir_optimizer import IROptimizer
+from sim_maquina_pila import StackMachineCodeGenerator
+from peephole_pila import StackPeepholeOptimizer
+from sim_instrucciones_pila import StackMachineSimulator
+from bench_simulador import rumba_program, boliche_program, best_of, run_decoded
+
+
+class CountingProgram(list):
+    """Lista de instrucciones que cuenta cada búsqueda del ciclo principal."""
+    fetches = 0
+
+    def __getitem__(self, index):
+        self.fetches += 1
+        return list.__getitem__(self, index)
+
+
+def compile_program(source: str, superinstructions: bool):
+    opt = IROptimizer(parse_and_generate_ir(source))
+    opt.optimize()
+    code = StackMachineCodeGenerator(opt.get_code()).generate()
+    peep = StackPeepholeOptimizer(code, superinstructions=superinstructions)
+    peep.optimize()
+    return peep.get_code()
+
+
+def dispatch_count(code) -> int:
+    sim = StackMachineSimulator(code)
+    sim.program = CountingProgram(sim.program)
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim.run()
+    return sim.program.fetches
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de superinstrucciones")
+    ap.add_argument("-n", type=int, default=20000, help="Iteraciones de cada bucle")
+    ap.add_argument("-r", "--repeat", type=int, default=3, help="Repeticiones (se toma la mejor)")
+    args = ap.parse_args()
+
+    print(f"{'':<8} {'despachos':>22}  {'tiempo':>22}")
+    for name, make in (("Rumba", rumba_program), ("Boliche", boliche_program)):
+        source = make(args.n)
+        plain = compile_program(source, superinstructions=False)
+        fused = compile_program(source, superinstructions=True)
+        d_plain, d_fused = dispatch_count(plain), dispatch_count(fused)
+        t_plain = best_of(run_decoded, plain, args.repeat)
+        t_fused = best_of(run_decoded, fused, args.repeat)
+        print(f"{name:<8} {d_plain:>10} → {d_fused:<10} {t_plain:8.4f}s → {t_fused:8.4f}s  "
+              f"(-{100 * (1 - d_fused / d_plain):.0f}% despachos, "
+              f"{t_plain / t_fused:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Generador de programas .parce sintéticos para benchmarks
+--------------------------------------------------------
+Cada función devuelve (fuente, entradas) donde `entradas` son las respuestas
+que recibirán los `Guita` del programa, así nada queda esperando teclado.
+
+Uso directo (escribe los .parce en un directorio):
+    python benchmarks/cargas.py -o cargas --scale 2
+"""
+
+from pathlib import Path
+import argparse
+
+
+def expresion_profunda(depth: int = 300):
+    """Una expresión con `depth` operadores anidados entre paréntesis."""
+    ops = ("+", "*", "-")
+    expr = "x"
+    for i in range(depth):
+        expr = f"({expr} {ops[i % 3]} {i % 7 + 1})"
+    src = f"""Parce x = Guita("x:")
+Parce y = {expr}
+Pilas("y", y)
+"""
+    return src, ["3"]
+
+
+def cadena_pues(branches: int = 500):
+    """Un Pues con `branches` ramas Orale pues y un Orale final."""
+    parts = ['Parce x = Guita("x:")', 'Pues (x == 0) {', '    Pilas("rama", 0)', "}"]
+    for i in range(1, branches):
+        parts += [f"Orale pues (x == {i}) {{", f'    Pilas("rama", {i})', "}"]
+    parts += ["Orale {", '    Pilas("ninguna")', "}"]
+    return "\n".join(parts) + "\n", [str(branches - 1)]
+
+
+def bucles_anidados(outer: int = 60, inner: int = 60):
+    """Boliche dentro de Boliche y Rumba dentro de Rumba."""
+    src = f"""Parce s = 0
+Boliche i in {outer} {{
+    Boliche j in {inner} {{
+        s = s + i * j
+    }}
+}}
+Parce a = 0
+Parce t = 0
+Rumba (a < {outer}) {{
+    Parce b = 0
+    Rumba (b < {inner}) {{
+        t = t + a - b
+        b = b + 1
+    }}
+    a = a + 1
+}}
+Pilas("s", s)
+Pilas("t", t)
+"""
+    return src, []
+
+
+def salidas_tempranas(n: int = 2000):
+    """Bucles que salen antes con Paila o saltean vueltas con Andale."""
+    stop = n * 3 // 4
+    src = f"""Parce s = 0
+Parce p = 0
+Boliche i in {n} {{
+    Pues (i == {stop}) {{
+        Paila
+    }}
+    p = 1 - p
+    Pues (p == 1) {{
+        Andale
+    }}
+    s = s + i
+}}
+Parce k = 0
+Rumba Posta {{
+    k = k + 1
+    Pues (k == {stop}) {{
+        Paila
+    }}
+}}
+Parce d = 0
+Previa {{
+    d = d + 1
+    Pues (d < {stop // 2}) {{
+        Andale
+    }}
+    Pues (d == {stop}) {{
+        Paila
+    }}
+}} Rumba (Posta)
+Parce hits = 0
+Boliche a in {n // 20} {{
+    Boliche b in {n // 20} {{
+        Pues (b > a) {{
+            Paila
+        }}
+        hits = hits + 1
+    }}
+}}
+Pilas("s", s)
+Pilas("k", k)
+Pilas("d", d)
+Pilas("hits", hits)
+"""
+    return src, []
+
+
+def declaraciones(count: int = 3000):
+    """Miles de Parce encadenados."""
+    lines = ['Parce v0 = Guita("v0:")']
+    lines += [f"Parce v{i} = v{i - 1} + {i % 10}" for i in range(1, count)]
+    lines.append(f'Pilas("ultimo", v{count - 1})')
+    return "\n".join(lines) + "\n", ["1"]
+
+
+def workloads(scale: float = 1.0):
+    """Nombre -> (fuente, entradas) con tamaños multiplicados por `scale`."""
+    s = lambda n: max(1, int(n * scale))
+    return {
+        "expresion_profunda": expresion_profunda(s(300)),
+        "cadena_pues": cadena_pues(s(500)),
+        "bucles_anidados": bucles_anidados(s(60), s(60)),
+        "declaraciones": declaraciones(s(3000)),
+        "salidas_tempranas": salidas_tempranas(s(2000)),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Genera programas .parce sintéticos")
+    ap.add_argument("-o", "--output", default="cargas", help="Directorio de salida")
+    ap.add_argument("--scale", type=float, default=1.0, help="Multiplicador de tamaño")
+    args = ap.parse_args()
+
+    out = Path(args.output)
+    out.mkdir(parents=True, exist_ok=True)
+    for name, (src, inputs) in workloads(args.scale).items():
+        (out / f"{name}.parce").write_text(src, encoding="utf-8")
+        (out / f"{name}.entrada").write_text("\n".join(inputs) + "\n", encoding="utf-8")
+        print(f"{name}.parce  ({len(src.splitlines())} líneas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""Tests de las cargas sintéticas y de la comparación de bench_suite."""
+import pytest
+
+from bench_suite import compare
+from cargas import workloads
+
+WORKLOADS = workloads(0.05)
+
+
+@pytest.mark.parametrize("name", sorted(WORKLOADS))
+def test_cada_carga_misma_salida(same_output, name):
+    source, inputs = WORKLOADS[name]
+    assert same_output(source, inputs).strip()
+
+
+def test_valores_de_las_cargas(run):
+    _, inputs = WORKLOADS["declaraciones"]
+    source, _ = workloads(0.01)["declaraciones"]      # 30 declaraciones
+    expected = 1 + sum(i % 10 for i in range(1, 30))
+    assert run(source, inputs).split()[-2:] == ["ultimo", str(expected)]
+    source, inputs = WORKLOADS["cadena_pues"]           # 25 ramas
+    assert run(source, inputs).split()[-2:] == ["rama", "24"]
+
+
+def test_compare_detecta_regresiones():
+    baseline = {"results": {"a": {"time_ms": {"parse": 10.0, "ir": 0.1}}}}
+    current = {"results": {"a": {"time_ms": {"parse": 13.0, "ir": 0.5, "nueva": 1.0}},
+                           "b": {"time_ms": {"parse": 99.0}}}}
+    # ir empeoró 400% pero por menos de MIN_DELTA_MS: es ruido
+    assert compare(current, baseline, 0.2) == [("a", "parse", 10.0, 13.0)]
+    assert compare(current, baseline, 0.5) == []
@@ -0,0 +1,414 @@
+"""
+Bytecode binario para la máquina de pila
+----------------------------------------
+• `write_bytecode(path, code)` guarda el código de máquina (texto) como .pcb
+• `load_bytecode(path)` lo abre con mmap; el simulador lo acepta en lugar
+  del texto: `StackMachineSimulator(load_bytecode(path))`. Un archivo chico
+  (< 64 KiB) se lee de una vez: ahí armar el mapeo cuesta más que leerlo
+• Las instrucciones se decodifican directo del mapeo (memoryview de
+  palabras u32): sin leer el archivo a memoria ni parsear texto
+• `Bytecode.listing()` reconstruye el texto (perfilador y depuración)
+
+Formato (little‑endian, todo en un único archivo):
+
+    cabecera     "PRCB", versión u16, flags u16 y, como u32: cantidad y
+                 offset de constantes, de strings (tabla + datos), de
+                 símbolos y de código, cantidad de instrucciones y de slots
+    constantes   9 bytes c/u: tipo u8 (0 int64, 1 float64, 2 int grande
+                 como texto en el pool de strings) + valor de 8 bytes
+    strings      tabla (offset u32, largo u32) + datos UTF‑8: textos de
+                 PRINT/GUITA y nombres de LOAD/STORE, slots y etiquetas
+    símbolos     9 bytes c/u: tipo u8 (0 slot, 1 etiqueta), índice u32
+                 (slot o pc) y nombre u32 (string)
+    código       palabras u32 alineadas: opcode u8 + operando u24 (slot,
+                 constante, string o pc destino). El opcode es el índice de
+                 la mnemónica en `MNEMONICS`; INC_SLOT y COPY_SLOT llevan
+                 una palabra más con el segundo operando y Jcc_SLOT_K dos
+                 (constante y destino). Los saltos apuntan al n.º de
+                 instrucción, no de palabra.
+    constantes en el código: un int que entra va inmediato (con signo, en
+                 23 bits para PUSH y 31 en la palabra extra); si no, el bit
+                 más alto está prendido y el resto es el índice en el pool
+"""
+from __future__ import annotations
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional
+import mmap
+import os
+import struct
+import sys
+
+from ir_instrucciones import format_number
+from sim_instrucciones_pila import (
+    BINOPS, CMP_JUMPS, OP_ADD_I, OP_BINOP, OP_COPY_SLOT, OP_GUITA, OP_INC_SLOT,
+    OP_JCMP, OP_JCMP_SLOT_K, OP_JMP, OP_JNZ, OP_LOAD, OP_LOAD_SLOT, OP_MUL_I,
+    OP_PRINT, OP_PRINT_TEXT, OP_PUSH, OP_RETURN, OP_STORE, OP_STORE_SLOT, OP_SUB_I,
+    decode,
+)
+
+BYTECODE_SUFFIX = ".pcb"
+MAGIC = b"PRCB"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHH11I")
+_CONST = struct.Struct("<Bq")
+_CONST_FLOAT = struct.Struct("<Bd")
+_STRING = struct.Struct("<II")
+_SYMBOL = struct.Struct("<BII")
+
+NONE = 0xFFFFFF          # operando ausente (GUITA sin mensaje)
+MMAP_MIN_SIZE = 1 << 16  # desde este tamaño se mapea en vez de leer
+_POOLED_24, _POOLED_32 = 1 << 23, 1 << 31     # constante en el pool, no inmediata
+_INT, _FLOAT, _BIG_INT = 0, 1, 2
+_SLOT, _LABEL = 0, 1
+_INT64 = (-(1 << 63), (1 << 63) - 1)
+
+# ---- opcodes binarios: uno por mnemónica del texto ----
+MNEMONICS = (
+    "PUSH", "LOAD_SLOT", "STORE_SLOT", "LOAD", "STORE", "GUITA",
+    "PRINT", "PRINT_TEXT", "RETURN", "JNZ", "JMP", "ADD_I", "SUB_I", "MUL_I",
+    *BINOPS, *CMP_JUMPS, "INC_SLOT", "COPY_SLOT", *(f"{c}_SLOT_K" for c in CMP_JUMPS),
+)
+_OPCODE = {name: i for i, name in enumerate(MNEMONICS)}
+
+# Forma de los operandos de cada mnemónica
+_NO_ARG, _CONST_ARG, _INDEX_ARG, _TEXT_ARG, _FN, _CMP_JUMP, _COPY, _INC, _SLOT_K = range(9)
+
+
+def _shapes() -> Dict[str, tuple]:
+    """Mnemónica -> (opcode del simulador, forma, función de BINOPS/CMP_JUMPS)."""
+    table = {}
+    for name, op in (("PRINT", OP_PRINT), ("RETURN", OP_RETURN),
+                     ("ADD_I", OP_ADD_I), ("SUB_I", OP_SUB_I), ("MUL_I", OP_MUL_I)):
+        table[name] = (op, _NO_ARG, None)
+    table["PUSH"] = (OP_PUSH, _CONST_ARG, None)
+    for name, op in (("LOAD_SLOT", OP_LOAD_SLOT), ("STORE_SLOT", OP_STORE_SLOT),
+                     ("JNZ", OP_JNZ), ("JMP", OP_JMP)):
+        table[name] = (op, _INDEX_ARG, None)
+    for name, op in (("LOAD", OP_LOAD), ("STORE", OP_STORE),
+                     ("GUITA", OP_GUITA), ("PRINT_TEXT", OP_PRINT_TEXT)):
+        table[name] = (op, _TEXT_ARG, None)
+    for name, fn in BINOPS.items():
+        table[name] = (OP_BINOP, _FN, fn)
+    for name, fn in CMP_JUMPS.items():
+        table[name] = (OP_JCMP, _CMP_JUMP, fn)
+        table[f"{name}_SLOT_K"] = (OP_JCMP_SLOT_K, _SLOT_K, fn)
+    table["INC_SLOT"] = (OP_INC_SLOT, _INC, None)
+    table["COPY_SLOT"] = (OP_COPY_SLOT, _COPY, None)
+    return table
+
+
+_SHAPES = _shapes()
+_DECODE = [_SHAPES[name] for name in MNEMONICS]          # por opcode binario
+_NAME_OF = {(op, fn): name for name, (op, _, fn) in _SHAPES.items()}
+
+
+def _mnemonic(op: int, arg) -> str:
+    if op == OP_BINOP:
+        return _NAME_OF[op, arg]
+    if op in (OP_JCMP, OP_JCMP_SLOT_K):
+        return _NAME_OF[op, arg[0]]
+    return _NAME_OF[op, None]
+
+
+def _const_operand(value, pool: "_Pool", pooled: int) -> int:
+    """Constante del código: int inmediato si entra, si no índice en el pool."""
+    if type(value) is int and -pooled // 2 <= value < pooled // 2:
+        return value & (pooled - 1)
+    return pooled | pool.add(value)
+
+
+def _const_value(operand: int, consts: list, pooled: int):
+    if operand & pooled:
+        return consts[operand ^ pooled]
+    return operand - pooled if operand & (pooled >> 1) else operand
+
+
+def _index(name: str, value: int) -> int:
+    """Slot, pc o string como operando u24 (NONE queda reservado)."""
+    if value >= NONE:
+        raise ValueError(f"Operando demasiado grande para el bytecode: {name} {value}")
+    return value
+
+
+# ─────────────────────────  Escritura  ──────────────────────────
+class _Pool:
+    """Valores sin repetir, en orden de aparición."""
+
+    def __init__(self):
+        self.index: Dict[object, int] = {}
+        self.values: list = []
+
+    def add(self, value) -> int:
+        # por texto: 1 y 1.0 (o 0.0 y -0.0) son constantes distintas
+        key = (type(value), repr(value))
+        if key not in self.index:
+            self.index[key] = len(self.values)
+            self.values.append(value)
+        return self.index[key]
+
+
+def encode(code: List[str]) -> bytes:
+    """Código de máquina en texto → bytes del formato .pcb."""
+    program, labels, slot_names = decode(code)
+    consts, strings = _Pool(), _Pool()
+
+    words = array("I")
+    for op, arg in program:
+        name = _mnemonic(op, arg)
+        shape = _SHAPES[name][1]
+        extra = ()
+        if shape == _NO_ARG or shape == _FN:
+            operand = 0
+        elif shape == _CONST_ARG:
+            operand = _const_operand(arg, consts, _POOLED_24)
+        elif shape == _INDEX_ARG:
+            operand = _index(name, arg)
+        elif shape == _TEXT_ARG:
+            operand = NONE if arg is None else _index(name, strings.add(arg))
+        elif shape == _CMP_JUMP:
+            operand = _index(name, arg[1])
+        elif shape == _INC:
+            operand, extra = _index(name, arg[0]), (_const_operand(arg[1], consts, _POOLED_32),)
+        elif shape == _COPY:
+            operand, extra = _index(name, arg[0]), (arg[1],)
+        else:                                   # _SLOT_K
+            operand = _index(name, arg[1])
+            extra = (_const_operand(arg[2], consts, _POOLED_32), arg[3])
+        words.append(_OPCODE[name] | operand << 8)
+        words.extend(extra)
+
+    symbols = bytearray()
+    for slot, name in enumerate(slot_names):
+        if name is not None:
+            symbols += _SYMBOL.pack(_SLOT, slot, strings.add(name))
+    for label, pc in labels.items():
+        symbols += _SYMBOL.pack(_LABEL, pc, strings.add(label))
+
+    const_bytes = bytearray()
+    for value in consts.values:
+        if isinstance(value, float):
+            const_bytes += _CONST_FLOAT.pack(_FLOAT, value)
+        elif _INT64[0] <= value <= _INT64[1]:
+            const_bytes += _CONST.pack(_INT, value)
+        else:
+            const_bytes += _CONST.pack(_BIG_INT, strings.add(str(value)))
+
+    table, data = bytearray(), bytearray()
+    for value in strings.values:
+        raw = value.encode("utf-8")
+        table += _STRING.pack(len(data), len(raw))
+        data += raw
+
+    if sys.byteorder != "little":
+        words.byteswap()
+    consts_off = _HEADER.size
+    strings_off = consts_off + len(const_bytes)
+    data_off = strings_off + len(table)
+    symbols_off = data_off + len(data)
+    code_off = -(-(symbols_off + len(symbols)) // 4) * 4      # palabras alineadas
+    padding = bytes(code_off - symbols_off - len(symbols))
+    header = _HEADER.pack(MAGIC, VERSION, 0,
+                          len(consts.values), consts_off, len(strings.values), strings_off,
+                          data_off, len(symbols) // _SYMBOL.size, symbols_off,
+                          len(words), code_off, len(program), len(slot_names))
+    return b"".join((header, const_bytes, table, data, symbols, padding, words.tobytes()))
+
+
+def write_bytecode(path: Path | str, code: List[str]) -> int:
+    """Escribe el .pcb (de forma atómica) y devuelve su tamaño en bytes."""
+    path = Path(path)
+    raw = encode(code)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(raw)
+    os.replace(tmp, path)
+    return len(raw)
+
+
+# ─────────────────────────  Lectura  ──────────────────────────
+class Bytecode:
+    """
+    Un .pcb mapeado en memoria. Se usa como context manager (o `close()`):
+    lo decodificado (`decode()`) no depende del mapeo y sobrevive al cierre.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._mm = self._view = None
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"{self.path}: no es bytecode de Parce (archivo muy corto)")
+            if size >= MMAP_MIN_SIZE:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._mm)
+            else:
+                self._view = memoryview(f.read())
+        (magic, version, _flags, self.n_consts, self._consts_off, self.n_strings,
+         self._strings_off, self._data_off, self.n_symbols, self._symbols_off,
+         self.n_words, self._code_off, self.n_instrs, self.n_slots) = _HEADER.unpack_from(self._view)
+        error = None
+        if magic != MAGIC:
+            error = "no es bytecode de Parce"
+        elif version != VERSION:
+            error = f"versión de bytecode {version} (se esperaba {VERSION})"
+        elif self._code_off % 4 or self._code_off + 4 * self.n_words > size:
+            error = "bytecode truncado o dañado"
+        if error is not None:
+            self.close()
+            raise ValueError(f"{self.path}: {error}")
+
+    # -------- pools ----------
+    def string(self, index: int) -> str:
+        offset, length = _STRING.unpack_from(self._view, self._strings_off + index * _STRING.size)
+        start = self._data_off + offset
+        return str(self._view[start:start + length], "utf-8")
+
+    def constant(self, index: int):
+        pos = self._consts_off + index * _CONST.size
+        kind = self._view[pos]
+        if kind == _FLOAT:
+            return _CONST_FLOAT.unpack_from(self._view, pos)[1]
+        value = _CONST.unpack_from(self._view, pos)[1]
+        return int(self.string(value)) if kind == _BIG_INT else value
+
+    def strings(self) -> List[str]:
+        """Todo el pool de strings (una pasada sobre la tabla)."""
+        view, data = self._view, self._data_off
+        end = self._strings_off + self.n_strings * _STRING.size
+        return [str(view[data + offset:data + offset + length], "utf-8")
+                for offset, length in _STRING.iter_unpack(view[self._strings_off:end])]
+
+    def symbols(self, strings: Optional[List[str]] = None):
+        """(slot_names, labels) desde la tabla de símbolos."""
+        if strings is None:
+            strings = self.strings()
+        slot_names: List[Optional[str]] = [None] * self.n_slots
+        labels: Dict[str, int] = {}
+        end = self._symbols_off + self.n_symbols * _SYMBOL.size
+        for kind, index, name in _SYMBOL.iter_unpack(self._view[self._symbols_off:end]):
+            if kind == _SLOT:
+                slot_names[index] = strings[name]
+            else:
+                labels[strings[name]] = index
+        return slot_names, labels
+
+    def _words(self):
+        words = self._view[self._code_off:self._code_off + 4 * self.n_words].cast("I")
+        if sys.byteorder != "little":
+            words = array("I", words)
+            words.byteswap()
+        return words
+
+    # -------- decodificación ----------
+    def decode(self):
+        """(programa, labels, slot_names) como `sim_instrucciones_pila.decode`."""
+        pool = self.strings()
+        consts = [self.constant(i) for i in range(self.n_consts)]
+        strings = dict(enumerate(pool))
+        strings[NONE] = None
+
+        program = []
+        append = program.append
+        words = self._words()
+        i, n = 0, len(words)
+        try:
+            while i < n:
+                word = words[i]
+                op, shape, fn = _DECODE[word & 0xFF]
+                a = word >> 8
+                i += 1
+                if shape == _INDEX_ARG:
+                    append((op, a))
+                elif shape == _CONST_ARG:
+                    append((op, _const_value(a, consts, _POOLED_24)))
+                elif shape == _FN:
+                    append((op, fn))
+                elif shape == _NO_ARG:
+                    append((op, None))
+                elif shape == _TEXT_ARG:
+                    append((op, strings[a]))
+                elif shape == _CMP_JUMP:
+                    append((op, (fn, a)))
+                elif shape == _SLOT_K:
+                    append((op, (fn, a, _const_value(words[i], consts, _POOLED_32), words[i + 1])))
+                    i += 2
+                elif shape == _INC:
+                    append((op, (a, _const_value(words[i], consts, _POOLED_32))))
+                    i += 1
+                else:                                   # _COPY
+                    append((op, (a, words[i])))
+                    i += 1
+        except (IndexError, KeyError):
+            raise ValueError(f"{self.path}: bytecode dañado (opcode u operando fuera de rango)") from None
+        finally:
+            if isinstance(words, memoryview):
+                words.release()
+        slot_names, labels = self.symbols(pool)
+        return program, labels, slot_names
+
+    def listing(self) -> List[str]:
+        """
+        El código de máquina en texto. Un salto a un pc con varias etiquetas
+        usa la primera (en el binario sólo queda el pc).
+        """
+        program, labels, slot_names = self.decode()
+        labels_at: Dict[int, List[str]] = {}
+        for label, pc in labels.items():
+            labels_at.setdefault(pc, []).append(label)
+
+        def slot(i: int) -> str:
+            return f"{i} {slot_names[i]}" if slot_names[i] is not None else str(i)
+
+        def target(pc: int) -> str:
+            return labels_at[pc][0]
+
+        lines = []
+        for pc, (op, arg) in enumerate(program):
+            lines.extend(f"LABEL {label}" for label in labels_at.get(pc, ()))
+            name = _mnemonic(op, arg)
+            shape = _SHAPES[name][1]
+            if shape in (_NO_ARG, _FN):
+                lines.append(name)
+            elif shape == _CONST_ARG:
+                lines.append(f"{name} {format_number(arg)}")
+            elif op in (OP_LOAD_SLOT, OP_STORE_SLOT):
+                lines.append(f"{name} {slot(arg)}")
+            elif shape == _INDEX_ARG:
+                lines.append(f"{name} {target(arg)}")
+            elif op in (OP_LOAD, OP_STORE):
+                lines.append(f"{name} {arg}")
+            elif shape == _TEXT_ARG:
+                mnemonic = "PRINT" if op == OP_PRINT_TEXT else name
+                lines.append(mnemonic if arg is None else f'{mnemonic} "{arg}"')
+            elif shape == _CMP_JUMP:
+                lines.append(f"{name} {target(arg[1])}")
+            elif shape == _INC:
+                lines.append(f"{name} {slot(arg[0])} {format_number(arg[1])}")
+            elif shape == _COPY:
+                lines.append(f"{name} {slot(arg[0])} {slot(arg[1])}")
+            else:
+                _, i, k, pc_target = arg
+                lines.append(f"{name} {slot(i)} {format_number(k)} {target(pc_target)}")
+        lines.extend(f"LABEL {label}" for label in labels_at.get(len(program), ()))
+        return lines
+
+    # -------- recursos ----------
+    def close(self) -> None:
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __enter__(self) -> "Bytecode":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_bytecode(path: Path | str) -> Bytecode:
+    return Bytecode(path)
@@ -0,0 +1,90 @@
+"""
+Caché de compilación para Parce‑Lang
+------------------------------------
+• Guarda en disco el IR optimizado y el código de máquina de cada programa
+  (con el mapa instrucción → línea de IR)
+• La clave es un hash del fuente, la gramática y la versión del compilador
+• En una corrida "tibia" se salta el parseo, la optimización y la generación
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+import hashlib
+import json
+import os
+import shutil
+
+COMPILER_VERSION = "0.6"
+
+_ROOT = Path(__file__).resolve().parent
+# Archivos cuyo contenido invalida la caché si cambia
+_COMPILER_FILES = (
+    "che_rumba.lark",
+    "representacion_intermedia.py",
+    "ir_instrucciones.py",
+    "ir_cfg.py",
+    "ir_tipos.py",
+    "ir_optimizer.py",
+    "sim_maquina_pila.py",
+    "peephole_pila.py",
+)
+
+DEFAULT_CACHE_DIR = Path(".parce_cache")
+
+
+def _compiler_fingerprint() -> str:
+    h = hashlib.sha256(COMPILER_VERSION.encode("utf-8"))
+    for name in _COMPILER_FILES:
+        path = _ROOT / name
+        h.update(name.encode("utf-8"))
+        if path.is_file():
+            h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+class CompilationCache:
+    def __init__(self, directory: Path | str = DEFAULT_CACHE_DIR):
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+        self._fingerprint: Optional[str] = None
+
+    # -------- helpers ----------
+    def key(self, source_code: str) -> str:
+        if self._fingerprint is None:
+            self._fingerprint = _compiler_fingerprint()
+        h = hashlib.sha256(self._fingerprint.encode("utf-8"))
+        h.update(source_code.encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, source_code: str) -> Path:
+        return self.directory / f"{self.key(source_code)}.json"
+
+    # -------- interfaz pública ----------
+    def get(self, source_code: str) -> Optional[Tuple[List[str], List[str], List[Optional[int]]]]:
+        path = self._path(source_code)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            entry = data["ir"], data["machine"], data["line_map"]
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, source_code: str, ir: List[str], machine_code: List[str],
+            line_map: Sequence[Optional[int]] = ()) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(source_code)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        payload = {"ir": [str(line) for line in ir], "machine": list(machine_code),
+                   "line_map": list(line_map)}
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)   # escritura atómica
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def stats(self) -> str:
+        return f"caché: {self.hits} hit(s), {self.misses} miss(es)"
@@ -0,0 +1,76 @@
+"""
+Helpers compartidos por los tests (pytest)
+------------------------------------------
+• `compiled(fuente, **opciones)` → código de máquina, con cada etapa
+  del optimizador prendida o apagada
+• `run(fuente, inputs=(), **opciones)` → lo que imprime el programa
+• `simulate(código, inputs=())` → lo que imprime un código ya compilado
+• `CONFIGS` son las combinaciones de optimizaciones que se comparan: todas
+  tienen que imprimir lo mismo que el programa sin optimizar
+"""
+import pytest
+
+from representacion_intermedia import parse_and_generate_ir
+from ir_optimizer import IROptimizer
+from sim_maquina_pila import StackMachineCodeGenerator
+from peephole_pila import StackPeepholeOptimizer
+from sim_instrucciones_pila import StackMachineSimulator
+from entrada_pila import ListInput
+from salida_pila import MemoryOutput
+
+CONFIGS = {
+    "sin_optimizar": dict(optimize=False, peephole=False),
+    "sin_cse": dict(cse=False),
+    "sin_bucles": dict(loops=False),
+    "sin_peephole": dict(peephole=False),
+    "completo": dict(),
+}
+
+
+def compile_program(source: str, optimize: bool = True, cse: bool = True,
+                    loops: bool = True, peephole: bool = True):
+    ir = parse_and_generate_ir(source)
+    if optimize:
+        opt = IROptimizer(ir, cse=cse, loops=loops)
+        opt.optimize()
+        ir = opt.get_code()
+    machine = StackMachineCodeGenerator(ir).generate()
+    if peephole:
+        peep = StackPeepholeOptimizer(machine)
+        peep.optimize()
+        machine = peep.get_code()
+    return machine
+
+
+def run_program(code, inputs=(), **limits) -> str:
+    output = MemoryOutput()
+    StackMachineSimulator(code, input_provider=ListInput(inputs), output=output, **limits).run()
+    return output.getvalue()
+
+
+@pytest.fixture
+def compiled():
+    return compile_program
+
+
+@pytest.fixture
+def simulate():
+    return run_program
+
+
+@pytest.fixture
+def run():
+    def run(source: str, inputs=(), **options) -> str:
+        return run_program(compile_program(source, **options), inputs)
+    return run
+
+
+@pytest.fixture
+def same_output(run):
+    """Corre el programa con cada combinación de CONFIGS y devuelve la salida común."""
+    def check(source: str, inputs=()) -> str:
+        outputs = {name: run(source, inputs, **opts) for name, opts in CONFIGS.items()}
+        expected = outputs["sin_optimizar"]
+        assert {name: s for name, s in outputs.items() if s != expected} == {}
+        return expected
+    return check
@@ -0,0 +1,79 @@
+"""
+Fuentes de entrada para GUITA
+-----------------------------
+El simulador pide cada valor con `provider.read()`:
+• InteractiveInput   — `input()` por lectura (comportamiento original)
+• ListInput          — valores en memoria
+• FileInput          — un valor por línea de un archivo, con buffer grande
+• BufferedStdinInput — stdin leído en bloque (para pipes)
+
+El mensaje de GUITA lo escribe el simulador en su salida (ver salida_pila),
+no la fuente. Si se acaban los valores se levanta EOFError, como `input()`.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Iterable, Iterator
+import sys
+
+_BUFFER_SIZE = 1 << 20
+
+
+class InputProvider:
+    def read(self) -> str:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class InteractiveInput(InputProvider):
+    def read(self) -> str:
+        return input()
+
+
+class _LineInput(InputProvider):
+    """Base de las fuentes que consumen un iterador de líneas."""
+
+    def __init__(self, lines: Iterable[str]):
+        self._lines: Iterator[str] = iter(lines)
+
+    def read(self) -> str:
+        try:
+            line = next(self._lines)
+        except StopIteration:
+            raise EOFError("no quedan valores de entrada") from None
+        return line.rstrip("\r\n")
+
+
+class ListInput(_LineInput):
+    def __init__(self, values: Iterable):
+        super().__init__(str(v) for v in values)
+
+
+class FileInput(_LineInput):
+    def __init__(self, path: Path | str):
+        self._file = open(path, encoding="utf-8", buffering=_BUFFER_SIZE)
+        super().__init__(self._file)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class BufferedStdinInput(_LineInput):
+    def __init__(self, stream=None):
+        stream = stream if stream is not None else sys.stdin
+        # stdin en bloque: una lectura grande en vez de una por valor
+        super().__init__(stream.read().splitlines())
+
+
+def default_input() -> InputProvider:
+    """Interactivo en una terminal; stdin en bloque si viene de un pipe."""
+    if sys.stdin is not None and not sys.stdin.isatty():
+        return BufferedStdinInput()
+    return InteractiveInput()
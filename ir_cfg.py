@@ -0,0 +1,208 @@
+"""
+Grafo de flujo de control (CFG) del IR
+--------------------------------------
+• Parte el IR en bloques básicos usando `Lx:`, `goto` e `if … goto`
+• Cada bloque conoce sus sucesores y predecesores
+• `CFG.reverse_postorder()` da el orden natural para análisis hacia adelante
+• `CFG.code()` vuelve a pegar los bloques en el orden original
+• `Dominators` (árbol de dominadores) y `natural_loops` detectan los bucles
+  a partir de las aristas de retroceso (`goto`/`if … goto` a una etiqueta
+  que domina al salto)
+"""
+from __future__ import annotations
+from typing import Dict, List, Optional, Set
+from ir_instrucciones import IRInstr
+
+# Instrucciones después de las cuales no se sigue al bloque siguiente
+_NO_FALLTHROUGH = ("goto", "return")
+_TERMINATORS = ("goto", "if", "ifcmp", "return")
+
+
+class BasicBlock:
+    __slots__ = ("index", "instrs", "succs", "preds")
+
+    def __init__(self, index: int, instrs: List[IRInstr]):
+        self.index = index
+        self.instrs = instrs
+        self.succs: List[int] = []
+        self.preds: List[int] = []
+
+    @property
+    def falls_through(self) -> bool:
+        """¿Puede seguir de largo al bloque siguiente del código?"""
+        return self.instrs[-1].op not in _NO_FALLTHROUGH
+
+    @property
+    def label(self) -> Optional[str]:
+        if self.instrs and self.instrs[0].op == "label":
+            return self.instrs[0].args[0]
+        return None
+
+    def __repr__(self) -> str:
+        return f"BasicBlock({self.index}, {len(self.instrs)} instr, succs={self.succs})"
+
+
+class CFG:
+    def __init__(self, blocks: List[BasicBlock]):
+        self.blocks = blocks
+
+    def successors(self, index: int) -> List[BasicBlock]:
+        return [self.blocks[s] for s in self.blocks[index].succs]
+
+    def predecessors(self, index: int) -> List[BasicBlock]:
+        return [self.blocks[p] for p in self.blocks[index].preds]
+
+    def reverse_postorder(self) -> List[int]:
+        """Índices de los bloques alcanzables desde la entrada, en RPO."""
+        if not self.blocks:
+            return []
+        order: List[int] = []
+        seen = {0}
+        stack = [(0, iter(self.blocks[0].succs))]
+        while stack:
+            node, it = stack[-1]
+            for s in it:
+                if s not in seen:
+                    seen.add(s)
+                    stack.append((s, iter(self.blocks[s].succs)))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+        order.reverse()
+        return order
+
+    def code(self) -> List[IRInstr]:
+        return [ins for b in self.blocks for ins in b.instrs]
+
+
+def build_cfg(code: List[IRInstr]) -> CFG:
+    # ---- bloques: un líder en cada etiqueta y después de cada salto ----
+    blocks: List[BasicBlock] = []
+    current: List[IRInstr] = []
+    for ins in code:
+        if ins.op == "label" and current:
+            blocks.append(BasicBlock(len(blocks), current))
+            current = []
+        current.append(ins)
+        if ins.op in _TERMINATORS:
+            blocks.append(BasicBlock(len(blocks), current))
+            current = []
+    if current:
+        blocks.append(BasicBlock(len(blocks), current))
+
+    # ---- aristas ----
+    by_label: Dict[str, int] = {b.label: b.index for b in blocks if b.label is not None}
+    for b in blocks:
+        last = b.instrs[-1]
+        target = last.jump_target
+        if target is not None and target in by_label:
+            b.succs.append(by_label[target])
+        if b.falls_through and b.index + 1 < len(blocks):
+            nxt = b.index + 1
+            if nxt not in b.succs:
+                b.succs.append(nxt)
+        for s in b.succs:
+            blocks[s].preds.append(b.index)
+    return CFG(blocks)
+
+
+# ─────────────────────────  Dominadores y bucles  ──────────────────────────
+class Dominators:
+    """
+    Árbol de dominadores (Cooper, Harvey y Kennedy: iterativo sobre el RPO).
+    Los bloques se numeran al entrar y salir en un recorrido del árbol, así
+    `dominates(a, b)` es O(1). Un bloque inalcanzable no domina ni es dominado.
+    """
+
+    def __init__(self, cfg: CFG):
+        blocks = cfg.blocks
+        order = cfg.reverse_postorder()
+        rpo = {b: i for i, b in enumerate(order)}
+        idom: List[Optional[int]] = [None] * len(blocks)
+        if order:
+            idom[0] = 0
+        changed = True
+        while changed:
+            changed = False
+            for b in order[1:]:
+                new = None
+                for p in blocks[b].preds:
+                    if idom[p] is None:
+                        continue
+                    if new is None:
+                        new = p
+                        continue
+                    a, c = p, new
+                    while a != c:
+                        while rpo[a] > rpo[c]:
+                            a = idom[a]
+                        while rpo[c] > rpo[a]:
+                            c = idom[c]
+                    new = a
+                if idom[b] != new:
+                    idom[b] = new
+                    changed = True
+        if order:
+            idom[0] = None
+        self.idom = idom
+
+        # ---- numeración entrada/salida del árbol ----
+        children: List[List[int]] = [[] for _ in blocks]
+        for b in order[1:]:
+            children[idom[b]].append(b)
+        self.enter = [-1] * len(blocks)
+        self.leave = [-1] * len(blocks)
+        clock = 0
+        stack = [(0, False)] if order else []
+        while stack:
+            b, done = stack.pop()
+            if done:
+                self.leave[b] = clock
+                continue
+            self.enter[b] = clock
+            clock += 1
+            stack.append((b, True))
+            stack.extend((c, False) for c in children[b])
+
+    def dominates(self, a: int, b: int) -> bool:
+        if self.enter[a] < 0 or self.enter[b] < 0:
+            return False
+        return self.enter[a] <= self.enter[b] and self.leave[b] <= self.leave[a]
+
+
+class Loop:
+    __slots__ = ("header", "body", "latches")
+
+    def __init__(self, header: int, body: Set[int], latches: List[int]):
+        self.header = header        # único bloque por el que se entra
+        self.body = body            # bloques del bucle (incluye header y latches)
+        self.latches = latches      # bloques con la arista de retroceso
+
+    def __repr__(self) -> str:
+        return f"Loop(header={self.header}, {len(self.body)} bloques)"
+
+
+def natural_loops(cfg: CFG, dom: Dominators) -> List[Loop]:
+    """
+    Un bucle natural por cada header: la arista n → h es de retroceso si h
+    domina a n, y el cuerpo son los bloques que llegan a n sin pasar por h.
+    Los bucles con el mismo header se juntan. Se devuelven de adentro hacia
+    afuera (un bucle interno siempre tiene menos bloques que el que lo contiene).
+    """
+    bodies: Dict[int, Set[int]] = {}
+    latches: Dict[int, List[int]] = {}
+    for b in cfg.blocks:
+        for h in b.succs:
+            if not dom.dominates(h, b.index):
+                continue
+            body = bodies.setdefault(h, {h})
+            latches.setdefault(h, []).append(b.index)
+            stack = [b.index]
+            while stack:
+                n = stack.pop()
+                if n in body:
+                    continue
+                body.add(n)
+                stack.extend(p for p in cfg.blocks[n].preds if dom.dominates(h, p))
+    return sorted((Loop(h, bodies[h], latches[h]) for h in bodies), key=lambda l: len(l.body))
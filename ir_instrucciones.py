@@ -0,0 +1,204 @@
+"""
+Instrucciones de IR para Parce‑Lang
+-----------------------------------
+• Cada instrucción de 3‑direcciones es un objeto compacto (op, dest, args)
+• Los pases (generador, optimizador, código de pila) trabajan sobre objetos
+• `str(instr)` produce el formato de texto de `ir.txt`
+• `parse_ir_line` convierte texto viejo a objetos (compatibilidad)
+
+Formas admitidas (op → texto):
+    "="        dest = a
+    "+" … "!=" dest = a op b
+    "guita"    dest = GUITA "mensaje"
+    "label"    L1:
+    "goto"     goto L1
+    "if"       if cond goto L1
+    "ifcmp"    if a op b goto L1
+    "print"    print "texto", v1, v2
+    "return"   RETURN v
+    "comment"  # texto libre
+"""
+
+from __future__ import annotations
+from typing import Iterator, List, Optional, Tuple, Union
+import re
+
+Number = Union[int, float]
+
+BIN_OPS = ("+", "-", "*", "/", ">", "<", ">=", "<=", "==", "!=")
+_BIN_OPS = frozenset(BIN_OPS)
+
+
+def is_name(operand: str) -> bool:
+    """True si el operando es una variable/temporal (no un literal numérico)."""
+    return operand.isidentifier()
+
+
+_TEMP_RE = re.compile(r"t\d+$")
+
+
+def is_temp(operand: str) -> bool:
+    """True si es un temporal del generador de IR (t0, t1, …)."""
+    return _TEMP_RE.match(operand) is not None
+
+
+def parse_number(text: str) -> Optional[Number]:
+    """Literal → int si se escribe sin punto ni exponente ("3"), si no float."""
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def format_number(val: Number) -> str:
+    """Inverso exacto de `parse_number` (los float siempre llevan punto o exponente)."""
+    return repr(val) if isinstance(val, float) else str(val)
+
+
+class IRInstr:
+    __slots__ = ("op", "dest", "args")
+
+    def __init__(self, op: str, dest: Optional[str] = None, args: Tuple[str, ...] = ()):
+        self.op = op
+        self.dest = dest
+        self.args = args
+
+    # -------- constructores ----------
+    @classmethod
+    def assign(cls, dest: str, value: str) -> "IRInstr":
+        return cls("=", dest, (value,))
+
+    @classmethod
+    def binop(cls, dest: str, left: str, op: str, right: str) -> "IRInstr":
+        return cls(op, dest, (left, right))
+
+    @classmethod
+    def label(cls, name: str) -> "IRInstr":
+        return cls("label", None, (name,))
+
+    @classmethod
+    def goto(cls, target: str) -> "IRInstr":
+        return cls("goto", None, (target,))
+
+    # -------- consultas ----------
+    @property
+    def is_binop(self) -> bool:
+        return self.op in _BIN_OPS
+
+    @property
+    def jump_target(self) -> Optional[str]:
+        if self.op in ("goto", "if", "ifcmp"):
+            return self.args[-1]
+        return None
+
+    def uses(self) -> Iterator[str]:
+        """Variables leídas por la instrucción."""
+        op, args = self.op, self.args
+        if op == "=" or op in _BIN_OPS or op == "return":
+            operands = args
+        elif op == "if":
+            operands = args[:1]
+        elif op == "ifcmp":
+            operands = (args[0], args[2])
+        elif op == "print":
+            operands = args[1:]
+        else:
+            return iter(())
+        return (a for a in operands if is_name(a))
+
+    @property
+    def has_side_effects(self) -> bool:
+        # Todo lo que no sea una asignación pura se conserva siempre
+        return self.dest is None or self.op == "guita"
+
+    # -------- texto ----------
+    def __str__(self) -> str:
+        op, dest, args = self.op, self.dest, self.args
+        if op == "=":
+            return f"{dest} = {args[0]}"
+        if op in _BIN_OPS:
+            return f"{dest} = {args[0]} {op} {args[1]}"
+        if op == "label":
+            return f"{args[0]}:"
+        if op == "goto":
+            return f"goto {args[0]}"
+        if op == "if":
+            return f"if {args[0]} goto {args[1]}"
+        if op == "ifcmp":
+            return f"if {args[0]} {args[1]} {args[2]} goto {args[3]}"
+        if op == "print":
+            return f'print "{args[0]}", ' + ", ".join(args[1:])
+        if op == "guita":
+            return f'{dest} = GUITA "{args[0]}"'
+        if op == "comment":
+            return f"# {args[0]}"
+        if op == "return":
+            return f"RETURN {args[0]}" if args else "RETURN"
+        return op.upper()
+
+    def __repr__(self) -> str:
+        return f"IRInstr({str(self)!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, IRInstr):
+            return NotImplemented
+        return (self.op, self.dest, self.args) == (other.op, other.dest, other.args)
+
+    def __hash__(self) -> int:
+        return hash((self.op, self.dest, self.args))
+
+
+# ─────────────────────────  Texto → IRInstr  ──────────────────────────
+_guita_re = re.compile(r'^(\w+)\s*=\s*GUITA\s+"([^"]*)"$')
+_assign_re = re.compile(r'^(\w+)\s*=\s*(.+)$')
+_ifcmp_re = re.compile(r'^if\s+(\S+)\s*([<>=!]+)\s*(\S+)\s+goto\s+(\w+)$')
+_if_re = re.compile(r'^if\s+(\S+)\s+goto\s+(\w+)$')
+_goto_re = re.compile(r'^goto\s+(\w+)$')
+_label_re = re.compile(r'^(\w+):$')
+_print_re = re.compile(r'^print\s+"([^"]*)"(?:,\s*(.*))?$')
+
+
+def parse_ir_line(line: str) -> IRInstr:
+    line = line.strip()
+    if line.startswith("#"):
+        return IRInstr("comment", None, (line[1:].strip(),))
+    if line == "RETURN" or line.startswith("RETURN "):
+        return IRInstr("return", None, tuple(line.split()[1:2]))
+
+    m = _guita_re.match(line)
+    if m:
+        return IRInstr("guita", m.group(1), (m.group(2),))
+    m = _print_re.match(line)
+    if m:
+        rest = m.group(2) or ""
+        vals = tuple(v.strip() for v in rest.split(",") if v.strip())
+        return IRInstr("print", None, (m.group(1),) + vals)
+    m = _ifcmp_re.match(line)
+    if m:
+        return IRInstr("ifcmp", None, m.groups())
+    m = _if_re.match(line)
+    if m:
+        return IRInstr("if", None, m.groups())
+    m = _goto_re.match(line)
+    if m:
+        return IRInstr.goto(m.group(1))
+    m = _label_re.match(line)
+    if m:
+        return IRInstr.label(m.group(1))
+    m = _assign_re.match(line)
+    if m:
+        dest, toks = m.group(1), m.group(2).split()
+        if len(toks) == 3 and toks[1] in _BIN_OPS:
+            return IRInstr.binop(dest, toks[0], toks[1], toks[2])
+        if len(toks) == 1:
+            return IRInstr.assign(dest, toks[0])
+    raise ValueError(f"Línea de IR no reconocida: {line!r}")
+
+
+def as_instrs(code) -> List[IRInstr]:
+    """Acepta IR como objetos o como texto y devuelve siempre objetos."""
+    return [c if isinstance(c, IRInstr) else parse_ir_line(c) for c in code]
@@ -1,30 +1,135 @@
 """
 Optimizador de IR
 -----------------
-• Propagación de constantes
-• Constant Folding
-• Eliminación de código muerto
+• Propagación de constantes (flujo de datos sobre el CFG)
+• Constant Folding y saltos con condición constante
+• Numeración de valores sobre bloques extendidos: subexpresiones comunes
+  (CSE) y propagación de copias
+• Bucles naturales: código invariante al preheader y reducción de fuerza
+  de multiplicaciones por variables de inducción
+• Eliminación de código muerto (liveness sobre bloques básicos)
 """
 from __future__ import annotations
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+import itertools
+import math
 import re
-from typing import List
+from ir_instrucciones import IRInstr, Number, as_instrs, format_number, is_name, is_temp, parse_number
+from ir_cfg import CFG, Dominators, Loop, build_cfg, natural_loops
+from ir_tipos import ANY, INT, Types, infer_types, is_int, operand_type
+
+Env = Dict[str, Number]    # variable -> constante conocida (ausente = no constante)
+
+_COMPARE = frozenset((">", "<", ">=", "<=", "==", "!="))
+_COMMUTATIVE = frozenset(("+", "*", "==", "!="))
+_MIRRORED = {">": "<", ">=": "<="}      # a > b  ≡  b < a
+_NUMBERED_RE = re.compile(r"[tL](\d+)$")   # nombres del generador: t7, L3
+_MISSING = object()
+_APPEND = object()       # registro: append a una lista de holders
+
+
+class _ValueTable:
+    """
+    Tablas de la numeración de valores con registro para deshacer: al volver
+    de un bloque extendido se restauran en O(cambios), sin copiar diccionarios.
+    • `vn`: nombre → número de valor que contiene ahora
+    • `exprs`: (op, n.º a, n.º b) o literal → número de valor
+    • `holders`: número de valor → nombres que lo recibieron (en orden)
+    """
+
+    def __init__(self):
+        self.vn: Dict[str, int] = {}
+        self.exprs: Dict[object, int] = {}
+        self.holders: Dict[int, List[str]] = {}
+        self.literals: Dict[int, str] = {}
+        self.log: list = []
+        self.counter = 0
+
+    def fresh(self) -> int:
+        self.counter += 1
+        return self.counter
+
+    def _set(self, table: dict, key, value) -> None:
+        self.log.append((table, key, table.get(key, _MISSING)))
+        table[key] = value
+
+    def number(self, operand: str) -> int:
+        """Número de valor de un operando (nombre o literal); crea uno si es nuevo."""
+        if is_name(operand):
+            v = self.vn.get(operand)
+            if v is None:
+                v = self.fresh()
+                self.assign(operand, v)
+            return v
+        v = self.exprs.get(operand)
+        if v is None:
+            v = self.fresh()
+            self._set(self.exprs, operand, v)
+            self._set(self.literals, v, operand)
+        return v
+
+    def lookup(self, key) -> Optional[int]:
+        return self.exprs.get(key)
+
+    def define(self, key, v: int) -> None:
+        self._set(self.exprs, key, v)
+
+    def known(self, v: int, literal: str) -> None:
+        """En este camino el valor `v` es el literal dado (por una condición)."""
+        self._set(self.literals, v, literal)
+
+    def assign(self, name: str, v: int) -> None:
+        self._set(self.vn, name, v)
+        names = self.holders.get(v)
+        if names is None:
+            names = []
+            self._set(self.holders, v, names)
+        names.append(name)
+        self.log.append((names, _APPEND, None))
+
+    def holder(self, v: int) -> Optional[str]:
+        """Literal o nombre más antiguo que todavía contiene el valor `v`."""
+        if v in self.literals:
+            return self.literals[v]
+        for name in self.holders.get(v, ()):
+            if self.vn.get(name) == v:
+                return name
+        return None
+
+    def canonical(self, operand: str) -> str:
+        if not is_name(operand) or operand not in self.vn:
+            return operand
+        return self.holder(self.vn[operand]) or operand
+
+    def mark(self) -> int:
+        return len(self.log)
+
+    def undo(self, mark: int) -> None:
+        log = self.log
+        while len(log) > mark:
+            table, key, old = log.pop()
+            if key is _APPEND:
+                table.pop()
+            elif old is _MISSING:
+                del table[key]
+            else:
+                table[key] = old
+
 
 class IROptimizer:
-    def __init__(self, code: List[str]):
-        self.code = code          # instrucciones IR
-        self.const: dict[str, float] = {}
+    def __init__(self, code: List[IRInstr], cse: bool = True, loops: bool = True):
+        self.code = as_instrs(code)   # instrucciones IR (acepta también texto)
+        self.use_cse = cse
+        self.use_loops = loops
+        self.folded_branches = 0      # saltos resueltos por la numeración de valores
+        # por bucle: (etiqueta del header, instrucciones sacadas, multiplicaciones reducidas)
+        self.loop_log: List[Tuple[str, List[IRInstr], List[IRInstr]]] = []
 
     # -------- helpers ----------
     @staticmethod
-    def _is_num(s: str) -> bool:
-        try:
-            float(s)
-            return True
-        except ValueError:
-            return False
-
-    @staticmethod
-    def _eval(a: float, op: str, b: float) -> float:
+    def _eval(a: Number, op: str, b: Number) -> Number:
+        # int op int conserva el tipo (salvo '/'), como en la máquina de pila
         return {
             '+': a + b,  '-': a - b,  '*': a * b,
             '/': a / b if b != 0 else float("inf"),
@@ -33,74 +138,596 @@ class IROptimizer:
             '==': int(a == b), '!=': int(a != b)
         }[op]
 
+    @staticmethod
+    def _fmt(val: Number) -> str:
+        return format_number(val)     # sin pérdida de precisión ni de tipo
+
+    def _value(self, operand: str, env: Env) -> Optional[Number]:
+        if operand in env:
+            return env[operand]
+        return parse_number(operand)
+
+    def _fold(self, ins: IRInstr, env: Env) -> Optional[Number]:
+        """Valor constante que produce una asignación, o None."""
+        if ins.op == "=":
+            return self._value(ins.args[0], env)
+        if ins.is_binop:
+            a, b = self._value(ins.args[0], env), self._value(ins.args[1], env)
+            if a is None or b is None:
+                return None
+            try:
+                val = self._eval(a, ins.op, b)
+            except OverflowError:                       # int enorme con float: falla al ejecutar
+                return None
+            if isinstance(val, float) and not math.isfinite(val):
+                return None                             # inf/nan no se pliegan
+            return val
+        return None
+
+    def _branch(self, ins: IRInstr, env: Env) -> Optional[bool]:
+        """Si el salto condicional tiene condición constante: ¿se toma?"""
+        if ins.op == "if":
+            cond = self._value(ins.args[0], env)
+            return None if cond is None else cond != 0
+        if ins.op == "ifcmp":
+            a, b = self._value(ins.args[0], env), self._value(ins.args[2], env)
+            if a is None or b is None:
+                return None
+            return self._eval(a, ins.args[1], b) != 0
+        return None
+
     # -------- propagación y folding ----------
-    def _replace_consts(self, expr: str) -> str:
-        return " ".join(str(self.const.get(tok, tok)) for tok in expr.split())
+    def _transfer(self, instrs: List[IRInstr], env: Env) -> Env:
+        env = dict(env)
+        for ins in instrs:
+            if ins.dest is None:
+                continue
+            val = self._fold(ins, env)
+            if val is None:
+                env.pop(ins.dest, None)
+            else:
+                env[ins.dest] = val
+        return env
+
+    def _feasible_succs(self, cfg: CFG, index: int, env_out: Env) -> List[int]:
+        block = cfg.blocks[index]
+        taken = self._branch(block.instrs[-1], env_out)
+        if taken is None:
+            return block.succs
+        target = block.succs[0]          # el destino del salto va primero
+        fallthrough = block.succs[1:] or [target]
+        return [target] if taken else fallthrough
+
+    def _solve_constants(self, cfg: CFG) -> List[Optional[Env]]:
+        """
+        Análisis hacia adelante sobre el CFG. Una variable es constante a la
+        entrada de un bloque sólo si vale lo mismo en todos los predecesores
+        alcanzables; los saltos con condición constante sólo propagan por la
+        rama que se toma. Devuelve el estado de entrada de cada bloque
+        (None = inalcanzable).
+        """
+        n = len(cfg.blocks)
+        env_in: List[Optional[Env]] = [None] * n
+        env_out: List[Optional[Env]] = [None] * n
+        feasible: List[List[int]] = [[] for _ in range(n)]
+        order = cfg.reverse_postorder()
+
+        changed = True
+        while changed:
+            changed = False
+            for i in order:
+                block = cfg.blocks[i]
+                incoming = [env_out[p] for p in block.preds
+                            if env_out[p] is not None and i in feasible[p]]
+                if i == 0:
+                    incoming.append({})   # a la entrada nada es constante
+                if not incoming:
+                    continue
+                merged = dict(incoming[0])
+                for other in incoming[1:]:
+                    merged = {k: v for k, v in merged.items() if other.get(k) == v}
+                if merged == env_in[i]:
+                    continue
+                env_in[i] = merged
+                env_out[i] = self._transfer(block.instrs, merged)
+                feasible[i] = self._feasible_succs(cfg, i, env_out[i])
+                changed = True
+        return env_in
+
+    def _rewrite(self, ins: IRInstr, env: Env) -> Optional[IRInstr]:
+        def sub(operand: str) -> str:
+            return self._fmt(env[operand]) if operand in env else operand
+
+        op, args = ins.op, ins.args
+        if op == "=" or ins.is_binop:
+            val = self._fold(ins, env)
+            if val is not None:
+                env[ins.dest] = val
+                return IRInstr.assign(ins.dest, self._fmt(val))
+            env.pop(ins.dest, None)
+            return IRInstr(op, ins.dest, tuple(sub(a) for a in args))
+        if op in ("if", "ifcmp"):
+            taken = self._branch(ins, env)
+            if taken is None:
+                if op == "if":
+                    return IRInstr(op, None, (sub(args[0]), args[1]))
+                return IRInstr(op, None, (sub(args[0]), args[1], sub(args[2]), args[3]))
+            return IRInstr.goto(ins.jump_target) if taken else None
+        if ins.dest is not None:
+            env.pop(ins.dest, None)
+            return ins
+        if op == "print":
+            return IRInstr(op, None, (args[0], *map(sub, args[1:])))
+        if op == "return" and args:
+            return IRInstr(op, None, (sub(args[0]),))
+        return ins
 
     def constant_propagation_and_folding(self) -> None:
-        new: List[str] = []
-        assign_re = re.compile(r'^\s*(\w+)\s*=\s*(.+)$')
+        cfg = build_cfg(self.code)
+        env_in = self._solve_constants(cfg)
 
-        for line in self.code:
-            m = assign_re.match(line)
-            if not m:                 # no es asignación -> copiar
-                new.append(line)
-                continue
+        new: List[IRInstr] = []
+        for block, env in zip(cfg.blocks, env_in):
+            if env is None:
+                continue              # bloque inalcanzable
+            env = dict(env)
+            for ins in block.instrs:
+                out = self._rewrite(ins, env)
+                if out is not None:
+                    new.append(out)
 
-            var, expr = m.group(1), m.group(2).strip()
-            expr = self._replace_consts(expr)
+        self.code = new
 
-            toks = expr.split()
-            # asignación literal
-            if len(toks) == 1 and self._is_num(toks[0]):
-                val = float(toks[0])
-                self.const[var] = val
-                new.append(f"{var} = {val:g}")
-                continue
+    # -------- numeración de valores (CSE + copias) ----------
+    @staticmethod
+    def _expr_key(op: str, a: int, b: int, numeric: bool) -> Tuple[str, int, int]:
+        # Con operandos numéricos, a+b y b+a (o a>b y b<a) son el mismo valor.
+        # Con texto no: "a" + "b" != "b" + "a".
+        if numeric:
+            if op in _MIRRORED:
+                op, a, b = _MIRRORED[op], b, a
+            elif op in _COMMUTATIVE and b < a:
+                a, b = b, a
+        return op, a, b
+
+    @staticmethod
+    def _live_copies(instrs: List[IRInstr], live_out: set) -> set:
+        """
+        Posiciones de las copias `x = …` del bloque cuyo valor llega vivo a
+        la salida: x se usa después del bloque y no se reasigna antes.
+        """
+        pending, found = set(live_out), set()
+        for k in range(len(instrs) - 1, -1, -1):
+            dest = instrs[k].dest
+            if dest in pending:
+                pending.discard(dest)
+                if instrs[k].op == "=":
+                    found.add(k)
+        return found
+
+    @staticmethod
+    def _coalesce(out: List[IRInstr], dest: str, src: str, table: _ValueTable,
+                  dest_live: bool) -> bool:
+        """
+        `t = <expr>; x = t` → `x = <expr>` cuando conviene que el valor viva en
+        x y no en el temporal:
+        • x se usa después del bloque (y no se reasigna antes): de todos
+          modos hay que guardarlo en x
+        • <expr> lee x (`t = x + 1; x = t`): queda `x = x + 1`, que el
+          peephole funde en INC_SLOT
+        Si no, las copias a x se propagan como t y el DCE borra `x = t`.
+        Quien llama garantiza que t no se lee en ningún otro lado (una pasada
+        anterior puede haber propagado copias sobre t).
+        """
+        prev = out[-1] if out else None
+        if (prev is None or prev.dest != src or not is_temp(src) or is_temp(dest)
+                or not (prev.is_binop or prev.op == "guita")):
+            return False
+        old = table.vn.get(dest)
+        reads_dest = prev.is_binop and old is not None and any(
+            table.number(a) == old for a in prev.args)
+        if not reads_dest and not dest_live:
+            return False
+        args = prev.args
+        if reads_dest:
+            args = tuple(dest if table.number(a) == old else a for a in args)
+        out[-1] = IRInstr(prev.op, dest, args)
+        v = table.vn[src]
+        table.assign(src, table.fresh())        # el temporal ya no se asigna
+        table.assign(dest, v)
+        return True
+
+    def _cmp_key(self, op: str, a: str, b: str, table: _ValueTable, types: Types):
+        numeric = ANY not in (operand_type(a, types), operand_type(b, types))
+        return self._expr_key(op, table.number(a), table.number(b), numeric)
+
+    def _fold_branch(self, taken: bool, target: str, out: List[IRInstr]) -> None:
+        self.folded_branches += 1
+        if taken:
+            out.append(IRInstr.goto(target))
+
+    def _assume_false(self, ins: IRInstr, table: _ValueTable, types: Types) -> None:
+        """Hechos del camino que sigue de largo tras `if … goto` (la condición fue falsa)."""
+        if ins.op == "if":
+            cond = ins.args[0]
+            if operand_type(cond, types) == INT:      # int falso: exactamente 0
+                table.known(table.number(cond), "0")
+        elif ins.op == "ifcmp":
+            a, op, b = ins.args[:3]
+            table.define(self._cmp_key(op, a, b, table, types), table.number("0"))
+
+    def _number(self, ins: IRInstr, table: _ValueTable, types: Types,
+                out: List[IRInstr], uses: Counter, dest_live: bool) -> None:
+        op, dest, args = ins.op, ins.dest, ins.args
+        sub = table.canonical
+        if op == "=":
+            src = sub(args[0])
+            # el temporal desaparece: sólo si esta copia es su única lectura
+            alone = uses[src] == (args[0] == src)
+            if not (alone and self._coalesce(out, dest, src, table, dest_live)):
+                table.assign(dest, table.number(src))
+                out.append(IRInstr.assign(dest, src))
+            return
+        if ins.is_binop:
+            # `x = x + k` se deja con su nombre: es el patrón de INC_SLOT
+            a, b = (arg if arg == dest else sub(arg) for arg in args)
+            key = self._cmp_key(op, a, b, table, types)
+            v = table.lookup(key)
+            if v is None:
+                v = table.fresh()
+                table.define(key, v)
+            else:
+                prev = table.holder(v)
+                # Una comparación se recalcula salvo que se sepa su valor: en
+                # la máquina de pila comparar y saltar es una sola instrucción,
+                # y reusarla obliga a guardar el resultado.
+                if prev is not None and (op not in _COMPARE or not is_name(prev)):
+                    # ya calculado y todavía guardado en `prev`: se copia
+                    table.assign(dest, v)
+                    out.append(IRInstr.assign(dest, prev))
+                    return
+            table.assign(dest, v)
+            out.append(IRInstr(op, dest, (a, b)))
+            return
+        if dest is not None:                    # GUITA: valor nuevo siempre
+            table.assign(dest, table.fresh())
+        elif op == "print":
+            ins = IRInstr(op, None, (args[0], *map(sub, args[1:])))
+        elif op == "if":
+            cond = sub(args[0])
+            if not is_name(cond):
+                self._fold_branch(parse_number(cond) != 0, args[1], out)
+                return
+            ins = IRInstr(op, None, (cond, args[1]))
+        elif op == "ifcmp":
+            a, b = sub(args[0]), sub(args[2])
+            v = table.lookup(self._cmp_key(args[1], a, b, table, types))
+            if v is not None and v in table.literals:
+                self._fold_branch(parse_number(table.literals[v]) != 0, args[3], out)
+                return
+            ins = IRInstr(op, None, (a, args[1], b, args[3]))
+        elif op == "return" and args:
+            ins = IRInstr(op, None, (sub(args[0]),))
+        out.append(ins)
+
+    def value_numbering(self) -> None:
+        """
+        Numeración de valores superlocal. Un bloque con un único predecesor
+        hereda las tablas de ese predecesor, así se recorren los bloques
+        extendidos (por ejemplo, las condiciones de una cadena Orale pues)
+        como un árbol, deshaciendo los cambios al volver de cada rama.
+        • Una expresión ya calculada cuyo resultado sigue en alguna variable
+          se reemplaza por una copia de esa variable
+        • Reasignar un operando le da un número nuevo: la expresión vieja deja
+          de coincidir
+        • Cada uso se reescribe con la variable más antigua que tiene el mismo
+          valor (propagación de copias); las copias muertas las borra el DCE
+        • En la rama que sigue de largo tras `if c goto` se sabe que c es falsa:
+          repetir la misma condición (Orale pues) resuelve el salto
+        """
+        cfg = build_cfg(self.code)
+        blocks = cfg.blocks
+        types = infer_types(self.code)
+        live_in = self._live_in(blocks)
+        uses = Counter(name for ins in self.code for name in ins.uses())
+        children: List[List[int]] = [[] for _ in blocks]
+        roots = []
+        for b in blocks:
+            if len(b.preds) == 1 and b.preds[0] != b.index:
+                children[b.preds[0]].append(b.index)
+            else:
+                roots.append(b.index)
+
+        new_blocks = [b.instrs for b in blocks]
+        table = _ValueTable()
+        for root in roots:
+            # (bloque, marca para deshacer, salto condicional que siguió de largo)
+            stack: List[Tuple[int, Optional[int], Optional[IRInstr]]] = [(root, None, None)]
+            while stack:
+                i, mark, fell_through = stack.pop()
+                if mark is not None:
+                    table.undo(mark)
+                    continue
+                stack.append((i, table.mark(), None))
+                if fell_through is not None:
+                    self._assume_false(fell_through, table, types)
+                out: List[IRInstr] = []
+                live_out = set().union(*(live_in[s] for s in blocks[i].succs))
+                live_copies = self._live_copies(blocks[i].instrs, live_out)
+                for k, ins in enumerate(blocks[i].instrs):
+                    self._number(ins, table, types, out, uses, k in live_copies)
+                new_blocks[i] = out
+                last = out[-1] if out else None
+                target = last.jump_target if last is not None and last.op != "goto" else None
+                for c in reversed(children[i]):
+                    branch = last if target is not None and blocks[c].label != target else None
+                    stack.append((c, None, branch))
+
+        self.code = [ins for instrs in new_blocks for ins in instrs]
+
+    # -------- bucles: código invariante y reducción de fuerza ----------
+    @staticmethod
+    def _has_back_jump(code: List[IRInstr]) -> bool:
+        # Todo ciclo del CFG tiene al menos un salto hacia una etiqueta anterior
+        seen = set()
+        for ins in code:
+            if ins.op == "label":
+                seen.add(ins.args[0])
+            elif ins.jump_target in seen:
+                return True
+        return False
+
+    def _fresh_names(self) -> Iterator[int]:
+        top = -1
+        for ins in self.code:
+            for x in (ins.dest, *ins.args):
+                m = _NUMBERED_RE.match(x) if x else None
+                if m:
+                    top = max(top, int(m.group(1)))
+        return itertools.count(top + 1)
 
-            # binaria a op b con números
-            if len(toks) == 3 and self._is_num(toks[0]) and self._is_num(toks[2]):
-                val = self._eval(float(toks[0]), toks[1], float(toks[2]))
-                self.const[var] = val
-                new.append(f"{var} = {val:g}")
+    @staticmethod
+    def _loop_lists(loop: Loop, blocks, pre: Dict[int, List[IRInstr]]):
+        """(bloque, lista) del bucle en orden de código, con los preheaders internos."""
+        for b in sorted(loop.body):
+            if b != loop.header and b in pre:
+                yield b, pre[b]
+            yield b, blocks[b].instrs
+
+    def _hoist(self, loop: Loop, blocks, pre, dom: Dominators, types: Types,
+               live_in: List[set]) -> List[IRInstr]:
+        """
+        Saca las asignaciones invariantes del bucle, en el orden en que se
+        detectan (los operandos de cada una ya quedan calculados antes):
+        • cada operando es un literal, no se asigna en el bucle o lo asigna
+          una sola instrucción ya sacada
+        • el destino se asigna una sola vez en el bucle y no está vivo a la
+          entrada del header (nadie lee el valor de antes ni el de la vuelta
+          anterior, ni siquiera si el bucle da cero vueltas)
+        • una operación sobre un valor de tipo desconocido puede fallar (texto
+          menos número): sólo sale si su bloque se ejecuta en toda vuelta
+        """
+        lists = list(self._loop_lists(loop, blocks, pre))
+        defs = Counter(ins.dest for _, instrs in lists for ins in instrs if ins.dest is not None)
+        exits = [b for b in loop.body
+                 if not blocks[b].succs or any(s not in loop.body for s in blocks[b].succs)]
+        every_turn = exits + loop.latches
+        header_live = live_in[loop.header]
+
+        invariant = set()
+        hoisted: List[IRInstr] = []
+        marked = set()
+        changed = True
+        while changed:
+            changed = False
+            for b, instrs in lists:
+                for ins in instrs:
+                    if id(ins) in marked or not (ins.op == "=" or ins.is_binop):
+                        continue
+                    if defs[ins.dest] != 1 or ins.dest in header_live:
+                        continue
+                    if not all(not is_name(a) or defs[a] == 0 or a in invariant for a in ins.args):
+                        continue
+                    if (ins.is_binop and any(operand_type(a, types) == ANY for a in ins.args)
+                            and not all(dom.dominates(b, e) for e in every_turn)):
+                        continue
+                    marked.add(id(ins))
+                    invariant.add(ins.dest)
+                    hoisted.append(ins)
+                    changed = True
+        if hoisted:
+            for _, instrs in lists:
+                instrs[:] = [ins for ins in instrs if id(ins) not in marked]
+        return hoisted
+
+    def _reduce_strength(self, loop: Loop, blocks, pre, types: Types,
+                         fresh: Iterator[int]) -> List[IRInstr]:
+        """
+        `j = i * c` con i variable de inducción entera (`i = i ± k`, su única
+        asignación en el bucle) y c, k literales enteros: un temporal s lleva
+        i * c (se inicializa en el preheader y suma c * k justo después de
+        cada paso de i) y la multiplicación queda como `j = s`.
+        """
+        lists = list(self._loop_lists(loop, blocks, pre))
+        defs = Counter(ins.dest for _, instrs in lists for ins in instrs if ins.dest is not None)
+        steps: Dict[str, int] = {}
+        for _, instrs in lists:
+            for ins in instrs:
+                i = ins.dest
+                if ins.op not in ("+", "-") or defs[i] != 1 or not is_int(i, types):
+                    continue
+                a, b = ins.args
+                k = None
+                if a == i and isinstance(parse_number(b), int):
+                    k = parse_number(b)
+                elif ins.op == "+" and b == i and isinstance(parse_number(a), int):
+                    k = parse_number(a)
+                if k is not None:
+                    steps[i] = k if ins.op == "+" else -k
+
+        trackers: Dict[Tuple[str, int], str] = {}
+        replaced: Dict[int, IRInstr] = {}
+        reduced: List[IRInstr] = []
+        for _, instrs in lists:
+            for ins in instrs:
+                if ins.op != "*":
+                    continue
+                for i, c in (ins.args, ins.args[::-1]):
+                    if i in steps and isinstance(parse_number(c), int):
+                        key = (i, parse_number(c))
+                        if key not in trackers:
+                            trackers[key] = f"t{next(fresh)}"
+                            types[trackers[key]] = INT
+                            pre.setdefault(loop.header, []).append(
+                                IRInstr.binop(trackers[key], i, "*", c))
+                        replaced[id(ins)] = IRInstr.assign(ins.dest, trackers[key])
+                        reduced.append(ins)
+                        break
+        if not trackers:
+            return reduced
+
+        updates: Dict[str, List[IRInstr]] = {}
+        for (i, c), s in trackers.items():
+            delta = c * steps[i]
+            op = "+" if delta >= 0 else "-"
+            updates.setdefault(i, []).append(IRInstr.binop(s, s, op, str(abs(delta))))
+        for _, instrs in lists:
+            new: List[IRInstr] = []
+            for ins in instrs:
+                new.append(replaced.get(id(ins), ins))
+                if ins.dest in steps and ins.op in ("+", "-"):
+                    new.extend(updates.get(ins.dest, ()))
+            instrs[:] = new
+        return reduced
+
+    def loop_optimization(self) -> bool:
+        """
+        Recorre los bucles naturales de adentro hacia afuera; lo invariante de
+        un bucle interno puede seguir saliendo por los externos. Lo sacado va
+        a un preheader justo antes de la etiqueta del header: las entradas
+        desde afuera que saltaban al header pasan a una etiqueta nueva, y las
+        vueltas siguen saltando al header. Devuelve True si cambió el código.
+        """
+        if not self._has_back_jump(self.code):
+            return False
+        cfg = build_cfg(self.code)
+        blocks = cfg.blocks
+        dom = Dominators(cfg)
+        types = infer_types(self.code)
+        live_in = self._live_in(blocks)
+        fresh = self._fresh_names()
+        pre: Dict[int, List[IRInstr]] = {}
+        bodies: Dict[int, set] = {}
+        log = {}
+
+        for loop in natural_loops(cfg, dom):
+            h = loop.header
+            before = h - 1
+            if before in loop.body and blocks[before].falls_through:
+                continue            # el preheader quedaría dentro del bucle
+            hoisted = self._hoist(loop, blocks, pre, dom, types, live_in)
+            if hoisted:
+                pre.setdefault(h, [])[:0] = hoisted
+            reduced = self._reduce_strength(loop, blocks, pre, types, fresh)
+            if hoisted or reduced:
+                bodies[h] = loop.body
+                log[h] = (blocks[h].label, hoisted, reduced)
+        if not bodies:
+            return False
+
+        for h in pre:
+            outside = [p for p in blocks[h].preds if p not in bodies[h]
+                       and blocks[p].instrs[-1].jump_target == blocks[h].label]
+            if not outside:
                 continue
+            entry = f"L{next(fresh)}"
+            pre[h].insert(0, IRInstr.label(entry))
+            for p in outside:
+                last = blocks[p].instrs[-1]
+                blocks[p].instrs[-1] = IRInstr(last.op, last.dest, last.args[:-1] + (entry,))
 
-            # caso general
-            self.const.pop(var, None)
-            new.append(f"{var} = {expr}")
+        self.code = [ins for b in blocks for ins in pre.get(b.index, []) + b.instrs]
+        self.loop_log.extend(log[h] for h in sorted(log))
+        return True
 
-        self.code = new
+    def loop_report(self) -> str:
+        """Qué salió de cada bucle (por etiqueta del header) y qué se redujo."""
+        lines = []
+        for label, hoisted, reduced in self.loop_log:
+            lines.append(f"bucle {label}: {len(hoisted)} instrucciones al preheader, "
+                         f"{len(reduced)} multiplicaciones reducidas")
+            lines.extend(f"    ↑ {ins}" for ins in hoisted)
+            lines.extend(f"    × {ins}" for ins in reduced)
+        return "\n".join(lines)
 
     # -------- dead‑code elimination ----------
+    @staticmethod
+    def _sweep(instrs: List[IRInstr], live: set, kept: List[IRInstr] | None = None) -> set:
+        """
+        Recorre un bloque hacia atrás a partir de las variables vivas a la
+        salida. Una asignación sólo cuenta como uso si su destino está vivo
+        (liveness "fuerte"), así las cadenas de temporales muertos caen juntas.
+        """
+        live = set(live)
+        for ins in reversed(instrs):
+            if ins.has_side_effects or ins.dest in live:
+                if ins.dest is not None:
+                    live.discard(ins.dest)
+                live.update(ins.uses())
+                if kept is not None:
+                    kept.append(ins)
+        return live
+
+    def _live_in(self, blocks) -> List[set]:
+        """Punto fijo de liveness (worklist, hacia atrás): vivas a la entrada de cada bloque."""
+        live_in: List[set] = [set() for _ in blocks]
+        pending = list(range(len(blocks)))
+        queued = set(pending)
+        while pending:
+            i = pending.pop()
+            queued.discard(i)
+            b = blocks[i]
+            live_out = set().union(*(live_in[s] for s in b.succs))
+            new_in = self._sweep(b.instrs, live_out)
+            if new_in != live_in[i]:
+                live_in[i] = new_in
+                for p in b.preds:
+                    if p not in queued:
+                        queued.add(p)
+                        pending.append(p)
+        return live_in
+
     def dead_code_elimination(self) -> None:
-        useful: set[str] = set()
-        new: List[str] = []
-
-        for line in reversed(self.code):
-            stripped = line.strip()
-
-            # Mantener líneas de control/salida
-            control = stripped.startswith(("print", "goto", "if")) or ':' in stripped
-            if control:
-                new.insert(0, line)
-                tokens = re.findall(r'\b\w+\b', line)
-                useful.update(t for t in tokens if t.isidentifier() and not t.startswith('L'))
-                continue
+        blocks = build_cfg(self.code).blocks
+        live_in = self._live_in(blocks)
 
-            m = re.match(r'(\w+)\s*=\s*(.+)', line)
-            if m:
-                var, expr = m.group(1), m.group(2)
-                if var in useful:
-                    new.insert(0, line)
-                    tokens = re.findall(r'\b\w+\b', expr)
-                    useful.update(t for t in tokens if t.isidentifier() and not t.startswith('L'))
+        # ---- eliminación ----
+        new: List[IRInstr] = []
+        for b in blocks:
+            live_out = set().union(*(live_in[s] for s in b.succs))
+            kept: List[IRInstr] = []
+            self._sweep(b.instrs, live_out, kept)
+            kept.reverse()
+            new.extend(kept)
 
         self.code = new
 
     # -------- interfaz pública ----------
+    def _numbering(self) -> None:
+        folded = self.folded_branches
+        self.value_numbering()
+        if self.folded_branches != folded:
+            self.constant_propagation_and_folding()   # quita las ramas muertas
+
     def optimize(self) -> None:
         self.constant_propagation_and_folding()
+        if self.use_cse:
+            self._numbering()
+        if self.use_loops and self.loop_optimization():
+            self.constant_propagation_and_folding()   # `s = i * c` con i constante
+            if self.use_cse:
+                self._numbering()   # propaga las copias `j = s` de la reducción
         self.dead_code_elimination()
 
-    def get_code(self) -> List[str]:
+    def get_code(self) -> List[IRInstr]:
         return self.code
@@ -0,0 +1,73 @@
+"""
+Inferencia de tipos numéricos del IR
+------------------------------------
+• Los literales son `int` ("3") o `float` ("3.0", "1e5")
+• + - * de dos int dan int; con algún float, float
+• / siempre da float; las comparaciones dan int (1/0)
+• GUITA puede devolver int, float o texto: tipo desconocido (ANY)
+
+Es un análisis insensible al flujo: el tipo de una variable es la unión de
+los tipos de todas sus asignaciones y de su valor inicial (0, int). Sólo INT
+es una garantía que aprovecha el generador de código.
+"""
+from __future__ import annotations
+from typing import Dict, List, Optional
+from ir_instrucciones import IRInstr, is_name, parse_number
+
+INT, FLOAT, ANY = "int", "float", "any"
+
+_ARITH = ("+", "-", "*")
+_COMPARE = (">", "<", ">=", "<=", "==", "!=")
+
+Types = Dict[str, str]
+
+
+def literal_type(text: str) -> Optional[str]:
+    val = parse_number(text)
+    if val is None:
+        return None
+    return INT if isinstance(val, int) else FLOAT
+
+
+def _join(a: Optional[str], b: str) -> str:
+    return b if a is None or a == b else ANY
+
+
+def operand_type(operand: str, types: Types) -> str:
+    if is_name(operand):
+        return types.get(operand, INT)      # valor inicial de la máquina: 0
+    return literal_type(operand) or ANY
+
+
+def _result_type(ins: IRInstr, types: Types) -> str:
+    op = ins.op
+    if op == "=":
+        return operand_type(ins.args[0], types)
+    if op in _COMPARE:
+        return INT
+    if op == "/" or op in _ARITH:
+        a, b = (operand_type(x, types) for x in ins.args)
+        if ANY in (a, b):
+            return ANY
+        return INT if op != "/" and a == b == INT else FLOAT
+    return ANY                              # GUITA: int, float o texto
+
+
+def infer_types(code: List[IRInstr]) -> Types:
+    """Nombre → INT, FLOAT o ANY para cada variable/temporal asignado."""
+    types: Types = {}
+    changed = True
+    while changed:
+        changed = False
+        for ins in code:
+            if ins.dest is None:
+                continue
+            new = _join(types.get(ins.dest), _result_type(ins, types))
+            if new != types.get(ins.dest):
+                types[ins.dest] = new
+                changed = True
+    return types
+
+
+def is_int(operand: str, types: Types) -> bool:
+    return operand_type(operand, types) == INT
@@ -2,72 +2,515 @@
 """
 Uso:
     python main.py -i entrada.parce -o salida
+    python main.py -i entrada.parce -o salida --no-cache
+    python main.py --clear-cache
+    python main.py -i entrada.parce -o salida --profile   (+ perfil_simulacion.json)
+    python main.py -i entrada.parce -o salida --metrics   (+ metricas.json)
+    python main.py -i entrada.parce -o salida --metrics-memory   (+ pico de memoria por etapa)
+    python main.py -i entrada.parce -o salida --input-file respuestas.txt   (GUITA sin teclado)
+    python main.py -i entrada.parce -o salida --tee   (salida también en la terminal)
+    python main.py -i entrada.parce -o salida --stream   (salida escrita a disco mientras corre)
+    python main.py -i entrada.parce -o salida --max-steps 1000000 --timeout 5 --max-stack 10000
+    python main.py -i "scripts/**/*.parce" otro.parce -o salida -j 8   (modo lote)
+    python main.py -i entrada.parce -o salida --watch   (recompila al guardar)
+    python main.py -i entrada.parce -o salida --bytecode   (+ codigo_maquina.pcb)
+    python main.py -i salida/codigo_maquina.pcb -o otra   (ejecuta el bytecode sin recompilar)
 """
 
+from collections import Counter
 from pathlib import Path
 import argparse
 import contextlib
-import io
+import glob
+import json
+import os
+import sys
+import time
 
 # ---- Importar tu pipeline ----
-from representacion_intermedia import parse_and_generate_ir
+# (representacion_intermedia importa Lark: se carga recién al compilar)
 from ir_optimizer import IROptimizer
 from sim_maquina_pila import StackMachineCodeGenerator
-from sim_instrucciones_pila import StackMachineSimulator
+from peephole_pila import StackPeepholeOptimizer
+from sim_instrucciones_pila import ExecutionLimitExceeded, StackMachineSimulator
+from bytecode_pila import BYTECODE_SUFFIX, load_bytecode, write_bytecode
+from cache_compilacion import CompilationCache, DEFAULT_CACHE_DIR
+from metricas import PipelineMetrics, stage
+from entrada_pila import FileInput, InputProvider
+from salida_pila import FileOutput, MemoryOutput, OutputSink, StreamOutput, TeeOutput
 
 
 # ---------- Pipeline reusable ----------
-def run_pipeline(source_code: str):
-    # 1) IR sin optimizar
-    ir = parse_and_generate_ir(source_code)
-
-    # 2) Optimización
-    opt = IROptimizer(ir)
-    opt.optimize()
-    ir_opt = opt.get_code()
-
-    # 3) Código para máquina de pila
-    gen = StackMachineCodeGenerator(ir_opt)
-    machine_code = gen.generate()
-
-    # 4) Simulación (capturamos stdout)
-    buffer = io.StringIO()
-    with contextlib.redirect_stdout(buffer):
-        sim = StackMachineSimulator(machine_code)
-        sim.run()
-    simulation_output = buffer.getvalue().strip()
+def compile_source(source_code: str, stats: dict | None = None,
+                   metrics: PipelineMetrics | None = None):
+    from representacion_intermedia import get_parser, parse, generate_ir
+
+    # 1) Parseo (la primera vez incluye cargar las tablas LALR)
+    with stage(metrics, "parser_load"):
+        get_parser()
+    with stage(metrics, "parse") as info:
+        tree = parse(source_code)
+        if metrics is not None:
+            info["tree_nodes"] = sum(1 for _ in tree.iter_subtrees())
+
+    # 2) IR sin optimizar
+    with stage(metrics, "ir") as info:
+        ir = generate_ir(tree)
+        info["ir_lines"] = len(ir)
+
+    return compile_ir(ir, stats, metrics)
+
+
+def compile_ir(ir, stats: dict | None = None, metrics: PipelineMetrics | None = None):
+    """Etapas 3‑5 (optimización, código de pila, peephole) sobre el IR sin optimizar."""
+    # 3) Optimización
+    with stage(metrics, "optimize") as info:
+        opt = IROptimizer(ir)
+        opt.optimize()
+        ir_opt = opt.get_code()
+        info["ir_lines_before"], info["ir_lines_after"] = len(ir), len(ir_opt)
+
+    # 4) Código para máquina de pila
+    with stage(metrics, "codegen") as info:
+        gen = StackMachineCodeGenerator(ir_opt)
+        machine_code = gen.generate()
+        info["machine_instructions"] = len(machine_code)
+
+    # 5) Peephole sobre el código de pila
+    with stage(metrics, "peephole") as info:
+        peep = StackPeepholeOptimizer(machine_code, origins=gen.origins)
+        peep.optimize()
+        machine_code = peep.get_code()
+        info["machine_instructions"] = len(machine_code)
+    if stats is not None:
+        stats["peephole"] = peep.report()
+        if opt.loop_log:
+            stats["loops"] = opt.loop_report()
+    # line_map[i]: línea de IR que generó la instrucción i
+    return ir_opt, machine_code, peep.get_origins()
+
+
+class IncrementalCompiler:
+    """
+    Compilador que se mantiene entre ediciones del mismo programa (modo watch).
+    • Cada sentencia de primer nivel se parsea y traduce a IR por separado y se
+      guarda por (texto, n.º de aparición de ese texto); las que no cambiaron
+      se reutilizan con los mismos nombres de temporales y etiquetas.
+    • Una sentencia nueva recibe números que nunca usó otra, así sus nombres
+      no chocan con los fragmentos reutilizados.
+    • La optimización es global (las constantes y la vida de las variables
+      cruzan sentencias): se saltea sólo si el IR completo no cambió.
+    La primera compilación da exactamente el mismo resultado que compile_source.
+    """
+
+    def __init__(self):
+        self._fragments: dict = {}     # (texto, aparición) -> IR del fragmento
+        self._next_temp = 0
+        self._last_ir = None
+        self._last_result = None
+        self.reused = 0
+        self.compiled = 0
+
+    def _fragment_ir(self, sources):
+        from representacion_intermedia import generate_ir_fragment
+
+        fragments, seen = {}, {}
+        ir = []
+        for text in sources:
+            key = (text, seen.get(text, 0))
+            seen[text] = key[1] + 1
+            code = self._fragments.get(key)
+            if code is None:
+                code, self._next_temp = generate_ir_fragment(text, self._next_temp)
+                self.compiled += 1
+            else:
+                self.reused += 1
+            fragments[key] = code
+            ir.extend(code)
+        self._fragments = fragments     # sólo se guardan los de la última versión
+        return ir
 
+    def compile(self, source_code: str, stats: dict | None = None,
+                metrics: PipelineMetrics | None = None):
+        from lark.exceptions import LarkError
+        from representacion_intermedia import get_parser, parse, split_statements
+
+        with stage(metrics, "parser_load"):
+            get_parser()
+        self.reused = self.compiled = 0
+        with stage(metrics, "ir") as info:
+            try:
+                ir = self._fragment_ir(split_statements(source_code))
+            except LarkError:
+                # Con errores se parsea todo junto, para reportar la posición real
+                parse(source_code)
+                ir = self._fragment_ir([source_code])
+            info["ir_lines"] = len(ir)
+            info["reused"], info["compiled"] = self.reused, self.compiled
+        if stats is not None:
+            stats["incremental"] = self.report()
+
+        if ir == self._last_ir:
+            return self._last_result
+        self._last_ir = ir
+        self._last_result = compile_ir(ir, stats, metrics)
+        return self._last_result
+
+    def report(self) -> str:
+        total = self.reused + self.compiled
+        return f"incremental: {self.reused}/{total} sentencias reutilizadas"
+
+
+def run_pipeline(source_code: str, cache: CompilationCache | None = None,
+                 stats: dict | None = None, profile: bool = False,
+                 metrics: PipelineMetrics | None = None,
+                 input_provider: InputProvider | None = None,
+                 output: OutputSink | None = None, limits: dict | None = None,
+                 compiler: IncrementalCompiler | None = None):
+    """
+    Compila y simula `source_code`. Devuelve (ir, código de máquina, salida).
+    `stats` (dict) recibe el reporte del peephole y, con profile=True, el
+    perfil de la simulación; `metrics` mide tiempo/memoria de cada etapa.
+    GUITA lee de `input_provider` (por defecto, stdin). Si se pasa `output`,
+    PRINT escribe ahí y la salida devuelta es None. `limits` son los límites de
+    ejecución del simulador (max_steps, timeout, max_stack). Con `compiler`
+    (modo watch) se compila de forma incremental y no se usa la caché.
+    """
+    # 1‑5) Compilación (o lectura desde la caché)
+    cached = None
+    if compiler is not None:
+        cached = compiler.compile(source_code, stats, metrics)
+    elif cache is not None:
+        with stage(metrics, "cache") as info:
+            cached = cache.get(source_code)
+            info["hit"] = cached is not None
+    if cached is not None:
+        ir_opt, machine_code, line_map = cached
+    else:
+        ir_opt, machine_code, line_map = compile_source(source_code, stats, metrics)
+        if cache is not None:
+            cache.put(source_code, ir_opt, machine_code, line_map)
+
+    # 6) Simulación
+    simulation_output = simulate(machine_code, stats, profile, metrics, input_provider,
+                                 output, limits, ir_opt, line_map)
     return ir_opt, machine_code, simulation_output
 
 
+def simulate(machine_code, stats: dict | None = None, profile: bool = False,
+             metrics: PipelineMetrics | None = None,
+             input_provider: InputProvider | None = None,
+             output: OutputSink | None = None, limits: dict | None = None,
+             ir=None, line_map=None):
+    """
+    Ejecuta código de máquina (texto o bytecode abierto con load_bytecode).
+    Devuelve la salida, o None si se pasó `output`. `ir` y `line_map` sólo
+    enriquecen el perfil.
+    """
+    memory = None
+    if output is None:
+        output = memory = MemoryOutput()
+    with stage(metrics, "simulate") as info:
+        sim = StackMachineSimulator(machine_code, profile=profile, input_provider=input_provider,
+                                    output=output, **(limits or {}))
+        sim.run()
+        info["machine_instructions"] = len(sim.program)
+        if sim.steps is not None:
+            info["steps"] = sim.steps
+    if profile and stats is not None:
+        stats["profile"] = sim.profiler.report(ir, line_map)
+    return memory.getvalue().strip() if memory is not None else None
+
+
+def run_bytecode(path: Path, stats: dict | None = None, profile: bool = False,
+                 metrics: PipelineMetrics | None = None,
+                 input_provider: InputProvider | None = None,
+                 output: OutputSink | None = None, limits: dict | None = None):
+    """Simula un .pcb ya compilado: sin parser, optimizador ni caché."""
+    with stage(metrics, "load") as info:
+        bytecode = load_bytecode(path)
+        info["bytes"] = path.stat().st_size
+    with bytecode:
+        return simulate(bytecode, stats, profile, metrics, input_provider, output, limits)
+
+
 # ---------- Helpers ----------
 def save(path: Path, content):
-    text = "\n".join(content) if isinstance(content, (list, tuple)) else str(content)
+    text = "\n".join(map(str, content)) if isinstance(content, (list, tuple)) else str(content)
     path.write_text(text, encoding="utf-8")
 
 
+def process_file(src_path: Path, out_dir: Path, cache: CompilationCache | None = None,
+                 stats: dict | None = None, profile: bool = False,
+                 metrics: PipelineMetrics | None = None,
+                 input_provider: InputProvider | None = None, tee: bool = False,
+                 stream: bool = False, limits: dict | None = None,
+                 compiler: IncrementalCompiler | None = None, bytecode: bool = False):
+    """
+    Con tee=True la salida de la simulación también se ve en la terminal.
+    Con stream=True se escribe en salida_simulacion.txt mientras se ejecuta
+    (memoria constante; si la ejecución se corta queda el archivo parcial).
+    Con bytecode=True se escribe además codigo_maquina.pcb. Si `src_path` es
+    un .pcb se ejecuta directo y sólo se escriben la salida (y perfil/métricas).
+    """
+    if profile and stats is None:
+        stats = {}
+    precompiled = src_path.suffix == BYTECODE_SUFFIX
+    if stream:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        sink = FileOutput(out_dir / "salida_simulacion.txt", strip=True)
+    else:
+        sink = MemoryOutput()
+    output = TeeOutput(sink, StreamOutput(sys.stdout)) if tee else sink
+    with output:
+        if precompiled:
+            run_bytecode(src_path, stats, profile, metrics, input_provider, output, limits)
+        else:
+            source_code = src_path.read_text(encoding="utf-8")
+            ir, machine, _ = run_pipeline(source_code, cache, stats, profile, metrics,
+                                          input_provider, output, limits, compiler)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    if not precompiled:
+        save(out_dir / "ir.txt", ir)
+        save(out_dir / "codigo_maquina.txt", machine)
+        if bytecode:
+            write_bytecode(out_dir / f"codigo_maquina{BYTECODE_SUFFIX}", machine)
+    if not stream:
+        save(out_dir / "salida_simulacion.txt", sink.getvalue().strip())
+    if profile:
+        save(out_dir / "perfil_simulacion.json", json.dumps(stats["profile"], ensure_ascii=False, indent=1))
+    if metrics is not None:
+        save(out_dir / "metricas.json", json.dumps(metrics.to_dict(), ensure_ascii=False, indent=1))
+
+
+# ---------- Modo lote ----------
+def expand_inputs(patterns):
+    """Expande archivos, directorios (todos sus .parce) y globs, sin duplicados."""
+    found = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = sorted(str(p) for p in path.rglob("*.parce"))
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        found.extend(Path(m) for m in matches)
+    return list(dict.fromkeys(found))
+
+
+def batch_output_dirs(sources, out_root: Path):
+    # Cada entrada va a su propio subdirectorio, relativo al ancestro común
+    parents = [str(src.resolve().parent) for src in sources]
+    base = Path(os.path.commonpath(parents)) if parents else Path()
+    rel = [src.resolve().relative_to(base) for src in sources]
+    # x.parce y x.pcb del mismo directorio: cada uno conserva su extensión
+    stems = Counter(r.with_suffix("") for r in rel)
+    return [out_root / (r if stems[r.with_suffix("")] > 1 else r.with_suffix("")) for r in rel]
+
+
+def batch_input_path(src_path: Path, input_file=None):
+    """Entradas de GUITA de un archivo del lote: `input_file` o `<nombre>.entrada`."""
+    if input_file is not None:
+        return Path(input_file)
+    sibling = src_path.with_suffix(".entrada")
+    return sibling if sibling.is_file() else Path(os.devnull)
+
+
+def _batch_worker(src_path: Path, out_dir: Path, cache_dir, profile: bool = False,
+                  measure: bool = False, input_file=None, stream: bool = False,
+                  limits: dict | None = None, bytecode: bool = False, memory: bool = False):
+    # Corre en un proceso hijo: un error en un archivo no aborta el resto
+    cache = CompilationCache(cache_dir) if cache_dir is not None else None
+    t0 = time.perf_counter()
+    error = None
+    try:
+        # GUITA nunca lee del teclado en un worker
+        with FileInput(batch_input_path(src_path, input_file)) as entrada:
+            process_file(src_path, out_dir, cache, profile=profile,
+                         metrics=PipelineMetrics(memory) if measure else None,
+                         input_provider=entrada, stream=stream, limits=limits,
+                         bytecode=bytecode)
+    except Exception as e:
+        first_line = str(e).strip().splitlines()[0] if str(e).strip() else ""
+        error = f"{type(e).__name__}: {first_line}"
+    elapsed = time.perf_counter() - t0
+    hits = cache.hits if cache is not None else 0
+    return src_path, out_dir, elapsed, error, hits
+
+
+def run_batch(sources, out_root: Path, jobs: int | None = None, cache_dir=None,
+              profile: bool = False, measure: bool = False, input_file=None,
+              stream: bool = False, limits: dict | None = None, bytecode: bool = False,
+              memory: bool = False):
+    """Compila y simula varios archivos en paralelo. Devuelve la lista de resultados."""
+    # import diferido: cuesta ~80 ms y sólo lo usa el modo lote
+    from concurrent.futures import ProcessPoolExecutor
+
+    out_dirs = batch_output_dirs(sources, out_root)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_batch_worker, src, out, cache_dir, profile, measure,
+                               input_file, stream, limits, bytecode, memory)
+                   for src, out in zip(sources, out_dirs)]
+        return [f.result() for f in futures]
+
+
+def print_batch_summary(results, wall: float):
+    width = max(len(str(src)) for src, *_ in results)
+    for src, out_dir, elapsed, error, _ in results:
+        status = "✅" if error is None else "❌"
+        line = f"{status} {str(src):<{width}}  {elapsed * 1000:8.1f} ms"
+        print(line + (f"  {error}" if error else f"  -> {out_dir}"))
+
+    failed = sum(1 for r in results if r[3] is not None)
+    cpu = sum(r[2] for r in results)
+    hits = sum(r[4] for r in results)
+    print(f"\n{len(results)} archivo(s): {len(results) - failed} ok, {failed} con error, "
+          f"{hits} desde caché")
+    print(f"Tiempo total: {wall:.3f} s (suma por archivo: {cpu:.3f} s)")
+
+
+# ---------- Modo watch ----------
+def watch(sources, out_dirs, input_file=None, limits: dict | None = None,
+          debounce: float = 0.1, bytecode: bool = False):
+    """
+    Recompila y simula cada archivo cuando cambia, con el compilador cargado
+    y un IncrementalCompiler por archivo. Termina con Ctrl+C.
+    """
+    from vigilancia import FileWatcher
+
+    targets = {src.resolve(): (src, out, IncrementalCompiler()) for src, out in zip(sources, out_dirs)}
+
+    def rebuild(path: Path, detected: float | None = None):
+        src, out_dir, compiler = targets[path]
+        stats: dict = {}
+        t0 = time.perf_counter()
+        try:
+            with FileInput(batch_input_path(src, input_file)) as entrada:
+                process_file(src, out_dir, stats=stats, input_provider=entrada,
+                             limits=limits, compiler=compiler, bytecode=bytecode)
+        except Exception as e:
+            first_line = str(e).strip().splitlines()[0] if str(e).strip() else ""
+            print(f"❌ {src}  {type(e).__name__}: {first_line}")
+            return
+        done = time.perf_counter()
+        latency = (f"latencia desde el guardado: {(done - detected) * 1000:.1f} ms; "
+                   if detected is not None else "")
+        print(f"🔁 {src}  {(done - t0) * 1000:.1f} ms ({latency}{stats.get('incremental', '')})")
+
+    for path in targets:
+        rebuild(path)
+    with FileWatcher(targets, debounce=debounce) as watcher:
+        print(f"👀 Vigilando {len(targets)} archivo(s) con {watcher.backend}. Ctrl+C para salir.")
+        try:
+            while True:
+                changed = watcher.wait()
+                # la espera del debounce ya pasó: se descuenta para medir desde el guardado
+                detected = time.perf_counter() - debounce
+                for path in sorted(changed):
+                    rebuild(path, detected)
+        except KeyboardInterrupt:
+            print()
+
+
 # ---------- CLI principal ----------
 def main():
     ap = argparse.ArgumentParser(description="Compilador Parce‑Lang")
-    ap.add_argument("-i", "--input", required=True, help="Archivo de entrada .parce")
+    ap.add_argument("-i", "--input", nargs="+",
+                    help="Archivo(s) de entrada .parce (o .pcb ya compilados), directorios o globs")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="Procesos en modo lote (por defecto: núcleos)")
     ap.add_argument("-o", "--output", default="output", help="Directorio de salida")
+    ap.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR), help="Directorio de la caché de compilación")
+    ap.add_argument("--no-cache", action="store_true", help="Compilar siempre, sin leer ni escribir la caché")
+    ap.add_argument("--clear-cache", action="store_true", help="Vaciar la caché antes de compilar")
+    ap.add_argument("--profile", action="store_true",
+                    help="Perfilar la simulación y escribir perfil_simulacion.json")
+    ap.add_argument("--metrics", action="store_true",
+                    help="Medir el tiempo de cada etapa y escribir metricas.json")
+    ap.add_argument("--metrics-memory", action="store_true",
+                    help="Como --metrics, más el pico de memoria por etapa (tracemalloc: "
+                         "los tiempos salen inflados)")
+    ap.add_argument("--input-file", metavar="ARCHIVO",
+                    help="Valores para GUITA, uno por línea (en lote: por defecto <archivo>.entrada)")
+    ap.add_argument("--tee", action="store_true",
+                    help="Mostrar la salida de la simulación en la terminal además de guardarla")
+    ap.add_argument("--stream", action="store_true",
+                    help="Escribir salida_simulacion.txt mientras se ejecuta (memoria constante)")
+    ap.add_argument("--max-steps", type=int, help="Máximo de instrucciones a ejecutar")
+    ap.add_argument("--timeout", type=float, help="Tiempo máximo de simulación, en segundos")
+    ap.add_argument("--max-stack", type=int, help="Profundidad máxima de la pila")
+    ap.add_argument("--watch", action="store_true",
+                    help="Recompilar y simular cada vez que cambia un archivo de entrada")
+    ap.add_argument("--debounce", type=float, default=0.1,
+                    help="Segundos sin cambios antes de recompilar en --watch")
+    ap.add_argument("--bytecode", action="store_true",
+                    help="Escribir también codigo_maquina.pcb (bytecode binario, se ejecuta con -i)")
     args = ap.parse_args()
+    measure = args.metrics or args.metrics_memory
 
-    src_path = Path(args.input)
-    if not src_path.is_file():
-        ap.error(f"No existe el archivo: {src_path}")
+    cache = None if args.no_cache else CompilationCache(args.cache_dir)
+    if args.clear_cache:
+        CompilationCache(args.cache_dir).clear()
+        if not args.input:
+            print(f"🧹 Caché vaciada: {Path(args.cache_dir).resolve()}")
+            return
+    if not args.input:
+        ap.error("falta el archivo de entrada (-i/--input)")
 
-    out_dir = Path(args.output)
-    out_dir.mkdir(parents=True, exist_ok=True)
+    sources = expand_inputs(args.input)
+    for src_path in sources:
+        if not src_path.is_file():
+            ap.error(f"No existe el archivo: {src_path}")
+    if not sources:
+        ap.error("ningún archivo coincide con las entradas")
+    if args.input_file is not None and not Path(args.input_file).is_file():
+        ap.error(f"No existe el archivo: {args.input_file}")
+
+    limits = {k: v for k, v in (("max_steps", args.max_steps), ("timeout", args.timeout),
+                                ("max_stack", args.max_stack)) if v is not None}
 
-    source_code = src_path.read_text(encoding="utf-8")
-    ir, machine, sim_out = run_pipeline(source_code)
+    out_dir = Path(args.output)
+    if args.watch:
+        out_dirs = batch_output_dirs(sources, out_dir) if len(sources) > 1 else [out_dir]
+        watch(sources, out_dirs, args.input_file, limits, args.debounce, args.bytecode)
+        return
+    if len(sources) > 1:
+        t0 = time.perf_counter()
+        results = run_batch(sources, out_dir, args.jobs, None if args.no_cache else args.cache_dir,
+                            args.profile, measure, args.input_file, args.stream, limits,
+                            args.bytecode, args.metrics_memory)
+        print_batch_summary(results, time.perf_counter() - t0)
+        if any(r[3] is not None for r in results):
+            sys.exit(1)
+        return
 
-    save(out_dir / "ir.txt", ir)
-    save(out_dir / "codigo_maquina.txt", machine)
-    save(out_dir / "salida_simulacion.txt", sim_out)
+    stats = {}
+    metrics = PipelineMetrics(args.metrics_memory) if measure else None
+    with contextlib.ExitStack() as stack:
+        entrada = stack.enter_context(FileInput(args.input_file)) if args.input_file else None
+        try:
+            process_file(sources[0], out_dir, cache, stats, args.profile, metrics, entrada,
+                         args.tee, args.stream, limits, bytecode=args.bytecode)
+        except ExecutionLimitExceeded as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+        except KeyboardInterrupt:
+            if not args.stream:
+                raise
+            print(f"\n⚠️  Interrumpido. Salida parcial en {(out_dir / 'salida_simulacion.txt').resolve()}")
+            sys.exit(130)
 
     print(f"✅ Proceso completado. Resultados en {out_dir.resolve()}")
+    if "peephole" in stats:
+        print(f"   ({stats['peephole']})")
+    if "loops" in stats:
+        print("   " + stats["loops"].replace("\n", "\n   "))
+    if metrics is not None:
+        print(metrics.summary())
+    if cache is not None:
+        print(f"   ({cache.stats()})")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,72 @@
+"""
+Métricas por etapa del pipeline
+-------------------------------
+• Tiempo de cada etapa con `time.perf_counter_ns`
+• Pico de memoria de cada etapa con `tracemalloc` (opcional: con
+  `memory=True` todo corre bajo tracemalloc, que hace más lentas unas
+  etapas que otras; los tiempos sólo se comparan entre sí sin memoria)
+• Tamaños que reporta cada etapa (nodos del árbol, líneas de IR, …)
+
+Uso:
+    metrics = PipelineMetrics()
+    with metrics.stage("parse") as info:
+        tree = parse(src)
+        info["tree_nodes"] = ...
+    metrics.to_dict()
+"""
+from __future__ import annotations
+from contextlib import contextmanager, nullcontext
+from time import perf_counter_ns
+from typing import Iterator, List, Optional
+import tracemalloc
+
+
+class PipelineMetrics:
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.stages: List[dict] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[dict]:
+        info: dict = {}
+        started_tracing = False
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+
+        t0 = perf_counter_ns()
+        try:
+            yield info
+        finally:
+            elapsed = perf_counter_ns() - t0
+            record = {"stage": name, "time_ms": elapsed / 1e6}
+            if self.memory:
+                _, peak = tracemalloc.get_traced_memory()
+                record["peak_memory_kb"] = round(max(peak - base, 0) / 1024, 1)
+                if started_tracing:
+                    tracemalloc.stop()
+            record.update(info)
+            self.stages.append(record)
+
+    def total_ms(self) -> float:
+        return sum(s["time_ms"] for s in self.stages)
+
+    def to_dict(self) -> dict:
+        return {"total_ms": self.total_ms(), "stages": self.stages}
+
+    def summary(self) -> str:
+        lines = []
+        for s in self.stages:
+            mem = f"  {s['peak_memory_kb']:>10.1f} KB" if "peak_memory_kb" in s else ""
+            sizes = ", ".join(f"{k}={v}" for k, v in s.items()
+                              if k not in ("stage", "time_ms", "peak_memory_kb"))
+            lines.append(f"{s['stage']:<10} {s['time_ms']:10.3f} ms{mem}  {sizes}")
+        return "\n".join(lines)
+
+
+def stage(metrics: Optional[PipelineMetrics], name: str):
+    """`metrics.stage(name)` o un contexto vacío si no se miden métricas."""
+    return metrics.stage(name) if metrics is not None else nullcontext({})
@@ -0,0 +1,291 @@
+"""
+Optimizador peephole para el código de la máquina de pila
+---------------------------------------------------------
+Se aplica entre `StackMachineCodeGenerator.generate()` y el simulador:
+• Plegado de PUSH a / PUSH b / op
+• Saltos con condición constante (PUSH c / JNZ)
+• STORE t / LOAD t de temporales de un solo uso (el valor queda en la pila)
+• Comparación + JNZ → salto combinado (JGT, JLT, JGE, JLE, JEQ, JNE)
+• JEQ|JNE A / JMP B / LABEL A → JNE|JEQ B / LABEL A (las comparaciones de orden
+  no se invierten: con NaN `not (a > b)` no equivale a `a <= b`)
+• Saltos a saltos, saltos a la instrucción siguiente y código inalcanzable
+Al final (opcional) se fusionan secuencias frecuentes en superinstrucciones:
+• LOAD_SLOT x / PUSH k / ADD|SUB[_I] / STORE_SLOT x → INC_SLOT x ±k
+• LOAD_SLOT x / STORE_SLOT y                   → COPY_SLOT x y
+• LOAD_SLOT x / PUSH k / Jcc L                 → Jcc_SLOT_K x k L
+"""
+from __future__ import annotations
+from collections import Counter
+from typing import List, Optional, Tuple
+import math
+
+from ir_instrucciones import format_number, is_temp, parse_number
+from sim_instrucciones_pila import BINOPS, INT_BINOPS
+
+CMP_JUMPS = {"GT": "JGT", "LT": "JLT", "GE": "JGE", "LE": "JLE", "EQ": "JEQ", "NE": "JNE"}
+# Sólo == y != son complementarios también con NaN
+NEGATED = {"JEQ": "JNE", "JNE": "JEQ"}
+_JUMPS = ("JMP", "JNZ", *CMP_JUMPS.values())
+_FOLDABLE = {**BINOPS, **INT_BINOPS}
+
+
+Entry = Tuple[str, Optional[str], Optional[int]]   # (instr, operando, línea de IR)
+
+
+def _split(line: str) -> Tuple[str, Optional[str]]:
+    parts = line.strip().split(maxsplit=1)
+    return parts[0], parts[1] if len(parts) == 2 else None
+
+
+def _format(entry: Entry) -> str:
+    instr, arg, _ = entry
+    return instr if arg is None else f"{instr} {arg}"
+
+
+def _temp_slot(arg: Optional[str]) -> Optional[str]:
+    # "3 t7" -> "3" si el slot pertenece a un temporal del generador de IR
+    if arg is None:
+        return None
+    parts = arg.split()
+    if len(parts) == 2 and is_temp(parts[1]):
+        return parts[0]
+    return None
+
+
+class StackPeepholeOptimizer:
+    """
+    `origins` (opcional) indica, para cada instrucción de `code`, la línea de
+    IR que la generó; se mantiene a través de las reglas (ver `get_origins`).
+    """
+
+    def __init__(self, code: List[str], superinstructions: bool = True,
+                 origins: Optional[List[int]] = None):
+        self.code: List[Entry] = [
+            (*_split(line), origins[i] if origins is not None else None)
+            for i, line in enumerate(code) if line.strip()
+        ]
+        self.original_size = len(self.code)
+        self.use_superinstructions = superinstructions
+
+    # -------- reglas ----------
+    @staticmethod
+    def fold_constants(code: List[Entry]) -> List[Entry]:
+        out: List[Entry] = []
+        for entry in code:
+            instr = entry[0]
+            if instr in _FOLDABLE and len(out) >= 2:
+                (i1, a, origin), (i2, b, _) = out[-2], out[-1]
+                if i1 == i2 == "PUSH":
+                    try:
+                        val = _FOLDABLE[instr](parse_number(a), parse_number(b))
+                    except OverflowError:       # int enorme con float: falla al ejecutar
+                        val = math.inf
+                    # un int exacto no tiene tope (isfinite lo pasaría a float)
+                    if not isinstance(val, float) or math.isfinite(val):
+                        out[-2:] = [("PUSH", format_number(val), origin)]
+                        continue
+            out.append(entry)
+        return out
+
+    @staticmethod
+    def constant_branches(code: List[Entry]) -> List[Entry]:
+        out: List[Entry] = []
+        for entry in code:
+            instr, arg, origin = entry
+            if instr == "JNZ" and out and out[-1][0] == "PUSH":
+                _, val, _ = out.pop()
+                if parse_number(val) != 0:
+                    out.append(("JMP", arg, origin))
+                continue
+            out.append(entry)
+        return out
+
+    @staticmethod
+    def store_load_pairs(code: List[Entry]) -> List[Entry]:
+        loads: Counter = Counter()
+        stores: Counter = Counter()
+        for instr, arg, _ in code:
+            slot = _temp_slot(arg)
+            if slot is not None:
+                if instr == "LOAD_SLOT":
+                    loads[slot] += 1
+                elif instr == "STORE_SLOT":
+                    stores[slot] += 1
+
+        out: List[Entry] = []
+        for entry in code:
+            instr, arg, _ = entry
+            if instr == "LOAD_SLOT" and out:
+                slot = _temp_slot(arg)
+                prev, prev_arg, _ = out[-1]
+                if (slot is not None and prev == "STORE_SLOT" and prev_arg == arg
+                        and loads[slot] == 1 and stores[slot] == 1):
+                    out.pop()
+                    continue
+            out.append(entry)
+        return out
+
+    @staticmethod
+    def fuse_compare_jumps(code: List[Entry]) -> List[Entry]:
+        out: List[Entry] = []
+        for entry in code:
+            instr, arg, _ = entry
+            if instr == "JNZ" and out and out[-1][0] in CMP_JUMPS and out[-1][1] is None:
+                out[-1] = (CMP_JUMPS[out[-1][0]], arg, out[-1][2])
+                continue
+            out.append(entry)
+        return out
+
+    @staticmethod
+    def invert_branches(code: List[Entry]) -> List[Entry]:
+        out: List[Entry] = []
+        i = 0
+        while i < len(code):
+            instr, arg, origin = code[i]
+            if instr in NEGATED and i + 2 < len(code):
+                nxt, target, _ = code[i + 1]
+                if nxt == "JMP" and code[i + 2][:2] == ("LABEL", arg):
+                    out.append((NEGATED[instr], target, origin))
+                    i += 2          # la etiqueta se conserva
+                    continue
+            out.append(code[i])
+            i += 1
+        return out
+
+    @staticmethod
+    def thread_jumps(code: List[Entry]) -> List[Entry]:
+        # etiqueta -> primera instrucción real después de ella
+        target_of = {}
+        pending = []
+        for instr, arg, _ in code:
+            if instr == "LABEL":
+                pending.append(arg)
+                continue
+            for lbl in pending:
+                target_of[lbl] = (instr, arg)
+            pending = []
+
+        resolved = {}       # etiqueta -> destino final ya calculado
+
+        def final(label: str) -> str:
+            path = [label]
+            seen = {label}
+            while label not in resolved:
+                instr, arg = target_of.get(label, (None, None))
+                if instr != "JMP" or arg in seen:
+                    break
+                seen.add(arg)
+                path.append(arg)
+                label = arg
+            end = resolved.get(label, label)
+            for lbl in path:
+                resolved[lbl] = end
+            return end
+
+        out = []
+        for entry in code:
+            instr, arg, origin = entry
+            if instr in _JUMPS:
+                entry = (instr, final(arg), origin)
+            out.append(entry)
+        return out
+
+    @staticmethod
+    def jumps_to_next(code: List[Entry]) -> List[Entry]:
+        # De atrás hacia adelante: `here` son las etiquetas que caen en el punto
+        # actual. Un JMP a una de ellas se borra sin mover ese punto, así una
+        # cascada `JMP L / LABEL a / JMP L / LABEL L` se resuelve en una pasada.
+        out: List[Entry] = []
+        here = set()
+        for entry in reversed(code):
+            instr, arg, _ = entry
+            if instr == "JMP" and arg in here:
+                continue
+            if instr == "LABEL":
+                here.add(arg)
+            else:
+                here = set()
+            out.append(entry)
+        out.reverse()
+        return out
+
+    @staticmethod
+    def unreachable(code: List[Entry]) -> List[Entry]:
+        out: List[Entry] = []
+        dead = False
+        for entry in code:
+            instr = entry[0]
+            if instr == "LABEL":
+                dead = False
+            if not dead:
+                out.append(entry)
+            if instr == "JMP":
+                dead = True
+        return out
+
+    @staticmethod
+    def superinstructions(code: List[Entry]) -> List[Entry]:
+        # Se aplica una sola vez y al final: las demás reglas no conocen
+        # estas instrucciones.
+        out: List[Entry] = []
+        for entry in code:
+            out.append(entry)
+            instr, arg, _ = entry
+
+            if instr == "STORE_SLOT" and len(out) >= 4:
+                (i1, a1, origin), (i2, a2, _), (i3, _, _) = out[-4:-1]
+                if (i1 == "LOAD_SLOT" and a1 == arg and i2 == "PUSH"
+                        and i3 in ("ADD", "SUB", "ADD_I", "SUB_I")):
+                    k = parse_number(a2)
+                    if i3.startswith("SUB"):
+                        k = -k
+                    out[-4:] = [("INC_SLOT", f"{arg} {format_number(k)}", origin)]
+                    continue
+
+            if instr == "STORE_SLOT" and len(out) >= 2:
+                prev, src, origin = out[-2]
+                if prev == "LOAD_SLOT":
+                    out[-2:] = [("COPY_SLOT", f"{src} {arg}", origin)]
+                    continue
+
+            if instr in CMP_JUMPS.values() and len(out) >= 3:
+                (i1, a1, origin), (i2, a2, _) = out[-3], out[-2]
+                if i1 == "LOAD_SLOT" and i2 == "PUSH":
+                    out[-3:] = [(f"{instr}_SLOT_K", f"{a1} {a2} {arg}", origin)]
+        return out
+
+    # -------- interfaz pública ----------
+    def optimize(self) -> None:
+        rules = (
+            self.fold_constants,
+            self.constant_branches,
+            self.store_load_pairs,
+            self.fuse_compare_jumps,
+            self.invert_branches,
+            self.thread_jumps,
+            self.jumps_to_next,
+            self.unreachable,
+        )
+        changed = True
+        while changed:
+            before = self.code
+            for rule in rules:
+                self.code = rule(self.code)
+            changed = self.code != before
+        if self.use_superinstructions:
+            self.code = self.superinstructions(self.code)
+
+    def get_code(self) -> List[str]:
+        return [_format(entry) for entry in self.code]
+
+    def get_origins(self) -> List[Optional[int]]:
+        """Línea de IR de origen de cada instrucción de `get_code()`."""
+        return [entry[2] for entry in self.code]
+
+    @property
+    def removed(self) -> int:
+        return self.original_size - len(self.code)
+
+    def report(self) -> str:
+        return (f"peephole: {self.original_size} → {len(self.code)} instrucciones "
+                f"({self.removed} eliminadas)")
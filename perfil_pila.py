@@ -0,0 +1,105 @@
+"""
+Perfilador de la máquina de pila
+--------------------------------
+• Cuenta cuántas veces se ejecuta cada instrucción, cada opcode y cada
+  bloque `LABEL`, y el tiempo acumulado por bloque
+• Registra la profundidad máxima de la pila
+• Relaciona cada pc con la línea de IR que lo generó
+
+El simulador sólo lo usa con `StackMachineSimulator(code, profile=True)`:
+reemplaza la lista de instrucciones decodificadas por una que mide cada
+búsqueda (`program[pc]`), así el ciclo normal no paga nada.
+"""
+from __future__ import annotations
+from collections import Counter
+from time import perf_counter_ns
+from typing import List, Optional
+
+ENTRY_BLOCK = "<entrada>"
+
+
+class ProfiledProgram(list):
+    """Programa decodificado que cuenta y cronometra cada búsqueda."""
+
+    def __init__(self, program, stack, block_of: List[str]):
+        super().__init__(program)
+        self.stack = stack
+        self.block_of = block_of
+        self.counts = [0] * len(program)
+        self.block_time: Counter = Counter()
+        self.max_depth = 0
+        self._last_pc: Optional[int] = None
+        self._last_t = 0
+
+    def __getitem__(self, pc):
+        now = perf_counter_ns()
+        if self._last_pc is not None:
+            self.block_time[self.block_of[self._last_pc]] += now - self._last_t
+        self.counts[pc] += 1
+        depth = len(self.stack)
+        if depth > self.max_depth:
+            self.max_depth = depth
+        self._last_pc, self._last_t = pc, now
+        return list.__getitem__(self, pc)
+
+    def finish(self) -> None:
+        # cierra el tiempo de la última instrucción ejecutada
+        now = perf_counter_ns()
+        if self._last_pc is not None:
+            self.block_time[self.block_of[self._last_pc]] += now - self._last_t
+            self._last_pc = None
+        self.max_depth = max(self.max_depth, len(self.stack))
+
+
+class StackProfiler:
+    def __init__(self, code: List[str], program, stack):
+        # pc decodificado -> índice en el listado de texto y bloque que lo contiene
+        self.text_index: List[int] = []
+        self.block_of: List[str] = []
+        block = ENTRY_BLOCK
+        for i, line in enumerate(code):
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("LABEL "):
+                block = line.split()[1]
+                continue
+            self.text_index.append(i)
+            self.block_of.append(block)
+        self.code = code
+        self.program = ProfiledProgram(program, stack, self.block_of)
+
+    def report(self, ir: Optional[list] = None, line_map: Optional[List[Optional[int]]] = None) -> dict:
+        """
+        Reporte listo para serializar a JSON. `ir` es el IR optimizado y
+        `line_map[i]` la línea de IR de la i‑ésima instrucción del listado.
+        """
+        prog = self.program
+        prog.finish()
+
+        instructions = []
+        opcodes: Counter = Counter()
+        blocks: dict = {}
+        for pc, count in enumerate(prog.counts):
+            text = self.code[self.text_index[pc]].strip()
+            ir_line = line_map[self.text_index[pc]] if line_map is not None else None
+            entry = {"pc": pc, "instr": text, "count": count, "block": self.block_of[pc],
+                     "ir_line": ir_line}
+            if ir is not None and ir_line is not None:
+                entry["ir"] = str(ir[ir_line])
+            instructions.append(entry)
+            opcodes[text.split()[0]] += count
+
+            block = blocks.setdefault(self.block_of[pc], {"count": 0, "time_ns": 0})
+            if pc == 0 or self.block_of[pc - 1] != self.block_of[pc]:
+                block["count"] += count      # entradas = ejecuciones de su primera instrucción
+        for name, t in prog.block_time.items():
+            blocks[name]["time_ns"] = t
+
+        return {
+            "total_steps": sum(prog.counts),
+            "max_stack_depth": prog.max_depth,
+            "opcodes": dict(opcodes.most_common()),
+            "blocks": blocks,
+            "instructions": instructions,
+        }
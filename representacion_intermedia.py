@@ -1,41 +1,109 @@
 """
 Generador de Representación Intermedia (IR) para Parce‑Lang
 ----------------------------------------------------------
-• Usa Lark para parsear `che_rumba.lark`
-• Convierte el AST en código de 3‑direcciones (lista[str])
+• Usa Lark para parsear `che_rumba.lark` (parser perezoso, tablas cacheadas)
+• Convierte el AST en código de 3‑direcciones (lista[IRInstr]) sin recursión
+  y en tiempo lineal, aunque el programa tenga miles de niveles de anidamiento
+• `Paila`/`Andale` son saltos directos a las etiquetas del bucle que los
+  contiene (pila de bucles abiertos), sin instrucciones propias en la máquina
 • Retorna esa lista para que el optimizador la consuma
+• `split_statements` corta el fuente en sentencias de primer nivel para la
+  compilación incremental (cada una se parsea y traduce por separado)
 """
 
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Tuple, Union
 import itertools
+import re
 from lark import Lark, Transformer, Token
 from lark import Tree
+from ir_instrucciones import IRInstr, format_number, parse_number
 
 # ─────────────────────────  Cargar gramática  ──────────────────────────
 grammar_path = Path(__file__).with_name("che_rumba.lark")
-grammar = grammar_path.read_text(encoding="utf-8")
-parser = Lark(grammar, start="program", parser="lalr")
+# Tablas LALR serializadas por Lark; se regeneran si cambia la gramática
+parser_cache_path = Path(__file__).with_name("__pycache__") / "che_rumba.lark.cache"
+_parser = None
+
+
+def get_parser() -> Lark:
+    """Construye el parser en el primer uso (o lo carga desde la caché)."""
+    global _parser
+    if _parser is None:
+        grammar = grammar_path.read_text(encoding="utf-8")
+        try:
+            parser_cache_path.parent.mkdir(exist_ok=True)
+        except OSError:
+            pass        # sin caché en disco: Lark construye las tablas igual
+        _parser = Lark(grammar, start="program", parser="lalr",
+                       cache=str(parser_cache_path))
+    return _parser
+
+
+def __getattr__(name):
+    # Compatibilidad: `representacion_intermedia.parser` sigue existiendo
+    if name == "parser":
+        return get_parser()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ─────────────────────────  Transformer → IR  ──────────────────────────
-Code = List[str]
+# Los callbacks no concatenan listas: devuelven "cuerdas" (listas anidadas de
+# IRInstr) que referencian el código de sus hijos sin copiarlo. `flatten` las
+# aplana una sola vez al final, así generar el IR es lineal en el tamaño del
+# árbol aunque el programa esté muy anidado.
+Code = List[Union[IRInstr, "Code"]]
 Expr = Tuple[Code, str]          # (código acumulado, valor/temporal)
 
 class IRGenerator(Transformer):
-    def __init__(self):
-        self.tmp = itertools.count()
+    def __init__(self, first_temp: int = 0):
+        # temporales y etiquetas comparten numeración a partir de first_temp
+        self.tmp = itertools.count(first_temp)
+        # bucles abiertos: (etiqueta de Paila, etiqueta de Andale, nombres del bucle)
+        self.loops: List[Tuple[str, str, tuple]] = []
+        self.loop_targets = set()       # etiquetas usadas por Paila/Andale
+
+    def transform(self, tree: Tree):
+        """
+        Recorrido post-orden con pila explícita: mismo orden de callbacks que
+        `Transformer.transform`, pero sin recursión, para expresiones y bloques
+        con miles de niveles. Antes de bajar a los hijos de un nodo se llama
+        `enter_<regla>` si existe (los bucles reservan ahí sus etiquetas).
+        """
+        out: list = []
+        stack = [(tree, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if not isinstance(node, Tree):
+                out.append(node)                  # tokens: sin callbacks propios
+            elif not expanded:
+                enter = getattr(self, "enter_" + node.data, None)
+                if enter is not None:
+                    enter()
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(node.children))
+            else:
+                n = len(node.children)
+                children = out[len(out) - n:] if n else []
+                del out[len(out) - n:]
+                callback = getattr(self, node.data, None)
+                if callback is None:
+                    out.append(self.__default__(node.data, children, node.meta))
+                else:
+                    out.append(callback(children))
+        return out[0]
 
     def new_temp(self):
         return f"t{next(self.tmp)}"
 
     def import_stmt(self, items):
         archivo = items[0][1:-1]  # quita comillas
-        return [f'# Labura "{archivo}"']
+        return [IRInstr("comment", None, (f'Labura "{archivo}"',))]
 
 
     def number(self, items):
-        return [], items[0].value
+        # "3" queda int y "3.0"/"1e5" float: el tipo viaja en el texto del literal
+        return [], format_number(parse_number(items[0].value))
 
     def var(self, items):
         return [], items[0].value
@@ -45,18 +113,18 @@ class IRGenerator(Transformer):
         code_r, val_r = items[2]
         op_tok = items[1]
         t = self.new_temp()
-        code = code_l + code_r + [f"{t} = {val_l} {op_tok.value} {val_r}"]
+        code = [code_l, code_r, IRInstr.binop(t, val_l, op_tok.value, val_r)]
         return code, t
 
     def var_decl(self, items):
         name = items[0].value if isinstance(items[0], Token) else items[0]
         code_e, val = items[1]
-        return code_e + [f"{name} = {val}"]
+        return [code_e, IRInstr.assign(name, val)]
 
     def reassign(self, items):
         name = items[0].value if hasattr(items[0], 'value') else items[0]
         code_e, val = items[1]
-        return code_e + [f"{name} = {val}"]
+        return [code_e, IRInstr.assign(name, val)]
 
 
     def print_stmt(self, items):
@@ -64,14 +132,15 @@ class IRGenerator(Transformer):
         args_code, args_vals = [], []
         for e in items[1:]:
             c, v = e
-            args_code += c
+            args_code.append(c)
             args_vals.append(v)
-        return args_code + [f'print "{text}", ' + ", ".join(args_vals)]
+        args_code.append(IRInstr("print", None, (text, *args_vals)))
+        return args_code
 
     def guita_read(self, items):
         mensaje = items[0][1:-1]
         t = self.new_temp()
-        code = [f'{t} = GUITA "{mensaje}"']
+        code = [IRInstr("guita", t, (mensaje,))]
         return code, t
 
 
@@ -98,41 +167,41 @@ class IRGenerator(Transformer):
         code = []
         jump_labels = []
         for branch in items:
-            if hasattr(branch, "__len__") and len(branch) == 3:
+            if isinstance(branch, tuple):
                 # if o elif: (cond_code, cond_val, block_code)
                 cond_code, cond_val, block_code = branch
                 Lbranch = self.new_temp().replace("t", "L")
-                code += cond_code
-                code += [f"if {cond_val} goto {Lbranch}"]
+                code.append(cond_code)
+                code.append(IRInstr("if", None, (cond_val, Lbranch)))
                 # Si la condición no se cumple, sigue al próximo branch
                 jump_labels.append(Lbranch)
                 continue
             # else: solo bloque de código
-            else_block = branch
             Lelse = self.new_temp().replace("t", "L")
             jump_labels.append(Lelse)
-            code += [f"goto {Lelse}"]
+            code.append(IRInstr.goto(Lelse))
+        if not jump_labels or isinstance(items[-1], tuple):
+            # sin Orale: si ninguna condición se cumple, se saltea la cadena
+            code.append(IRInstr.goto(Lend))
 
         # Ahora pega los bloques reales
         for branch, Lbranch in zip(items, jump_labels):
-            if hasattr(branch, "__len__") and len(branch) == 3:
+            if isinstance(branch, tuple):
                 # if o elif
                 _, _, block_code = branch
-                code += [f"{Lbranch}:"] + block_code + [f"goto {Lend}"]
+                code += [IRInstr.label(Lbranch), block_code, IRInstr.goto(Lend)]
             else:
                 # else
-                code += [f"{Lbranch}:"] + branch
-        code += [f"{Lend}:"]
+                code += [IRInstr.label(Lbranch), branch]
+        code.append(IRInstr.label(Lend))
         return code
 
     def block(self, stmts):
         code = []
         for s in stmts:
             if isinstance(s, tuple) and len(s) == 2:
-                code += s[0]
-            elif isinstance(s, list):
-                code += s
-            elif isinstance(s, str):
+                code.append(s[0])
+            elif isinstance(s, (list, IRInstr)):
                 code.append(s)
             elif isinstance(s, Tree):
                 # Puede loguear o ignorar, pero no sumar
@@ -143,126 +212,207 @@ class IRGenerator(Transformer):
 
 
     def program(self, children):
-        code = []
-        for stmt in children:
-            if isinstance(stmt, list):
-                code.extend(stmt)
-            else:
-                code.append(stmt)
-        return code
+        return list(children)
+
     def true(self, items):
         return [], "1"
 
     def false(self, items):
         return [], "0"
 
+    # -------- Paila / Andale ----------
+    # Cada bucle reserva sus etiquetas al entrar (antes de traducir el cuerpo)
+    # y las apila; Paila y Andale son un goto directo a las del bucle más
+    # cercano, sin instrucciones especiales en la máquina.
+    def _loop_jump(self, index: int, keyword: str):
+        if not self.loops:
+            raise SyntaxError(f"`{keyword}` fuera de un bucle")
+        label = self.loops[-1][index]
+        self.loop_targets.add(label)
+        return [IRInstr.goto(label)]
+
     def break_stmt(self, items):
-        return ["BREAK"]
+        return self._loop_jump(0, "Paila")
 
     def continue_stmt(self, items):
-        return ["CONTINUE"]
+        return self._loop_jump(1, "Andale")
 
     def return_stmt(self, items):
         if items:
             code_e, val = items[0]
-            return code_e + [f"RETURN {val}"]
+            return [code_e, IRInstr("return", None, (val,))]
         else:
-            return ["RETURN"]
+            return [IRInstr("return")]
 
-    def for_stmt(self, items):
-        var = items[0].value if hasattr(items[0], 'value') else items[0]
-        times = items[1][1] if isinstance(items[1], tuple) else items[1]
-        block_code = items[2]
+    def enter_for_stmt(self):
         Lstart = self.new_temp().replace("t", "L")
         Lcond = self.new_temp().replace("t", "L")
         Lend  = self.new_temp().replace("t", "L")
         t_iter = self.new_temp()
-        code = [
-            f"{t_iter} = 0",
-            f"{Lstart}:",
-            f"if {t_iter} >= {times} goto {Lend}",
-            f"{var} = {t_iter}",
-        ]
-        code += block_code
-        code += [
-            f"{t_iter} = {t_iter} + 1",
-            f"goto {Lstart}",
-            f"{Lend}:"
+        self.loops.append((Lend, Lcond, (Lstart, Lcond, Lend, t_iter)))
+
+    def for_stmt(self, items):
+        var = items[0].value if hasattr(items[0], 'value') else items[0]
+        times = items[1][1] if isinstance(items[1], tuple) else items[1]
+        block_code = items[2]
+        _, _, (Lstart, Lcond, Lend, t_iter) = self.loops.pop()
+        # Andale salta al incremento; la etiqueta sólo aparece si se usa
+        step = [IRInstr.label(Lcond)] if Lcond in self.loop_targets else []
+        return [
+            IRInstr.assign(t_iter, "0"),
+            IRInstr.label(Lstart),
+            IRInstr("ifcmp", None, (t_iter, ">=", format_number(parse_number(str(times))), Lend)),
+            IRInstr.assign(var, t_iter),
+            block_code,
+            step,
+            IRInstr.binop(t_iter, t_iter, "+", "1"),
+            IRInstr.goto(Lstart),
+            IRInstr.label(Lend),
         ]
-        return code
 
 
 
-    def while_stmt(self, items):
-        cond_code, cond_val = items[0]
-        block_code = items[1]
+    def enter_while_stmt(self):
         Lstart = self.new_temp().replace("t", "L")
         Lbody = self.new_temp().replace("t", "L")
         Lend  = self.new_temp().replace("t", "L")
-        return (
-            [f"{Lstart}:"] +
-            cond_code +
-            [f"if {cond_val} goto {Lbody}",
-            f"goto {Lend}",
-            f"{Lbody}:"] +
-            block_code +
-            [f"goto {Lstart}",
-            f"{Lend}:"]
-        )
+        # Andale vuelve a evaluar la condición
+        self.loops.append((Lend, Lstart, (Lstart, Lbody, Lend)))
+
+    def while_stmt(self, items):
+        cond_code, cond_val = items[0]
+        block_code = items[1]
+        _, _, (Lstart, Lbody, Lend) = self.loops.pop()
+        return [
+            IRInstr.label(Lstart),
+            cond_code,
+            IRInstr("if", None, (cond_val, Lbody)),
+            IRInstr.goto(Lend),
+            IRInstr.label(Lbody),
+            block_code,
+            IRInstr.goto(Lstart),
+            IRInstr.label(Lend),
+        ]
 
 
     
-    def dowhile_stmt(self, items):
-        block_code = items[0]              # el bloque { ... }
-        cond_code, cond_val = items[1]     # la condición tras Rumba (expr)
+    def enter_dowhile_stmt(self):
         Lstart = self.new_temp().replace("t", "L")
         Lcond = self.new_temp().replace("t", "L")
         Lend = self.new_temp().replace("t", "L")
+        self.loops.append((Lend, Lcond, (Lstart, Lcond, Lend)))
+
+    def dowhile_stmt(self, items):
+        block_code = items[0]              # el bloque { ... }
+        cond_code, cond_val = items[1]     # la condición tras Rumba (expr)
+        _, _, (Lstart, Lcond, Lend) = self.loops.pop()
         # IR:
         # Lstart: block_code
         # Lcond:  cond_code
         #         if cond_val goto Lstart
         #         goto Lend
         # Lend:
-        return (
-            [f"{Lstart}:"] +
-            block_code +
-            [f"{Lcond}:"] +
-            cond_code +
-            [f"if {cond_val} goto {Lstart}",
-            f"{Lend}:"]
-        )
+        return [
+            IRInstr.label(Lstart),
+            block_code,
+            IRInstr.label(Lcond),
+            cond_code,
+            IRInstr("if", None, (cond_val, Lstart)),
+            IRInstr.label(Lend),
+        ]
 
     
-def flatten_and_str(code):
+def flatten(code) -> List[IRInstr]:
+    """Aplana la cuerda de IR en orden, con una pila de iteradores (sin recursión)."""
     result = []
-    for c in code:
-        if isinstance(c, list) or isinstance(c, tuple):
-            result.extend(flatten_and_str(c))
-        elif isinstance(c, str):
-            result.append(str(c))
-        elif isinstance(c, Tree):
-            print(f"[WARN] flatten_and_str(): Tree no esperado: {c.data if hasattr(c, 'data') else c}")
+    stack = [iter(code)]
+    while stack:
+        for c in stack[-1]:
+            if isinstance(c, IRInstr):
+                result.append(c)
+            elif isinstance(c, (list, tuple)):
+                stack.append(iter(c))
+                break
+            elif isinstance(c, Tree):
+                print(f"[WARN] flatten(): Tree no esperado: {c.data if hasattr(c, 'data') else c}")
+            else:
+                print(f"[WARN] flatten(): tipo no esperado {type(c)}: {c}")
         else:
-            print(f"[WARN] flatten_and_str(): tipo no esperado {type(c)}: {c}")
+            stack.pop()
     return result
 
 
-def parse_and_generate_ir(source_code: str) -> list:
-    tree = parser.parse(source_code)
-    gen = IRGenerator()
-    ir_code = gen.transform(tree)
-    ir_code = flatten_and_str(ir_code)
-    return ir_code
+def parse(source_code: str) -> Tree:
+    return get_parser().parse(source_code)
 
 
-def parse_and_generate_ir(source_code: str) -> list:
-    tree = parser.parse(source_code)
+def generate_ir(tree: Tree) -> List[IRInstr]:
     gen = IRGenerator()
     ir_code = gen.transform(tree)
-    ir_code = flatten_and_str(ir_code)
+    ir_code = flatten(ir_code)
     return ir_code
 
 
+def parse_and_generate_ir(source_code: str) -> List[IRInstr]:
+    return generate_ir(parse(source_code))
+
+
+# ─────────────────────  Sentencias de primer nivel  ─────────────────────
+# Escáner mínimo con los mismos tokens que la gramática: alcanza para saber
+# dónde empieza cada sentencia sin construir el árbol.
+_token_re = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<string>"(?:\\.|[^"\\])*")
+  | (?P<comment>Che[^\n]*)
+  | (?P<ident>[A-Za-z_]\w*)
+  | (?P<number>\d+(?:\.\d*)?(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)
+  | (?P<punct>==|!=|>=|<=|.)
+''', re.VERBOSE | re.DOTALL)
+
+_STATEMENT_KEYWORDS = frozenset((
+    "Parce", "Quilombo", "Pilas", "Boliche", "Rumba", "Previa",
+    "Paila", "Labura", "Andale", "Volve", "Pues",
+))
+
+
+def split_statements(source_code: str) -> List[str]:
+    """
+    Corta el programa en sus sentencias de primer nivel (texto sin espacios
+    de borde). `Orale …` sigue al `Pues` anterior y el `Rumba (…)` que cierra
+    un `Previa { … }` pertenece a esa sentencia.
+    """
+    tokens = [(m.lastgroup, m.group(), m.start()) for m in _token_re.finditer(source_code)
+              if m.lastgroup not in ("ws", "comment")]
+    starts: List[int] = []
+    depth = 0
+    in_previa = False        # sentencia actual: Previa { … } todavía sin su Rumba
+    for i, (kind, text, pos) in enumerate(tokens):
+        if depth == 0:
+            prev = tokens[i - 1][1] if i else None
+            nxt = tokens[i + 1][1] if i + 1 < len(tokens) else None
+            if text == "Rumba" and in_previa:
+                in_previa = False
+            elif kind == "ident" and (text in _STATEMENT_KEYWORDS
+                                      or (nxt == "=" and prev != "Parce")):
+                starts.append(pos)
+                in_previa = text == "Previa"
+        if text in "({":
+            depth += 1
+        elif text in ")}":
+            depth -= 1
+    if not starts:
+        return []
+    starts[0] = 0            # comentarios iniciales van con la primera sentencia
+    bounds = starts + [len(source_code)]
+    return [source_code[a:b].strip() for a, b in zip(bounds, bounds[1:])]
+
+
+def generate_ir_fragment(source_code: str, first_temp: int) -> Tuple[List[IRInstr], int]:
+    """IR de un fragmento con temporales desde `first_temp`; devuelve (ir, próximo número)."""
+    gen = IRGenerator(first_temp)
+    ir_code = flatten(gen.transform(parse(source_code)))
+    return ir_code, next(gen.tmp)
+
+
 
 
@@ -0,0 +1,128 @@
+"""
+Destinos de salida para PRINT
+-----------------------------
+El simulador escribe cada línea con `output.write(texto)`:
+• MemoryOutput — junta los fragmentos en una lista y los une al final
+• StreamOutput — buffer acotado sobre un stream de texto (terminal, archivo)
+• FileOutput   — StreamOutput sobre un archivo propio (modo streaming)
+• TeeOutput    — escribe en varios destinos a la vez
+
+Los destinos con buffer vuelcan cada `max_chunks` fragmentos o cuando pasaron
+`max_delay` segundos desde el último volcado, así la memoria no crece con la
+longitud de la salida y un programa largo va dejando su salida en disco. El
+simulador llama a `flush()` antes de cada GUITA (para que se vea el mensaje)
+y al terminar, también si se interrumpe: queda el archivo parcial.
+"""
+from __future__ import annotations
+from pathlib import Path
+from time import monotonic
+from typing import List
+
+DEFAULT_MAX_CHUNKS = 4096
+DEFAULT_MAX_DELAY = 1.0      # segundos
+
+
+class OutputSink:
+    def write(self, text: str) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MemoryOutput(OutputSink):
+    def __init__(self):
+        self._chunks: List[str] = []
+        self.write = self._chunks.append     # sin llamada a método por PRINT
+
+    def getvalue(self) -> str:
+        return "".join(self._chunks)
+
+
+class StreamOutput(OutputSink):
+    def __init__(self, stream, max_chunks: int = DEFAULT_MAX_CHUNKS,
+                 max_delay: float = DEFAULT_MAX_DELAY):
+        self.stream = stream
+        self.max_chunks = max_chunks
+        self.max_delay = max_delay
+        self._chunks: List[str] = []
+        self._last_flush = monotonic()
+
+    def write(self, text: str) -> None:
+        chunks = self._chunks
+        chunks.append(text)
+        if len(chunks) >= self.max_chunks or monotonic() - self._last_flush >= self.max_delay:
+            self.flush()
+
+    def _emit(self, text: str) -> None:
+        self.stream.write(text)
+
+    def flush(self) -> None:
+        if self._chunks:
+            self._emit("".join(self._chunks))
+            self._chunks.clear()
+        self.stream.flush()
+        self._last_flush = monotonic()
+
+
+class FileOutput(StreamOutput):
+    """
+    Con strip=True el archivo queda igual que `MemoryOutput.getvalue().strip()`:
+    se descarta el espacio inicial y el espacio final se retiene hasta saber
+    si le sigue más texto.
+    """
+
+    def __init__(self, path: Path | str, max_chunks: int = DEFAULT_MAX_CHUNKS,
+                 max_delay: float = DEFAULT_MAX_DELAY, strip: bool = False):
+        super().__init__(open(path, "w", encoding="utf-8"), max_chunks, max_delay)
+        self.strip = strip
+        self._started = False
+        self._pending = ""
+
+    def _emit(self, text: str) -> None:
+        if not self.strip:
+            self.stream.write(text)
+            return
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return
+            self._started = True
+        body = text.rstrip()
+        if not body:
+            self._pending += text
+            return
+        self.stream.write(self._pending + body)
+        self._pending = text[len(body):]
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self.stream.close()
+
+
+class TeeOutput(OutputSink):
+    def __init__(self, *sinks: OutputSink):
+        self.sinks = sinks
+
+    def write(self, text: str) -> None:
+        for sink in self.sinks:
+            sink.write(text)
+
+    def flush(self) -> None:
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
@@ -1,139 +1,388 @@
-class BreakLoop(Exception): pass
-class ContinueLoop(Exception): pass
-class ReturnValue(Exception):
-    def __init__(self, value):
-        self.value = value
+from time import monotonic
+import operator
+import sys
+
+from perfil_pila import StackProfiler
+from entrada_pila import default_input
+from ir_instrucciones import parse_number
+from salida_pila import StreamOutput
+
+class ExecutionLimitExceeded(RuntimeError):
+    """La ejecución superó un límite (pasos, tiempo o profundidad de pila)."""
+
+    def __init__(self, limit, pc, steps):
+        super().__init__(f"Límite de ejecución excedido ({limit}) en pc={pc} tras {steps} pasos")
+        self.limit = limit
+        self.pc = pc
+        self.steps = steps
+
+
+# ---- opcodes decodificados ----
+# El texto de `codigo_maquina.txt` se decodifica una sola vez a tuplas
+# (opcode, operando). Las etiquetas desaparecen y los saltos quedan
+# apuntando directamente al índice de la instrucción destino.
+(
+    OP_PUSH, OP_LOAD, OP_STORE, OP_LOAD_SLOT, OP_STORE_SLOT, OP_GUITA,
+    OP_BINOP, OP_JNZ, OP_JMP, OP_JCMP,
+    OP_PRINT, OP_PRINT_TEXT,
+    OP_RETURN,
+    # superinstrucciones
+    OP_INC_SLOT, OP_COPY_SLOT, OP_JCMP_SLOT_K,
+    # aritmética entera (operandos int garantizados por ir_tipos)
+    OP_ADD_I, OP_SUB_I, OP_MUL_I,
+) = range(19)
+
+
+def _gt(a, b): return 1 if a > b else 0
+def _lt(a, b): return 1 if a < b else 0
+def _ge(a, b): return 1 if a >= b else 0
+def _le(a, b): return 1 if a <= b else 0
+def _eq(a, b): return 1 if a == b else 0
+def _ne(a, b): return 1 if a != b else 0
+def _div(a, b): return a / b if b != 0 else float("inf")
+
+BINOPS = {
+    "ADD": lambda a, b: a + b,
+    "SUB": lambda a, b: a - b,
+    "MUL": lambda a, b: a * b,
+    "DIV": _div,
+    "GT": _gt, "LT": _lt, "GE": _ge, "LE": _le, "EQ": _eq, "NE": _ne,
+}
+
+# Versiones enteras: se ejecutan en línea, sin llamar a una función por operación
+INT_BINOPS = {"ADD_I": BINOPS["ADD"], "SUB_I": BINOPS["SUB"], "MUL_I": BINOPS["MUL"]}
+_INT_OPCODES = {"ADD_I": OP_ADD_I, "SUB_I": OP_SUB_I, "MUL_I": OP_MUL_I}
+
+# Comparación + salto fusionados (los emite peephole_pila)
+CMP_JUMPS = {
+    "JGT": operator.gt, "JLT": operator.lt, "JGE": operator.ge,
+    "JLE": operator.le, "JEQ": operator.eq, "JNE": operator.ne,
+}
+
+# Paila y Andale no tienen opcode: el generador de IR los baja a saltos
+_SIMPLE_OPS = {
+    "RETURN": OP_RETURN,
+}
+
+
+def _unquote(text):
+    if text.startswith('"') and text.endswith('"'):
+        return text[1:-1]
+    return text
+
+
+def _parse_slot(arg, slot_names):
+    # "3 numero" -> 3, registrando el nombre para depuración
+    parts = arg.split()
+    slot = int(parts[0])
+    if slot >= len(slot_names):
+        slot_names.extend([None] * (slot + 1 - len(slot_names)))
+    if len(parts) > 1:
+        slot_names[slot] = parts[1]
+    return slot
+
+
+def _number(text, line):
+    # Las constantes se convierten una sola vez, conservando int o float
+    val = parse_number(text)
+    if val is None:
+        raise RuntimeError(f"Constante inválida: {line}")
+    return val
+
+
+def _jump_target(label, labels, line):
+    if label not in labels:
+        raise RuntimeError(f"Etiqueta desconocida: {line}")
+    return labels[label]
+
+
+def decode(code):
+    """
+    Convierte la lista de instrucciones en texto a una lista de tuplas
+    (opcode, operando) lista para ejecutar.
+    Devuelve (programa, labels, slot_names) donde labels mapea
+    etiqueta -> índice y slot_names[i] es el nombre de la variable del slot i.
+    """
+    lines = [line.strip() for line in code]
+    lines = [line for line in lines if line]
+
+    # ---- primera pasada: posición final de cada etiqueta ----
+    labels = {}
+    idx = 0
+    for line in lines:
+        if line.startswith("LABEL "):
+            labels[line.split()[1]] = idx
+        else:
+            idx += 1
+
+    # ---- segunda pasada: decodificación ----
+    program = []
+    slot_names = []
+    for line in lines:
+        parts = line.split(maxsplit=1)
+        instr = parts[0]
+        arg = parts[1] if len(parts) == 2 else None
+
+        if instr == "LABEL":
+            continue
+        elif instr == "PUSH":
+            program.append((OP_PUSH, _number(arg, line)))
+        elif instr == "LOAD_SLOT":
+            program.append((OP_LOAD_SLOT, _parse_slot(arg, slot_names)))
+        elif instr == "STORE_SLOT":
+            program.append((OP_STORE_SLOT, _parse_slot(arg, slot_names)))
+        elif instr == "LOAD":
+            program.append((OP_LOAD, arg))
+        elif instr == "STORE":
+            program.append((OP_STORE, arg))
+        elif instr in _INT_OPCODES:
+            program.append((_INT_OPCODES[instr], None))
+        elif instr in BINOPS:
+            program.append((OP_BINOP, BINOPS[instr]))
+        elif instr in ("JNZ", "JMP"):
+            program.append((OP_JNZ if instr == "JNZ" else OP_JMP,
+                            _jump_target(arg, labels, line)))
+        elif instr in CMP_JUMPS:
+            program.append((OP_JCMP, (CMP_JUMPS[instr], _jump_target(arg, labels, line))))
+
+        # --- superinstrucciones ---
+        elif instr == "INC_SLOT":
+            slot, name, k = arg.split()
+            program.append((OP_INC_SLOT, (_parse_slot(f"{slot} {name}", slot_names), _number(k, line))))
+        elif instr == "COPY_SLOT":
+            src, src_name, dst, dst_name = arg.split()
+            program.append((OP_COPY_SLOT, (_parse_slot(f"{src} {src_name}", slot_names),
+                                           _parse_slot(f"{dst} {dst_name}", slot_names))))
+        elif instr.endswith("_SLOT_K") and instr[:-7] in CMP_JUMPS:
+            slot, name, k, label = arg.split()
+            program.append((OP_JCMP_SLOT_K, (CMP_JUMPS[instr[:-7]],
+                                             _parse_slot(f"{slot} {name}", slot_names),
+                                             _number(k, line), _jump_target(label, labels, line))))
+        elif instr == "GUITA":
+            program.append((OP_GUITA, _unquote(arg) if arg is not None else None))
+        elif instr == "PRINT":
+            if arg is None:
+                program.append((OP_PRINT, None))
+            else:
+                program.append((OP_PRINT_TEXT, arg.strip('"')))
+        elif instr in _SIMPLE_OPS:
+            program.append((_SIMPLE_OPS[instr], None))
+        else:
+            raise RuntimeError(f"Instr. desconocida: {line}")
+
+    return program, labels, slot_names
+
 
 class StackMachineSimulator:
     """
     Ejecuta el código generado por StackMachineCodeGenerator.
     Instrucciones admitidas:
       PUSH n, LOAD x, STORE x,
+      LOAD_SLOT i [x], STORE_SLOT i [x]  (variable en el slot i),
       ADD SUB MUL DIV,
+      ADD_I SUB_I MUL_I            (operandos enteros),
       GT LT GE LE EQ NE,
       JNZ lbl, JMP lbl,
+      JGT JLT JGE JLE JEQ JNE lbl  (compara los dos topes y salta),
+      INC_SLOT i x k               (slot i += k),
+      COPY_SLOT i x j y            (slot j = slot i),
+      JGT_SLOT_K … JNE_SLOT_K i x k lbl  (compara slot i con k y salta),
       LABEL lbl,
+      RETURN  (termina la ejecución; el tope queda en `return_value`)
       PRINT  (imprime tope de pila)
       PRINT "texto fijo"
+    El texto se decodifica una vez al construir el simulador (ver `decode`).
+    `code` también puede ser un bytecode binario ya abierto (ver bytecode_pila):
+    se decodifica directo del archivo mapeado, sin pasar por el texto.
+    Con profile=True, `self.profiler` cuenta y cronometra la ejecución.
+    GUITA lee de `input_provider` (ver entrada_pila); por defecto, de stdin.
+    PRINT escribe en `output` (ver salida_pila); por defecto, en sys.stdout.
+
+    Límites opcionales: `max_steps` instrucciones, `timeout` segundos y
+    `max_stack` elementos en la pila; al superarlos se levanta
+    ExecutionLimitExceeded. Se controlan en los saltos (tomados o no), antes
+    de cada GUITA y al terminar, así el ciclo principal no paga nada por
+    instrucción y `self.steps` sigue siendo exacto.
     """
 
-    def __init__(self, code):
+    def __init__(self, code, profile=False, input_provider=None, output=None,
+                 max_steps=None, timeout=None, max_stack=None):
         self.code = code
+        self.max_steps = max_steps
+        self.timeout = timeout
+        self.max_stack = max_stack
+        self.steps = None     # instrucciones ejecutadas (sólo con límites)
+        self.input = input_provider   # se elige al primer GUITA si es None
+        self.output = output          # se elige al ejecutar si es None
         self.stack = []
-        self.vars = {}
-        self.labels = self._map_labels()
-        self.pc = 0          # program counter
-
-    # ---- fase de búsqueda de etiquetas ----
-    def _map_labels(self):
-        labels = {}
-        for idx, line in enumerate(self.code):
-            if line.startswith("LABEL "):
-                lbl = line.split()[1]
-                labels[lbl] = idx
-        return labels
-
-    # ---- helpers stack / ops ----
-    def _binop(self, fn):
-        b = self.stack.pop()
-        a = self.stack.pop()
-        self.stack.append(fn(a, b))
+        self.named = {}      # variables accedidas por nombre (LOAD/STORE)
+        self.return_value = None
+        binary = hasattr(code, "listing")
+        self.program, self.labels, self.slot_names = code.decode() if binary else decode(code)
+        self.slots = [0] * len(self.slot_names)
+        self.pc = 0          # program counter (índice en self.program)
+        self.profiler = None
+        if profile:
+            self.profiler = StackProfiler(code.listing() if binary else code,
+                                          self.program, self.stack)
+            self.program = self.profiler.program
+
+    @property
+    def vars(self):
+        """Valores finales por nombre de variable (para depuración)."""
+        result = dict(self.named)
+        for i, name in enumerate(self.slot_names):
+            result[name if name is not None else f"slot{i}"] = self.slots[i]
+        return result
+
+    # ---- GUITA ----
+    def _read_input(self, mensaje):
+        if self.input is None:
+            self.input = default_input()
+        out = self.output
+        out.write(mensaje + " " if mensaje is not None else "Ingrese un valor: ")
+        out.flush()
+        val = self.input.read()
+        out.write("\n")
+        # Conversión automática:
+        try:
+            return int(val)
+        except ValueError:
+            try:
+                return float(val)
+            except ValueError:
+                return val
+
+    # ---- límites de ejecución ----
+    @property
+    def limited(self):
+        return self.max_steps is not None or self.timeout is not None or self.max_stack is not None
+
+    def _charge(self, pc, target):
+        # Se llama en cada salto: suma el tramo lineal recién ejecutado
+        self.steps += pc - self._run_start
+        self._run_start = pc
+        self._check_limits(pc)
+        self._run_start = target
+
+    def _check_limits(self, pc):
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise ExecutionLimitExceeded(f"pasos > {self.max_steps}", pc - 1, self.steps)
+        if self.max_stack is not None and len(self.stack) > self.max_stack:
+            raise ExecutionLimitExceeded(f"pila > {self.max_stack}", pc - 1, self.steps)
+        if self._deadline is not None and monotonic() > self._deadline:
+            raise ExecutionLimitExceeded(f"tiempo > {self.timeout} s", pc - 1, self.steps)
 
     # ---- ciclo principal ----
     def run(self):
-        while self.pc < len(self.code):
-            line = self.code[self.pc].strip()
-            parts = line.split(maxsplit=1)
-            instr = parts[0]
+        program = self.program
+        stack = self.stack
+        push = stack.append
+        pop = stack.pop
+        slots = self.slots
+        variables = self.named
+        n = len(program)
+        pc = self.pc
+        if self.output is None:
+            self.output = StreamOutput(sys.stdout)
+        write = self.output.write
+        limited = self.limited
+        if limited:
+            self.steps = self.steps or 0
+            self._run_start = pc
+            self._deadline = monotonic() + self.timeout if self.timeout is not None else None
+        charge = self._charge
+
+        try:
+            while pc < n:
+                # (el perfilador se engancha en esta búsqueda: program[pc])
+                op, arg = program[pc]
+                pc += 1
 
-            match instr:
                 # --- pila y memoria ---
-                case "PUSH":
-                    self.stack.append(float(parts[1]))
-                case "LOAD":
-                    self.stack.append(self.vars.get(parts[1], 0.0))
-                case "STORE":
-                    self.vars[parts[1]] = self.stack.pop()
-                
-                case "GUITA":
-                    # Si partes viene como ['GUITA', '"ingresa el numero 0:"']
-                    if len(parts) == 2:
-                        mensaje = parts[1]
-                        # Elimina comillas, si están
-                        if mensaje.startswith('"') and mensaje.endswith('"'):
-                            mensaje = mensaje[1:-1]
-                        val = input(mensaje + " ")
-                        print()
-                    else:
-                        val = input("Ingrese un valor: ")
-                        print()
-                    # Conversión automática:
-                    try:
-                        val = int(val)
-                    except ValueError:
-                        try:
-                            val = float(val)
-                        except ValueError:
-                            pass
-                    self.stack.append(val)
-
-
-                # --- aritmética ---
-                case "ADD": self._binop(lambda a, b: a + b)
-                case "SUB": self._binop(lambda a, b: a - b)
-                case "MUL": self._binop(lambda a, b: a * b)
-                case "DIV": self._binop(lambda a, b: a / b if b != 0 else float("inf"))
-
-                # --- comparaciones (devuelven 1 ó 0) ---
-                case "GT":  self._binop(lambda a, b: 1.0 if a >  b else 0.0)
-                case "LT":  self._binop(lambda a, b: 1.0 if a <  b else 0.0)
-                case "GE":  self._binop(lambda a, b: 1.0 if a >= b else 0.0)
-                case "LE":  self._binop(lambda a, b: 1.0 if a <= b else 0.0)
-                case "EQ":  self._binop(lambda a, b: 1.0 if a == b else 0.0)
-                case "NE":  self._binop(lambda a, b: 1.0 if a != b else 0.0)
+                if op == OP_LOAD_SLOT:
+                    push(slots[arg])
+                elif op == OP_STORE_SLOT:
+                    slots[arg] = pop()
+                elif op == OP_LOAD:
+                    push(variables.get(arg, 0))
+                elif op == OP_STORE:
+                    variables[arg] = pop()
+                elif op == OP_PUSH:
+                    push(arg)
 
-                # --- saltos ---
-                case "JNZ":
-                    val = self.stack.pop()
-                    if val != 0:
-                        self.pc = self.labels[parts[1]]
-                        continue
-                case "JMP":
-                    self.pc = self.labels[parts[1]]
-                    continue
-                case "LABEL":
-                    pass  # ya fueron mapeadas
-
-                case "BREAK":
-                    # salta fuera del bucle actual (puede ser usando excepciones en Python)
-                    raise BreakLoop()
-
-                case "CONTINUE":
-                    raise ContinueLoop()
-
-                case "RETURN":
-                    # toma valor y lo retorna
-                    ret_val = self.stack.pop()
-                    raise ReturnValue(ret_val)
+                # --- superinstrucciones ---
+                elif op == OP_JCMP_SLOT_K:
+                    if arg[0](slots[arg[1]], arg[2]):
+                        if limited:
+                            charge(pc, arg[3])
+                        pc = arg[3]
+                    elif limited:
+                        charge(pc, pc)
+                elif op == OP_INC_SLOT:
+                    slots[arg[0]] += arg[1]
+                elif op == OP_COPY_SLOT:
+                    slots[arg[1]] = slots[arg[0]]
 
+                # --- aritmética y comparaciones ---
+                elif op == OP_ADD_I:
+                    b = pop()
+                    push(pop() + b)
+                elif op == OP_SUB_I:
+                    b = pop()
+                    push(pop() - b)
+                elif op == OP_MUL_I:
+                    b = pop()
+                    push(pop() * b)
+                elif op == OP_BINOP:
+                    b = pop()
+                    push(arg(pop(), b))
+
+                # --- saltos ---
+                elif op == OP_JNZ:
+                    if pop() != 0:
+                        if limited:
+                            charge(pc, arg)
+                        pc = arg
+                    elif limited:
+                        charge(pc, pc)
+                elif op == OP_JCMP:
+                    b = pop()
+                    if arg[0](pop(), b):
+                        if limited:
+                            charge(pc, arg[1])
+                        pc = arg[1]
+                    elif limited:
+                        charge(pc, pc)
+                elif op == OP_JMP:
+                    if limited:
+                        charge(pc, arg)
+                    pc = arg
 
                 # --- salida ---
-                case "PRINT":
-                    if len(parts) == 2:
-                        # PRINT "texto fijo"
-                        print(parts[1].strip('"'), end=" ")
-                        print()
+                elif op == OP_PRINT_TEXT:
+                    write(arg + " \n")
+                elif op == OP_PRINT:
+                    if stack:
+                        write(f"{pop()} \n")
                     else:
-                        # PRINT valor de la pila
-                        if self.stack:
-                            print(self.stack.pop(), end=" ")
-                            print()
-                        else:
-                            print("[WARN] PRINT intentó hacer pop en pila vacía")
-
+                        print("[WARN] PRINT intentó hacer pop en pila vacía", file=sys.stderr)
 
-                # --- desconocido ---
-                case _:
-                    raise RuntimeError(f"Instr. desconocida: {line}")
+                elif op == OP_GUITA:
+                    if limited:
+                        charge(pc, pc)      # no esperar entrada con el presupuesto agotado
+                    push(self._read_input(arg))
 
-            self.pc += 1
+                elif op == OP_RETURN:
+                    # Volve: termina el programa con el valor del tope
+                    self.return_value = pop() if stack else None
+                    break
+        finally:
+            self.pc = pc
+            if limited:
+                self.steps += pc - self._run_start
+                self._run_start = pc
+            self.output.flush()
+        # código sin saltos: el último tramo también cuenta
+        if limited:
+            self._check_limits(pc)
@@ -1,125 +1,100 @@
-import re
+from ir_instrucciones import as_instrs, parse_number
+from ir_tipos import infer_types, is_int
 
 class StackMachineCodeGenerator:
     def __init__(self, ir_code):
-        self.ir_code = ir_code
+        self.ir_code = as_instrs(ir_code)   # acepta IRInstr o texto
         self.output = []
-        self.vars = set()
+        self.slots = {}          # nombre -> índice de slot en la máquina
+        self.origins = []        # línea de IR que generó cada instrucción
+        self.types = infer_types(self.ir_code)   # nombre -> int / float / any
         
     def generate(self):
-        assign_re = re.compile(r'(\w+)\s*=\s*(.+)')
-        if_goto_op_re = re.compile(r'if\s+(\w+)\s*([<>=!]+)\s*(\w+)\s+goto\s+(\w+)')
-        if_goto_re = re.compile(r'if\s+(\w+)\s+goto\s+(\w+)')
-        goto_re = re.compile(r'goto\s+(\w+)')
-        label_re = re.compile(r'(\w+):')
-        print_re = re.compile(r'print\s+"([^"]*)"(?:,\s*(.*))?')
-
-        for line in self.ir_code:
-            line = line.strip()
-            
-            # t0 = GUITA "mensaje"
-            m_guita = re.match(r'(\w+)\s*=\s*GUITA\s+"([^"]*)"', line)
-            if m_guita:
-                var, mensaje = m_guita.group(1), m_guita.group(2)
-                self.output.append(f'GUITA "{mensaje}"')
-                self.output.append(f'STORE {var}')
-                continue
-
-            # Asignación simple o con operación: t0 = cont > 3
-            m = assign_re.match(line)
-            if m:
-                var, expr = m.group(1), m.group(2)
-                # detectar expresión binaria simple
-                tokens = expr.split()
-                if len(tokens) == 3:
-                    left, op, right = tokens
-                    # Generar código para binario:
-                    self.emit_load_operand(left)
-                    self.emit_load_operand(right)
-                    self.emit_op(op)
-                    self.output.append(f"STORE {var}")
-                else:
-                    # asignación simple: var = valor o var = var
-                    self.emit_load_operand(expr)
-                    self.output.append(f"STORE {var}")
-                continue
-
-            # if t0 >= 5 goto L1
-            m = if_goto_op_re.match(line)
-            if m:
-                left, op, right, label = m.groups()
-                self.emit_load_operand(left)
-                self.emit_load_operand(right)
-                self.emit_op(op)
-                self.output.append(f"JNZ {label}")
-                continue
-
-            # if t0 goto L1
-            m = if_goto_re.match(line)
-            if m:
-                var, label = m.group(1), m.group(2)
-                self.emit_load_operand(var)
-                self.output.append(f"JNZ {label}")
-                continue
-
-            # goto L2
-            m = goto_re.match(line)
-            if m:
-                label = m.group(1)
-                self.output.append(f"JMP {label}")
-                continue
-
-            # label L1:
-            m = label_re.match(line)
-            if m:
-                label = m.group(1)
-                self.output.append(f"LABEL {label}")
-                continue
-
-            # print "texto", var1, var2, ...
-            m = print_re.match(line)
-            if m:
-                text = m.group(1)
-                rest = m.group(2)
-                if text:
-                    self.output.append(f'PRINT "{text}"')
-                # Si hay variables para imprimir después del texto
-                if rest and rest.strip():
-                    vars_to_print = [v.strip() for v in rest.split(",") if v.strip()]
-                    for v in vars_to_print:
-                        self.emit_load_operand(v)
-                        self.output.append("PRINT")
-                continue
-
-            if line == "BREAK":
-                self.output.append("BREAK")
-                continue
-
-            if line == "CONTINUE":
-                self.output.append("CONTINUE")
-                continue
-
-            if line.startswith("RETURN "):
-                val = line.split(" ", 1)[1]
-                self.emit_load_operand(val)
-                self.output.append("RETURN")
-                continue
-
-            # Por defecto, agregar la línea sin cambios (o ignorar)
-            # self.output.append(f"# {line}")
-
+        for idx, ins in enumerate(self.ir_code):
+            start = len(self.output)
+            self.emit_instr(ins)
+            self.origins.extend([idx] * (len(self.output) - start))
         return self.output
 
+    def emit_instr(self, ins):
+        op, args = ins.op, ins.args
+
+        # Asignación simple o con operación: t0 = cont > 3
+        if ins.is_binop:
+            self.emit_load_operand(args[0])
+            self.emit_load_operand(args[1])
+            if op in ("+", "-", "*") and is_int(args[0], self.types) and is_int(args[1], self.types):
+                self.emit_op(op, integer=True)
+            else:
+                self.emit_op(op)
+            self.emit_store(ins.dest)
+
+        # asignación simple: var = valor o var = var
+        elif op == "=":
+            self.emit_load_operand(args[0])
+            self.emit_store(ins.dest)
+
+        # t0 = GUITA "mensaje"
+        elif op == "guita":
+            self.output.append(f'GUITA "{args[0]}"')
+            self.emit_store(ins.dest)
+
+        # if t0 >= 5 goto L1
+        elif op == "ifcmp":
+            left, rel, right, label = args
+            self.emit_load_operand(left)
+            self.emit_load_operand(right)
+            self.emit_op(rel)
+            self.output.append(f"JNZ {label}")
+
+        # if t0 goto L1
+        elif op == "if":
+            self.emit_load_operand(args[0])
+            self.output.append(f"JNZ {args[1]}")
+
+        # goto L2
+        elif op == "goto":
+            self.output.append(f"JMP {args[0]}")
+
+        # label L1:
+        elif op == "label":
+            self.output.append(f"LABEL {args[0]}")
+
+        # print "texto", var1, var2, ...
+        elif op == "print":
+            text = args[0]
+            if text:
+                self.output.append(f'PRINT "{text}"')
+            # Si hay variables para imprimir después del texto
+            for v in args[1:]:
+                self.emit_load_operand(v)
+                self.output.append("PRINT")
+
+        elif op == "return" and args:
+            self.emit_load_operand(args[0])
+            self.output.append("RETURN")
+
+        # Por defecto (comentarios), ignorar
+
     def emit_load_operand(self, operand):
-        # Si es número literal
-        try:
-            float(operand)
+        # Si es número literal (el texto conserva si es int o float)
+        if parse_number(operand) is not None:
             self.output.append(f"PUSH {operand}")
-        except ValueError:
+        else:
             # es variable
-            self.output.append(f"LOAD {operand}")
+            self.output.append(f"LOAD_SLOT {self.slot_of(operand)} {operand}")
+
+    def emit_store(self, var):
+        self.output.append(f"STORE_SLOT {self.slot_of(var)} {var}")
+
+    def slot_of(self, name):
+        # Cada variable/temporal recibe un slot numérico en orden de aparición
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = self.slots[name] = len(self.slots)
+        return slot
 
-    def emit_op(self, op):
+    def emit_op(self, op, integer=False):
         ops_map = {
             '+': 'ADD',
             '-': 'SUB',
@@ -133,7 +108,7 @@ class StackMachineCodeGenerator:
             '!=': 'NE',
         }
         if op in ops_map:
-            self.output.append(ops_map[op])
+            self.output.append(ops_map[op] + ("_I" if integer else ""))
         else:
             self.output.append(f"# Op no reconocido: {op}")
 
@@ -0,0 +1,82 @@
+"""Tests del bytecode binario (.pcb): ida y vuelta, carga y ejecución directa."""
+import pytest
+
+import bytecode_pila
+from bytecode_pila import encode, load_bytecode, write_bytecode
+from sim_instrucciones_pila import decode
+from entrada_pila import ListInput
+from main import process_file
+
+PROGRAM = """Parce n = Guita("¿cuántos?")
+Parce s = 0
+Boliche i in 4 {
+    s = s + i * n
+    Pues (s > 10) {
+        Pilas("grande", s)
+    } Orale {
+        Pilas("chico")
+    }
+}
+Pilas("fin", s, 2.5, n / 3)
+"""
+
+EXTREMOS = [
+    "PUSH 4194303", "PUSH -4194304", "PUSH 4194304", "PUSH -4194305",
+    "PUSH 2.5", "PUSH -0.0", "PUSH 123456789012345678901234567890",
+    "STORE_SLOT 0 x", "INC_SLOT 0 x -1073741824", "INC_SLOT 0 x 1073741824", "INC_SLOT 0 x 1.5",
+    "LABEL A", "JGT_SLOT_K 0 x -7 A", "COPY_SLOT 0 x 1 y",
+    "GUITA", 'GUITA "¿ñ?"', 'PRINT "hola mundo"', "LOAD z", "STORE z", "RETURN",
+]
+
+
+@pytest.fixture(params=["lectura", "mmap"])
+def pcb(request, tmp_path, monkeypatch):
+    """Escribe un .pcb; con "mmap" se fuerza el mapeo aunque el archivo sea chico."""
+    if request.param == "mmap":
+        monkeypatch.setattr(bytecode_pila, "MMAP_MIN_SIZE", 0)
+
+    def write(code):
+        path = tmp_path / "prog.pcb"
+        write_bytecode(path, code)
+        return path
+    return write
+
+
+def test_ida_y_vuelta_exacta(pcb, compiled):
+    for code in (compiled(PROGRAM), EXTREMOS):
+        with load_bytecode(pcb(code)) as bc:
+            assert bc.decode() == decode(code)
+            assert decode(bc.listing()) == decode(code)
+
+
+def test_simula_igual_que_el_texto(pcb, compiled, simulate):
+    code = compiled(PROGRAM)
+    with load_bytecode(pcb(code)) as bc:
+        assert simulate(bc, ["5"]) == simulate(code, ["5"])
+
+
+def test_mas_chico_que_el_texto_en_programas_grandes(compiled):
+    source = "\n".join(["Parce v0 = 1"] + [f"Parce v{i} = v{i - 1} + {i % 10}" for i in range(1, 500)])
+    code = compiled(source + "\nPilas(\"v\", v499)\n", optimize=False)
+    assert len(encode(code)) < 0.8 * len("\n".join(code).encode("utf-8"))
+
+
+def test_archivo_invalido(tmp_path):
+    path = tmp_path / "mal.pcb"
+    path.write_bytes(b"garbage")
+    with pytest.raises(ValueError, match="no es bytecode"):
+        load_bytecode(path)
+    path.write_bytes(b"XXXX" + bytes(60))
+    with pytest.raises(ValueError, match="no es bytecode"):
+        load_bytecode(path)
+
+
+def test_main_ejecuta_el_pcb_sin_recompilar(tmp_path):
+    src = tmp_path / "prog.parce"
+    src.write_text(PROGRAM, encoding="utf-8")
+    process_file(src, tmp_path / "a", input_provider=ListInput(["5"]), bytecode=True)
+    pcb_path = tmp_path / "a" / "codigo_maquina.pcb"
+    process_file(pcb_path, tmp_path / "b", input_provider=ListInput(["5"]))
+    assert sorted(p.name for p in (tmp_path / "b").iterdir()) == ["salida_simulacion.txt"]
+    assert ((tmp_path / "a" / "salida_simulacion.txt").read_text(encoding="utf-8")
+            == (tmp_path / "b" / "salida_simulacion.txt").read_text(encoding="utf-8"))
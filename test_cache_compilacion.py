@@ -0,0 +1,33 @@
+"""Tests de la caché de compilación."""
+from cache_compilacion import CompilationCache
+from main import run_pipeline
+
+SOURCE = 'Parce x = 4\nBoliche i in 3 {\n    x = x + i\n}\nPilas("x", x)\n'
+
+
+def test_segunda_corrida_sale_de_la_cache(tmp_path):
+    cache = CompilationCache(tmp_path)
+    first = run_pipeline(SOURCE, cache)
+    second = run_pipeline(SOURCE, cache)
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert [str(i) for i in second[0]] == [str(i) for i in first[0]]
+    assert second[1:] == first[1:]
+    assert second[2].split() == ["x", "7"]
+
+
+def test_otro_fuente_es_otra_entrada(tmp_path):
+    cache = CompilationCache(tmp_path)
+    run_pipeline(SOURCE, cache)
+    run_pipeline(SOURCE.replace("x = 4", "x = 5"), cache)
+    assert (cache.misses, cache.hits) == (2, 0)
+
+
+def test_entrada_danada_se_recompila(tmp_path):
+    cache = CompilationCache(tmp_path)
+    run_pipeline(SOURCE, cache)
+    for path in tmp_path.glob("*.json"):
+        path.write_text("{no es json", encoding="utf-8")
+    assert run_pipeline(SOURCE, cache)[2].split() == ["x", "7"]
+    assert cache.hits == 0
+    cache.clear()
+    assert not tmp_path.exists()
@@ -0,0 +1,53 @@
+"""Tests de las fuentes de entrada para GUITA."""
+import io
+
+import pytest
+
+from entrada_pila import BufferedStdinInput, FileInput, ListInput
+from salida_pila import MemoryOutput
+from sim_instrucciones_pila import StackMachineSimulator
+
+SOURCE = """Parce a = Guita("a")
+Parce b = Guita("b")
+Pilas("suma", a + b)
+"""
+
+
+def test_list_input_convierte_y_se_agota():
+    entrada = ListInput([1, "dos"])
+    assert [entrada.read(), entrada.read()] == ["1", "dos"]
+    with pytest.raises(EOFError):
+        entrada.read()
+
+
+def test_file_input_un_valor_por_linea(tmp_path):
+    path = tmp_path / "respuestas.txt"
+    path.write_text("3\r\n4\n", encoding="utf-8")
+    with FileInput(path) as entrada:
+        assert [entrada.read(), entrada.read()] == ["3", "4"]
+        with pytest.raises(EOFError):
+            entrada.read()
+    assert entrada._file.closed
+
+
+def test_stdin_en_bloque():
+    entrada = BufferedStdinInput(io.StringIO("5\n6\n"))
+    assert [entrada.read(), entrada.read()] == ["5", "6"]
+
+
+def test_misma_salida_con_cada_fuente(tmp_path, compiled, simulate):
+    path = tmp_path / "respuestas.txt"
+    path.write_text("3\n4\n", encoding="utf-8")
+    code = compiled(SOURCE)
+    expected = simulate(code, ["3", "4"])
+    assert expected.split() == ["a", "b", "suma", "7"]
+    for provider in (FileInput(path), BufferedStdinInput(io.StringIO("3\n4\n"))):
+        output = MemoryOutput()
+        with provider:
+            StackMachineSimulator(code, input_provider=provider, output=output).run()
+        assert output.getvalue() == expected
+
+
+def test_guita_sin_valores_levanta_eof(compiled, simulate):
+    with pytest.raises(EOFError):
+        simulate(compiled(SOURCE), ["3"])
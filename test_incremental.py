@@ -0,0 +1,91 @@
+"""Tests de la recompilación incremental (IncrementalCompiler) contra compile_source."""
+from main import IncrementalCompiler, compile_source
+from representacion_intermedia import split_statements
+
+PROGRAM = """Parce n = Guita("n")
+Parce s = 0
+Boliche i in 5 {
+    s = s + i * n
+}
+Pues (s > 20) {
+    Pilas("grande", s)
+} Orale pues (s == 20) {
+    Pilas("justo")
+} Orale {
+    Pilas("chico", s)
+}
+Parce k = 3
+Previa {
+    k = k - 1
+    Pilas("k", k)
+} Rumba (k > 0)
+Pilas("fin", s, k)
+"""
+
+EDITS = [
+    PROGRAM.replace("Parce k = 3", "Parce k = 4"),
+    PROGRAM.replace('Pilas("justo")', 'Pilas("justo", n)'),
+    PROGRAM.replace("Parce s = 0\n", "Parce s = 0\nParce extra = n * 2\nPilas(\"extra\", extra)\n"),
+    PROGRAM.replace('Pilas("fin", s, k)\n', ""),
+]
+
+
+def test_split_statements_agrupa_orale_y_previa():
+    parts = split_statements(PROGRAM)
+    assert len(parts) == 7
+    assert parts[3].startswith("Pues") and "Orale {" in parts[3]
+    assert parts[5].startswith("Previa") and parts[5].endswith("Rumba (k > 0)")
+
+
+def test_compilacion_en_frio_igual_a_compile_source():
+    expected = compile_source(PROGRAM)
+    got = IncrementalCompiler().compile(PROGRAM)
+    assert [str(i) for i in got[0]] == [str(i) for i in expected[0]]
+    assert got[1] == expected[1]
+
+
+def test_tras_cada_edicion_se_comporta_como_compilar_de_cero(simulate):
+    compiler = IncrementalCompiler()
+    compiler.compile(PROGRAM)
+    for source in EDITS:
+        _, machine, _ = compiler.compile(source)
+        assert compiler.reused > 0
+        for n in ("1", "2", "4", "9"):
+            assert simulate(machine, [n]) == simulate(compile_source(source)[1], [n])
+
+
+def test_solo_espacios_o_comentarios_no_recompila():
+    compiler = IncrementalCompiler()
+    first = compiler.compile(PROGRAM)
+    # líneas en blanco entre sentencias: ni siquiera se re-traduce un fragmento
+    assert compiler.compile(PROGRAM.replace("Parce k = 3\n", "\n\nParce k = 3\n\n")) is first
+    assert compiler.compiled == 0
+    # un comentario cambia el texto de su sentencia, pero no el IR: el backend no corre
+    assert compiler.compile(PROGRAM.replace("Parce k = 3", "Parce k = 3   Che un comentario")) is first
+    assert compiler.compiled == 1
+
+
+# ---------- Cadenas Pues: errores que encontró el modo incremental ----------
+def test_pues_sin_orale_con_todo_falso(same_output):
+    source = """Parce x = Guita("x")
+Pues (x > 5) {
+    Pilas("mayor")
+} Orale pues (x == 5) {
+    Pilas("igual")
+}
+Pilas("fin")
+"""
+    assert same_output(source, ["1"]).split() == ["x", "fin"]
+
+
+def test_orale_con_tres_instrucciones(same_output):
+    source = """Parce x = Guita("x")
+Pues (x > 5) {
+    Pilas("mayor")
+} Orale {
+    Parce y = x + 1
+}
+Pilas("fin")
+"""
+    assert same_output(source, ["1"]).split() == ["x", "fin"]
+    assert same_output(source, ["9"]).split() == ["x", "mayor", "fin"]
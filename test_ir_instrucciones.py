@@ -0,0 +1,46 @@
+"""Tests de las instrucciones de IR estructuradas."""
+from ir_instrucciones import IRInstr, as_instrs, format_number, parse_ir_line, parse_number
+from ir_optimizer import IROptimizer
+from representacion_intermedia import parse_and_generate_ir
+
+PROGRAM = """Parce n = Guita("n: ")
+Parce s = 0.5
+Boliche i in 3 {
+    Pues (i != n) {
+        s = s * 2 - i
+    } Orale {
+        Pilas("igual", i)
+    }
+}
+Pilas("s", s)
+"""
+
+
+def test_el_texto_vuelve_a_la_misma_instruccion():
+    ir = parse_and_generate_ir(PROGRAM)
+    opt = IROptimizer(ir)
+    opt.optimize()
+    for ins in [*ir, *opt.get_code()]:
+        assert parse_ir_line(str(ins)) == ins
+
+
+def test_optimizador_acepta_texto_o_instrucciones():
+    ir = parse_and_generate_ir(PROGRAM)
+    from_text, from_instrs = IROptimizer([str(i) for i in ir]), IROptimizer(ir)
+    from_text.optimize()
+    from_instrs.optimize()
+    assert from_text.get_code() == from_instrs.get_code()
+    assert as_instrs([str(i) for i in ir]) == ir
+
+
+def test_usos_y_destinos():
+    ins = IRInstr.binop("t1", "a", "+", "b")
+    assert ins.is_binop and ins.dest == "t1" and list(ins.uses()) == ["a", "b"]
+    assert IRInstr.goto("L3").jump_target == "L3"
+    assert parse_ir_line("if t2 goto L4").jump_target == "L4"
+
+
+def test_numeros():
+    assert parse_number("3") == 3 and isinstance(parse_number("3"), int)
+    assert parse_number("2.5") == 2.5 and parse_number("x") is None
+    assert format_number(4) == "4" and format_number(0.5) == "0.5"
@@ -0,0 +1,272 @@
+"""Tests de IROptimizer: numeración de valores, CSE y propagación de copias."""
+from representacion_intermedia import parse_and_generate_ir
+from ir_optimizer import IROptimizer
+from ir_instrucciones import is_temp
+
+
+def optimized_ir(source: str, **options):
+    opt = IROptimizer(parse_and_generate_ir(source), **options)
+    opt.optimize()
+    return opt.get_code()
+
+
+def assert_defined_before_use(code):
+    """Cada temporal leído tiene alguna asignación en el IR."""
+    assigned = {ins.dest for ins in code if ins.dest is not None}
+    read = {name for ins in code for name in ins.uses() if is_temp(name)}
+    assert read <= assigned, f"temporales sin asignar: {sorted(read - assigned)}"
+
+
+def optimized_lines(lines, **options):
+    opt = IROptimizer(lines, **options)
+    opt.optimize()
+    return [str(ins) for ins in opt.get_code()]
+
+
+# ---------- Código muerto ----------
+def test_dce_borra_cadenas_de_temporales_muertos():
+    code = optimized_lines(['a = GUITA "a"', "t1 = a + 1", "t2 = t1 * 2", "b = 5", 'print "a", a'])
+    assert code == ['a = GUITA "a"', 'print "a", a']
+
+
+def test_dce_conserva_guita_y_lo_que_vive_en_el_bucle():
+    code = optimized_lines(['a = GUITA "a"', "x = 0", "L1:", "if x >= 3 goto L2", "x = x + 1",
+                            "goto L1", "L2:", 'print "x", x'], cse=False, loops=False)
+    assert 'a = GUITA "a"' in code and "x = x + 1" in code
+
+
+def test_dce_misma_salida(same_output):
+    source = """Parce a = Guita("a")
+Parce muerta = a * 100
+Parce viva = a + 1
+muerta = viva * 2
+Boliche i in 3 {
+    Parce tmp = i * i
+    viva = viva + i
+}
+Pilas("viva", viva)
+"""
+    assert same_output(source, ["2"]).split() == ["a", "viva", "6"]
+
+
+# ---------- Propagación de constantes ----------
+def test_constantes_cruzan_bloques_y_resuelven_saltos():
+    code = optimized_lines(["x = 3", "y = x * 2", "if y goto L1", 'print "no"', "L1:", 'print "y", y'])
+    assert code == ["goto L1", "L1:", 'print "y", 6']
+
+
+def test_valores_distintos_en_cada_rama_no_se_pliegan():
+    code = optimized_lines(['a = GUITA "a"', "if a goto L1", "x = 1", "goto L2", "L1:", "x = 2",
+                            "L2:", 'print "x", x'])
+    assert code[-1] == 'print "x", x'
+
+
+def test_constantes_misma_salida(same_output):
+    source = """Parce a = 2
+Parce b = a * 3
+Parce g = Guita("g")
+Pues (b > 5) {
+    Pilas("b", b + a)
+} Orale {
+    Pilas("nunca")
+}
+Parce c = 0
+Pues (g > 1) {
+    c = 1
+} Orale {
+    c = 2
+}
+Pilas("c", c, b * 2)
+"""
+    assert same_output(source, ["0"]).split() == ["g", "b", "8", "c", "2", "12"]
+    assert same_output(source, ["5"]).split() == ["g", "b", "8", "c", "1", "12"]
+
+
+# ---------- CSE y copias ----------
+def test_subexpresion_repetida_se_calcula_una_vez():
+    source = """Parce a = Guita("a")
+Parce x = (a + 3) * (a + 3)
+Parce y = (a + 3) - 1
+Pilas("r", x, y)
+"""
+    sumas = [ins for ins in optimized_ir(source) if ins.op == "+"]
+    assert len(sumas) == 1
+    assert len([ins for ins in optimized_ir(source, cse=False) if ins.op == "+"]) == 3
+
+
+def test_copias_se_propagan():
+    source = """Parce a = Guita("a")
+Parce b = a
+Parce c = b
+Pilas("c", c * 2)
+"""
+    code = optimized_ir(source)
+    assert not [ins for ins in code if ins.op == "="]
+
+
+def test_cse_no_cambia_la_salida(same_output):
+    source = """Parce s = 0
+Parce a = 3
+Parce b = Guita("b")
+Boliche i in 6 {
+    Parce r = i - i / 3 * 3
+    Pues (r * b > 2) {
+        s = s + r * b
+    } Orale pues (r * b > 2) {
+        s = s - 1
+    } Orale pues (r * b == 2) {
+        s = s + (i + a) * (i + a)
+    } Orale {
+        s = s + 1
+    }
+}
+Pilas("s", s)
+"""
+    for value in ("1", "2", "5"):
+        same_output(source, [value])
+
+
+# ---------- Regresión: `t = <expr>; x = t` con t todavía leído ----------
+# La primera pasada propaga `a = t1` sobre `c = t0 < t1`. Tras sacar `a = zz`
+# del bucle, la segunda pasada veía a `a` viva a la salida del bloque (aunque
+# se reasigna antes) y fundía `t1 = …; a = t1`, dejando `c` leyendo un t1 que
+# nadie asigna.
+COALESCE = """Parce g = Guita("g")
+Parce a = g != 2
+Parce c = g < a
+Parce k = 0
+Previa {
+    k = k + 1
+    a = zz
+} Rumba (k < 3)
+Boliche i in 2 {
+    Pilas("i", i)
+}
+Pilas("r", a, c)
+"""
+
+
+def test_coalesce_no_borra_un_temporal_que_se_sigue_leyendo(run):
+    assert_defined_before_use(optimized_ir(COALESCE))
+    assert run(COALESCE, ["0"]).split() == ["g", "i", "0", "i", "1", "r", "0", "1"]
+
+
+def test_coalesce_misma_salida(same_output):
+    for value in ("0", "2", "7"):
+        same_output(COALESCE, [value])
+
+
+def test_coalesce_sigue_armando_inc_slot(compiled):
+    source = """Parce x = Guita("x")
+Boliche i in 3 {
+    x = x + 1
+}
+Pilas("x", x)
+"""
+    assert any(line.startswith("INC_SLOT") for line in compiled(source))
+
+
+# ---------- Bucles: código invariante y reducción de fuerza ----------
+def test_invariante_sale_al_preheader(same_output):
+    # a y b son enteros pero no constantes: salen de un bucle
+    source = """Parce a = 1
+Boliche j in 3 {
+    a = a * 2 + j
+}
+Parce b = a - 3
+Parce s = 0
+Boliche i in 5 {
+    Parce x = a * b + i
+    s = s + x
+}
+Pilas("s", s)
+"""
+    opt = IROptimizer(parse_and_generate_ir(source))
+    opt.optimize()
+    hoisted = [str(ins) for _, moved, _ in opt.loop_log for ins in moved]
+    assert any("a * b" in ins for ins in hoisted)
+    assert same_output(source).split() == ["s", str(5 * 12 * 9 + 10)]
+
+
+def test_reduccion_de_fuerza_quita_la_multiplicacion(same_output):
+    source = """Parce s = 0
+Boliche i in 10 {
+    Parce y = i * 4
+    s = s + y
+}
+Pilas("s", s)
+"""
+    assert not [ins for ins in optimized_ir(source) if ins.op == "*"]
+    assert [ins for ins in optimized_ir(source, loops=False) if ins.op == "*"]
+    assert same_output(source).split() == ["s", "180"]
+
+
+def test_bucle_que_no_da_vueltas(same_output):
+    source = """Parce a = Guita("a")
+Parce x = 7
+Parce k = 5
+Rumba (k < 3) {
+    x = a * 2
+    k = k + 1
+}
+Pilas("x", x)
+"""
+    assert same_output(source, ["9"]).split() == ["a", "x", "7"]
+
+
+# Con CSE y bucles a la vez: la numeración que corre tras sacar código de
+# los bucles es la que disparaba el coalesce incorrecto.
+CSE_Y_BUCLES = """Parce a = Guita("a")
+Parce b = a + 1
+Parce c = 2
+Parce d = a * c
+Parce k = 0
+Parce n1 = 0
+Previa {
+    n1 = n1 + 1
+    a = b
+} Rumba (n1 < 3)
+b = k
+Parce n2 = 0
+Previa {
+    n2 = n2 + 1
+    b = 5 + 2 <= (d + a)
+    d = (c >= (k != k)) + b < (b < k)
+} Rumba (n2 < 1)
+Pilas("p", b, d)
+Pilas("fin", a, b, c, d, k)
+"""
+
+
+def test_cse_y_bucles_juntos(run):
+    for value in ("0", "3"):
+        expected = run(CSE_Y_BUCLES, [value], optimize=False, peephole=False)
+        assert run(CSE_Y_BUCLES, [value], cse=True, loops=True) == expected
+    assert run(CSE_Y_BUCLES, ["3"]).split() == ["a", "p", "1", "0", "fin", "4", "1", "2", "0", "0"]
+
+
+def test_cse_y_bucles_misma_salida(same_output):
+    for source in (COALESCE, CSE_Y_BUCLES):
+        for value in ("0", "3"):
+            same_output(source, [value])
+
+
+# ---------- Tipos: int exacto, float y plegado ----------
+def test_enteros_y_floats(same_output):
+    source = """Parce a = Guita("a")
+Parce b = 7 / 2
+Pilas("r", a * 3, a / 2, b, 2 * 3, 1.5 + 1.5, a + 0.5)
+"""
+    assert same_output(source, ["4"]).split() == ["a", "r", "12", "2.0", "3.5", "6", "3.0", "4.5"]
+
+
+def test_plegar_enteros_enormes(same_output):
+    big = "1" + "0" * 200
+    source = f'Parce a = {big} * {big}\nPilas("a", a)\n'
+    assert same_output(source).split() == ["a", "1" + "0" * 400]
+
+
+def test_int_enorme_con_float_no_se_pliega():
+    big = "1" + "0" * 400
+    code = optimized_ir(f'Parce a = {big} * 1.0\nPilas("a", a)\n')
+    assert [ins.op for ins in code if ins.is_binop] == ["*"]
@@ -0,0 +1,38 @@
+"""Tests de main.py: modo lote y archivos de salida."""
+import subprocess
+import sys
+from pathlib import Path
+
+import main
+from main import batch_output_dirs, process_file
+from entrada_pila import ListInput
+
+
+def test_lote_un_directorio_por_entrada(tmp_path):
+    sources = [tmp_path / "a" / "x.parce", tmp_path / "b" / "x.parce", tmp_path / "a" / "y.parce"]
+    out = tmp_path / "out"
+    assert batch_output_dirs(sources, out) == [out / "a" / "x", out / "b" / "x", out / "a" / "y"]
+
+
+def test_lote_fuente_y_bytecode_con_el_mismo_nombre(tmp_path):
+    sources = [tmp_path / "x.parce", tmp_path / "x.pcb", tmp_path / "y.pcb"]
+    dirs = batch_output_dirs(sources, tmp_path / "out")
+    assert len(set(dirs)) == 3
+    assert dirs == [tmp_path / "out" / "x.parce", tmp_path / "out" / "x.pcb", tmp_path / "out" / "y"]
+
+
+def test_importar_main_no_carga_el_pool():
+    # el pool de procesos (y Lark) se importan recién en el modo lote / al compilar
+    code = "import sys, main; print('concurrent.futures' in sys.modules, 'lark' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=Path(main.__file__).parent,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.split() == ["False", "False"]
+
+
+def test_process_file_escribe_los_resultados(tmp_path):
+    src = tmp_path / "prog.parce"
+    src.write_text('Parce n = Guita("n")\nPilas("doble", n * 2)\n', encoding="utf-8")
+    process_file(src, tmp_path / "out", input_provider=ListInput(["21"]))
+    files = sorted(p.name for p in (tmp_path / "out").iterdir())
+    assert files == ["codigo_maquina.txt", "ir.txt", "salida_simulacion.txt"]
+    assert (tmp_path / "out" / "salida_simulacion.txt").read_text(encoding="utf-8").split() == ["n", "doble", "42"]
@@ -0,0 +1,23 @@
+"""Tests de las métricas por etapa."""
+import tracemalloc
+
+from main import compile_source
+from metricas import PipelineMetrics
+
+SOURCE = 'Parce x = 2\nPilas("x", x * 3)\n'
+
+
+def test_por_defecto_solo_tiempo():
+    metrics = PipelineMetrics()
+    compile_source(SOURCE, metrics=metrics)
+    stages = [s["stage"] for s in metrics.stages]
+    assert stages == ["parser_load", "parse", "ir", "optimize", "codegen", "peephole"]
+    assert all("peak_memory_kb" not in s for s in metrics.stages)
+    assert not tracemalloc.is_tracing()
+
+
+def test_memoria_opcional():
+    metrics = PipelineMetrics(memory=True)
+    compile_source(SOURCE, metrics=metrics)
+    assert all("peak_memory_kb" in s for s in metrics.stages)
+    assert not tracemalloc.is_tracing()      # se apaga al terminar cada etapa
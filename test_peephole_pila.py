@@ -0,0 +1,127 @@
+"""Tests del peephole y las superinstrucciones sobre el código de pila."""
+from peephole_pila import StackPeepholeOptimizer
+
+BIG = "1" + "0" * 200
+
+
+def peephole(code, **options):
+    peep = StackPeepholeOptimizer(code, **options)
+    peep.optimize()
+    return peep.get_code()
+
+
+# ---------- Plegado de constantes ----------
+def test_pliega_push_push_op():
+    assert peephole(["PUSH 2", "PUSH 3", "MUL", "PRINT"]) == ["PUSH 6", "PRINT"]
+
+
+def test_pliega_enteros_mas_grandes_que_un_float():
+    assert peephole([f"PUSH {BIG}", f"PUSH {BIG}", "MUL", "PRINT"]) == ["PUSH 1" + "0" * 400, "PRINT"]
+
+
+def test_no_pliega_lo_que_desborda_un_float():
+    code = [f"PUSH {BIG}{BIG}", "PUSH 1.0", "MUL", "PRINT"]
+    assert peephole(code) == code
+    code = ["PUSH 1e308", "PUSH 10.0", "MUL", "PRINT"]
+    assert peephole(code) == code
+
+
+# ---------- Saltos y temporales ----------
+def test_salto_con_condicion_constante():
+    assert peephole(["PUSH 1", "JNZ A", 'PRINT "no"', "LABEL A", 'PRINT "si"']) == ["LABEL A", 'PRINT "si"']
+
+
+def test_store_load_de_un_temporal_queda_en_la_pila():
+    assert peephole(["PUSH 2", "STORE_SLOT 1 t1", "LOAD_SLOT 1 t1", "PRINT"]) == ["PUSH 2", "PRINT"]
+
+
+def test_saltos_a_saltos_y_codigo_inalcanzable():
+    code = ["JMP A", 'PRINT "muerto"', "LABEL A", "JMP B", "LABEL B", 'PRINT "x"']
+    assert peephole(code) == ["LABEL A", "LABEL B", 'PRINT "x"']
+
+
+def test_comparacion_y_jnz_en_un_salto():
+    code = ["LOAD_SLOT 0 x", "PUSH 3", "GT", "JNZ A", "PUSH 1", "PRINT", "LABEL A", "RETURN"]
+    assert peephole(code, superinstructions=False)[:3] == ["LOAD_SLOT 0 x", "PUSH 3", "JGT A"]
+
+
+def test_solo_se_invierten_igual_y_distinto():
+    code = ["LOAD_SLOT 0 x", "PUSH 3", "JEQ A", "JMP B", "LABEL A", 'PRINT "a"', "LABEL B", "RETURN"]
+    assert peephole(code, superinstructions=False)[:3] == ["LOAD_SLOT 0 x", "PUSH 3", "JNE B"]
+    code = ["LOAD_SLOT 0 x", "PUSH 3", "JGT A", "JMP B", "LABEL A", 'PRINT "a"', "LABEL B", "RETURN"]
+    assert peephole(code, superinstructions=False)[2:4] == ["JGT A", "JMP B"]
+
+
+# Con NaN `not (a > b)` no es `a <= b`: invertir el salto cambiaba la rama
+def test_nan_toma_la_misma_rama(run, same_output):
+    source = """Parce z = 0
+Parce x = 1 / z
+Parce a = x - x
+Pues (a > 1) {
+    Pilas("mayor")
+} Orale {
+    Pilas("no mayor")
+}
+"""
+    assert run(source).split() == ["no", "mayor"]
+    same_output(source)
+
+
+def test_nan_desde_guita_no_entra_al_bucle(run, same_output):
+    source = """Parce a = Guita("a")
+Parce b = 0
+Rumba (b < a) {
+    Pilas("adentro")
+    Paila
+}
+Pues (a >= b) {
+    Pilas("mayor o igual")
+}
+Pilas("fin")
+"""
+    assert run(source, ["nan"]).split() == ["a", "fin"]
+    same_output(source, ["nan"])
+
+
+def test_peephole_misma_salida(same_output):
+    source = """Parce g = Guita("g")
+Parce s = 0
+Boliche i in 4 {
+    Pues (i > g) {
+        s = s + i * 2
+    } Orale pues (1) {
+        s = s - 1
+    }
+}
+Pilas("s", s)
+"""
+    for value in ("0", "2"):
+        same_output(source, [value])
+
+
+# ---------- Superinstrucciones ----------
+def test_fusiona_inc_copy_y_salto_contra_constante():
+    code = ["LOAD_SLOT 0 x", "PUSH 1", "ADD", "STORE_SLOT 0 x", "LOAD_SLOT 0 x", "STORE_SLOT 1 y",
+            "LABEL A", "LOAD_SLOT 0 x", "PUSH 5", "JLT A"]
+    assert peephole(code) == ["INC_SLOT 0 x 1", "COPY_SLOT 0 x 1 y", "LABEL A", "JLT_SLOT_K 0 x 5 A"]
+
+
+def test_superinstrucciones_misma_salida(compiled, simulate):
+    source = """Parce s = 0
+Parce k = 10
+Rumba (k > 0) {
+    Parce copia = k
+    s = s + copia
+    k = k - 1
+}
+Boliche i in 5 {
+    s = s + 2
+}
+Pilas("s", s)
+"""
+    base = compiled(source, peephole=False)
+    plain, fused = peephole(base, superinstructions=False), peephole(base)
+    assert len(fused) < len(plain)
+    assert any(line.startswith("INC_SLOT") for line in fused)
+    assert simulate(fused) == simulate(plain) == simulate(base)
+    assert simulate(fused).split() == ["s", "65"]
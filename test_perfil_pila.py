@@ -0,0 +1,35 @@
+"""Tests del perfilador del simulador."""
+from sim_instrucciones_pila import StackMachineSimulator
+from salida_pila import MemoryOutput
+
+SOURCE = """Parce s = 0
+Boliche i in 4 {
+    s = s + i
+}
+Pilas("s", s)
+"""
+
+
+def profiled(code):
+    output = MemoryOutput()
+    sim = StackMachineSimulator(code, profile=True, output=output)
+    sim.run()
+    return sim, output.getvalue()
+
+
+def test_perfilar_no_cambia_la_salida(compiled, simulate):
+    code = compiled(SOURCE)
+    _, output = profiled(code)
+    assert output == simulate(code)
+
+
+def test_reporte_cuenta_cada_instruccion(compiled):
+    code = compiled(SOURCE)
+    sim, _ = profiled(code)
+    report = sim.profiler.report()
+    assert report["total_steps"] == sum(i["count"] for i in report["instructions"])
+    assert report["total_steps"] == sum(report["opcodes"].values())
+    assert report["max_stack_depth"] >= 1
+    assert [i["pc"] for i in report["instructions"]] == list(range(len(sim.program)))
+    # el cuerpo del bucle corre 4 veces
+    assert max(i["count"] for i in report["instructions"]) >= 4
@@ -0,0 +1,152 @@
+"""Tests de la generación de IR: parser perezoso, anidamiento profundo, Paila y Andale."""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import representacion_intermedia
+from representacion_intermedia import parse_and_generate_ir
+
+# bien por encima de lo que aguantaba el Transformer recursivo de Lark
+DEPTH = max(2000, sys.getrecursionlimit() * 2)
+
+
+# ---------- Parser perezoso ----------
+PROGRAM = """Parce a = Guita("a")
+Boliche i in 3 {
+    a = a + i
+}
+Pilas("a", a)
+"""
+
+
+def test_parser_se_arma_en_el_primer_uso_y_reusa_las_tablas(tmp_path, monkeypatch):
+    expected = [str(ins) for ins in parse_and_generate_ir(PROGRAM)]
+    cache = tmp_path / "che_rumba.lark.cache"
+    monkeypatch.setattr(representacion_intermedia, "parser_cache_path", cache)
+    monkeypatch.setattr(representacion_intermedia, "_parser", None)
+    first = representacion_intermedia.get_parser()
+    assert cache.exists()
+    assert representacion_intermedia.get_parser() is first
+    # un proceso nuevo carga las tablas del archivo y genera el mismo IR
+    monkeypatch.setattr(representacion_intermedia, "_parser", None)
+    assert representacion_intermedia.get_parser() is not first
+    assert [str(ins) for ins in parse_and_generate_ir(PROGRAM)] == expected
+    assert representacion_intermedia.parser is representacion_intermedia.get_parser()
+
+
+def test_importar_no_construye_el_parser():
+    code = "import representacion_intermedia as ri; print(ri._parser is None)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=Path(representacion_intermedia.__file__).parent).stdout
+    assert out.split() == ["True"]
+
+
+# ---------- Anidamiento profundo ----------
+def test_parentesis_profundos(same_output):
+    source = ('Parce x = Guita("x")\n'
+              f'Parce y = {"(" * DEPTH}x{" + 1)" * DEPTH}\n'
+              'Pilas("y", y)\n')
+    assert same_output(source, ["3"]).split() == ["x", "y", str(3 + DEPTH)]
+
+
+def test_cadena_larga_de_operadores(same_output):
+    terms = " ".join(f"{'+-'[i % 2]} {i % 7 + 1}" for i in range(DEPTH))
+    expected = 5 + sum((i % 7 + 1) * (1, -1)[i % 2] for i in range(DEPTH))
+    source = f'Parce x = Guita("x")\nPilas("y", x {terms})\n'
+    assert same_output(source, ["5"]).split() == ["x", "y", str(expected)]
+
+
+def test_bloques_pues_anidados(same_output):
+    depth = DEPTH // 2
+    source = ('Parce x = Guita("x")\n'
+              + "Pues (x > 0) {\n" * depth
+              + 'Pilas("adentro", x)\n'
+              + '} Orale {\nPilas("no")\n}\n' * depth)
+    assert same_output(source, ["1"]).split() == ["x", "adentro", "1"]
+    assert same_output(source, ["0"]).split() == ["x", "no"]
+
+
+def test_bucles_anidados(same_output):
+    # una vuelta por nivel salvo el de afuera: el cuerpo corre 2 veces
+    depth = 50
+    source = ("Parce s = 0\n"
+              + "Boliche i0 in 2 {\n"
+              + "".join(f"Boliche i{k} in 1 {{\n" for k in range(1, depth))
+              + "s = s + 1\n" + "}\n" * depth
+              + 'Pilas("s", s)\n')
+    assert same_output(source).split() == ["s", "2"]
+
+
+# ---------- Paila / Andale ----------
+def test_paila_y_andale_en_cada_bucle(same_output):
+    source = """Parce n = Guita("n")
+Parce s = 0
+Boliche i in 10 {
+    Pues (i == n) {
+        Paila
+    }
+    Pues (i == 2) {
+        Andale
+    }
+    s = s + i
+}
+Parce k = 0
+Rumba (k < 10) {
+    k = k + 1
+    Pues (k == 3) {
+        Andale
+    }
+    Pues (k > n) {
+        Paila
+    }
+    s = s + 100
+}
+Parce m = 0
+Previa {
+    m = m + 1
+    Pues (m < 3) {
+        Andale
+    }
+    s = s + 1000
+    Pues (m == 4) {
+        Paila
+    }
+} Rumba (m < 8)
+Pilas("r", s, k, m)
+"""
+    assert same_output(source, ["5"]).split() == ["n", "r", str(8 + 400 + 2000), "6", "4"]
+    same_output(source, ["0"])
+    same_output(source, ["20"])
+
+
+def test_paila_solo_corta_el_bucle_interno(same_output):
+    source = """Parce s = 0
+Boliche i in 3 {
+    Boliche j in 5 {
+        Pues (j > i) {
+            Paila
+        }
+        s = s + 1
+    }
+    Andale
+    s = s + 100
+}
+Pilas("s", s)
+"""
+    assert same_output(source).split() == ["s", "6"]
+
+
+def test_paila_y_andale_son_saltos_directos():
+    source = "Boliche i in 3 {\n    Pues (i == 1) {\n        Paila\n    }\n    Andale\n}\n"
+    ir = parse_and_generate_ir(source)
+    labels = {ins.args[0] for ins in ir if ins.op == "label"}
+    gotos = [ins.args[-1] for ins in ir if ins.op in ("goto", "if", "ifcmp")]
+    assert {ins.op for ins in ir} <= {"=", "+", "==", "label", "goto", "if", "ifcmp"}
+    assert set(gotos) <= labels
+
+
+def test_paila_fuera_de_un_bucle():
+    with pytest.raises(SyntaxError, match="fuera de un bucle"):
+        parse_and_generate_ir("Parce x = 1\nPaila\n")
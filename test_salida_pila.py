@@ -0,0 +1,84 @@
+"""Tests de los destinos de salida para PRINT."""
+import io
+
+import pytest
+
+from entrada_pila import ListInput
+from main import process_file
+from salida_pila import FileOutput, MemoryOutput, StreamOutput, TeeOutput
+from sim_instrucciones_pila import StackMachineSimulator
+
+SOURCE = """Parce n = Guita("n")
+Boliche i in 3 {
+    Pilas("v", n * i)
+}
+"""
+
+
+def test_stream_output_vuelca_cada_max_chunks():
+    stream = io.StringIO()
+    out = StreamOutput(stream, max_chunks=2, max_delay=3600)
+    out.write("a ")
+    assert stream.getvalue() == ""
+    out.write("b ")
+    assert stream.getvalue() == "a b "
+    out.write("c ")
+    out.close()
+    assert stream.getvalue() == "a b c "
+
+
+def test_tee_escribe_en_todos_los_destinos(compiled, simulate):
+    code = compiled(SOURCE)
+    memory, stream = MemoryOutput(), io.StringIO()
+    with TeeOutput(memory, StreamOutput(stream)) as output:
+        StackMachineSimulator(code, input_provider=ListInput(["5"]), output=output).run()
+    assert memory.getvalue() == stream.getvalue() == simulate(code, ["5"])
+    assert memory.getvalue().split() == ["n", "v", "0", "v", "5", "v", "10"]
+
+
+def test_mensaje_de_guita_se_ve_antes_de_leer(compiled):
+    # el simulador vuelca la salida antes de cada GUITA
+    stream = io.StringIO()
+    seen = []
+
+    class Spy(ListInput):
+        def read(self):
+            seen.append(stream.getvalue())
+            return super().read()
+
+    out = StreamOutput(stream, max_delay=3600)
+    StackMachineSimulator(compiled(SOURCE), input_provider=Spy(["1"]), output=out).run()
+    assert [s.split() for s in seen] == [["n"]]
+
+
+# ---------- FileOutput (--stream) ----------
+def test_file_output_con_strip_igual_a_memoria(tmp_path):
+    chunks = ["  ", "a ", "b ", "  ", "c ", "  "]
+    memory = MemoryOutput()
+    for chunk in chunks:
+        memory.write(chunk)
+    for max_chunks in (1, 2, 100):
+        path = tmp_path / f"salida{max_chunks}.txt"
+        with FileOutput(path, max_chunks=max_chunks, strip=True) as out:
+            for chunk in chunks:
+                out.write(chunk)
+        assert path.read_text(encoding="utf-8") == memory.getvalue().strip()
+
+
+def test_file_output_deja_el_archivo_parcial(tmp_path, compiled):
+    path = tmp_path / "salida.txt"
+    code = compiled(SOURCE)
+    with pytest.raises(EOFError):
+        with FileOutput(path, strip=True) as out:
+            StackMachineSimulator(code, input_provider=ListInput([]), output=out).run()
+    assert path.read_text(encoding="utf-8") == "n"
+
+
+def test_process_file_stream_igual_que_en_memoria(tmp_path):
+    src = tmp_path / "prog.parce"
+    src.write_text(SOURCE, encoding="utf-8")
+    process_file(src, tmp_path / "memoria", input_provider=ListInput(["5"]))
+    process_file(src, tmp_path / "stream", input_provider=ListInput(["5"]), stream=True)
+    read = lambda d: (tmp_path / d / "salida_simulacion.txt").read_text(encoding="utf-8")
+    assert read("stream") == read("memoria")
+    assert read("stream").split() == ["n", "v", "0", "v", "5", "v", "10"]
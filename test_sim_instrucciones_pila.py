@@ -0,0 +1,88 @@
+"""Tests del simulador de la máquina de pila."""
+import pytest
+
+from sim_instrucciones_pila import OP_JNZ, ExecutionLimitExceeded, StackMachineSimulator, decode
+from entrada_pila import ListInput
+from salida_pila import MemoryOutput
+
+INFINITO = 'Parce x = 0\nRumba (x < 1) {\n    Pilas("x")\n}\n'
+
+
+# ---------- Límites de ejecución ----------
+@pytest.mark.parametrize("limits, kind", [
+    (dict(max_steps=1000), "pasos"),
+    (dict(timeout=0.05), "tiempo"),
+])
+def test_bucle_infinito_se_corta(compiled, simulate, limits, kind):
+    with pytest.raises(ExecutionLimitExceeded) as exc:
+        simulate(compiled(INFINITO), **limits)
+    assert exc.value.limit.startswith(kind)
+    assert exc.value.steps > 0
+
+
+def test_codigo_sin_saltos_tambien_se_corta(compiled, simulate):
+    code = compiled("\n".join(f'Pilas("x", {i})' for i in range(50)))
+    assert not [line for line in code if line.startswith("J")]
+    with pytest.raises(ExecutionLimitExceeded) as exc:
+        simulate(code, max_steps=5)
+    assert exc.value.limit.startswith("pasos")
+    assert simulate(code, max_steps=len(code)) == simulate(code)
+
+
+def test_saltos_no_tomados_cuentan(simulate):
+    # ninguna condición se cumple: sólo hay saltos que siguen de largo
+    code = ["PUSH 0", "JNZ A", "LOAD_SLOT 0 x", "PUSH 1", "JGT A", "PUSH 0", "JNZ A",
+            'PRINT "largo"', "PUSH 0", "JNZ A"] * 3 + ["LABEL A"]
+    with pytest.raises(ExecutionLimitExceeded) as exc:
+        simulate(code, max_steps=4)
+    assert exc.value.steps < 10
+
+
+def test_guita_no_espera_con_el_presupuesto_agotado(compiled, simulate):
+    source = "\n".join(f"Parce v{i} = {i}" for i in range(20)) + '\nParce g = Guita("g")\nPilas("g", g)\n'
+    with pytest.raises(ExecutionLimitExceeded):
+        simulate(compiled(source, optimize=False, peephole=False), [], max_steps=10)
+
+
+def test_pila_que_crece_se_corta(simulate):
+    with pytest.raises(ExecutionLimitExceeded) as exc:
+        simulate(["LABEL A", "PUSH 1", "JMP A"], max_stack=100)
+    assert exc.value.limit.startswith("pila")
+
+
+def test_con_limites_holgados_la_salida_no_cambia(compiled, simulate):
+    code = compiled('Boliche i in 3 {\n    Pilas("i", i)\n}\n')
+    assert simulate(code, max_steps=1000, timeout=5, max_stack=50) == simulate(code)
+    sim = StackMachineSimulator(code, output=MemoryOutput(), max_steps=1000)
+    sim.run()
+    assert 0 < sim.steps <= 1000
+
+
+# ---------- Decodificación previa ----------
+CUENTA = ["PUSH 3", "STORE_SLOT 0 x", "LABEL A", 'PRINT "x"', "LOAD_SLOT 0 x", "PRINT",
+          "LOAD_SLOT 0 x", "PUSH 1", "SUB", "STORE_SLOT 0 x", "LOAD_SLOT 0 x", "JNZ A"]
+
+
+def test_las_etiquetas_desaparecen_y_los_saltos_van_al_pc():
+    program, labels, slot_names = decode(CUENTA)
+    assert labels == {"A": 2}
+    assert len(program) == len(CUENTA) - 1
+    assert program[-1] == (OP_JNZ, 2)
+    assert slot_names == ["x"]
+
+
+def test_decodificado_se_ejecuta_igual_que_el_texto(simulate):
+    assert simulate(CUENTA).split() == ["x", "3", "x", "2", "x", "1"]
+    # espacios de más y variables por nombre (LOAD/STORE) siguen andando
+    code = ["  PUSH 4  ", "STORE y", "LOAD y", "PUSH 0.5", "MUL", "PRINT"]
+    assert simulate(code).split() == ["2.0"]
+
+
+# ---------- Variables en slots ----------
+def test_cada_variable_tiene_su_slot(compiled):
+    code = compiled('Parce a = Guita("a")\nParce b = a * 2\nPilas("r", a, b)\n', optimize=False)
+    assert not [line for line in code if line.split()[0] in ("LOAD", "STORE")]
+    sim = StackMachineSimulator(code, input_provider=ListInput(["5"]), output=MemoryOutput())
+    sim.run()
+    values = dict(zip(sim.slot_names, sim.slots))
+    assert values["a"] == 5 and values["b"] == 10
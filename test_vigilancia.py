@@ -0,0 +1,57 @@
+"""Tests de FileWatcher y de la recompilación del modo watch."""
+import threading
+import time
+
+import pytest
+
+from entrada_pila import ListInput
+from main import IncrementalCompiler, process_file
+from vigilancia import FileWatcher
+
+SOURCE = """Parce n = Guita("n")
+Boliche i in 3 {
+    Pilas("v", n + i)
+}
+"""
+
+
+def wait_change(watcher, action):
+    """Corre `action` en otro hilo y devuelve lo que informa `watcher.wait()`."""
+    timer = threading.Timer(0.05, action)
+    timer.start()
+    try:
+        return watcher.wait()
+    finally:
+        timer.join()
+
+
+@pytest.mark.parametrize("backend", ["auto", "polling"])
+def test_detecta_guardados_y_renombres(tmp_path, backend):
+    src, other = tmp_path / "prog.parce", tmp_path / "otro.parce"
+    src.write_text(SOURCE, encoding="utf-8")
+    other.write_text(SOURCE, encoding="utf-8")
+    with FileWatcher([src, other], debounce=0.05, poll_interval=0.02) as watcher:
+        if backend == "polling":
+            watcher.close()      # sin descriptor de inotify queda el sondeo
+        assert wait_change(watcher, lambda: src.write_text(SOURCE + "\n", encoding="utf-8")) \
+            == {src.resolve()}
+        # guardado "atómico" de un editor: temporal + rename encima del archivo
+        tmp = tmp_path / ".otro.parce.swp"
+
+        def save_atomic():
+            tmp.write_text(SOURCE + "Pilas(\"x\")\n", encoding="utf-8")
+            time.sleep(0.01)
+            tmp.replace(other)
+        assert wait_change(watcher, save_atomic) == {other.resolve()}
+
+
+def test_recompilar_tras_editar_igual_que_de_cero(tmp_path):
+    src = tmp_path / "prog.parce"
+    compiler = IncrementalCompiler()
+    read = lambda d: (tmp_path / d / "salida_simulacion.txt").read_text(encoding="utf-8")
+    for source in (SOURCE, SOURCE.replace("n + i", "n * i"), SOURCE + 'Pilas("fin", n)\n'):
+        src.write_text(source, encoding="utf-8")
+        process_file(src, tmp_path / "watch", input_provider=ListInput(["4"]), compiler=compiler)
+        process_file(src, tmp_path / "frio", input_provider=ListInput(["4"]))
+        # los nombres de temporales y etiquetas cambian; la salida no
+        assert read("watch") == read("frio")
@@ -0,0 +1,145 @@
+"""
+Vigilancia de archivos para `main.py --watch`
+---------------------------------------------
+• En Linux usa inotify (vía ctypes, sin dependencias): el proceso duerme en
+  `select` hasta que el kernel avisa un cambio
+• En otros sistemas revisa mtime/tamaño cada `poll_interval` segundos
+• Agrupa los guardados seguidos (debounce): devuelve recién cuando pasaron
+  `debounce` segundos sin cambios nuevos
+
+Se vigila el directorio de cada archivo y no el archivo mismo, porque muchos
+editores guardan escribiendo un temporal y renombrándolo encima.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+# Constantes de <sys/inotify.h>
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")      # wd, mask, cookie, len
+
+
+def _load_inotify():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        return libc if hasattr(libc, "inotify_init1") else None
+    except OSError:
+        return None
+
+
+class FileWatcher:
+    def __init__(self, paths: Iterable[Path], debounce: float = 0.1, poll_interval: float = 0.25):
+        self.paths = [Path(p).resolve() for p in paths]
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+        self._by_watch: Dict[Tuple[int, str], Path] = {}
+        libc = _load_inotify()
+        if libc is not None:
+            self._init_inotify(libc)
+        self.backend = "inotify" if self._fd is not None else "polling"
+        self._snapshot = {p: self._stat(p) for p in self.paths}
+
+    # -------- inotify ----------
+    def _init_inotify(self, libc) -> None:
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            return
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        for path in self.paths:
+            wd = libc.inotify_add_watch(fd, str(path.parent).encode(), mask)
+            if wd < 0:
+                os.close(fd)
+                self._by_watch.clear()
+                return
+            self._by_watch[(wd, path.name)] = path
+        self._fd = fd
+
+    def _read_events(self) -> Set[Path]:
+        changed: Set[Path] = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, _, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            path = self._by_watch.get((wd, name))
+            if path is not None:
+                changed.add(path)
+        return changed
+
+    def _wait_inotify(self) -> Set[Path]:
+        changed: Set[Path] = set()
+        while not changed:
+            select.select([self._fd], [], [])
+            changed |= self._read_events()
+        # debounce: seguir juntando mientras lleguen eventos
+        while select.select([self._fd], [], [], self.debounce)[0]:
+            changed |= self._read_events()
+        return changed
+
+    # -------- sondeo ----------
+    @staticmethod
+    def _stat(path: Path):
+        try:
+            st = path.stat()
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def _poll_changes(self) -> Set[Path]:
+        changed = set()
+        for path in self.paths:
+            now = self._stat(path)
+            if now != self._snapshot[path]:
+                self._snapshot[path] = now
+                changed.add(path)
+        return changed
+
+    def _wait_polling(self) -> Set[Path]:
+        changed: Set[Path] = set()
+        while not changed:
+            time.sleep(self.poll_interval)
+            changed = self._poll_changes()
+        while True:
+            time.sleep(self.debounce)
+            more = self._poll_changes()
+            if not more:
+                return changed
+            changed |= more
+
+    # -------- interfaz pública ----------
+    def wait(self) -> Set[Path]:
+        """Bloquea hasta que cambie algún archivo vigilado; devuelve cuáles."""
+        if self._fd is not None:
+            return self._wait_inotify()
+        return self._wait_polling()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()